@@ -0,0 +1,27 @@
+"""Add binary tracking_blob to eye_tracking_data
+
+Revision ID: a3c1f7d2e9b4
+Revises: 419695b85732
+Create Date: 2026-10-17 16:40:12.204117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3c1f7d2e9b4'
+down_revision: Union[str, None] = '419695b85732'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 기존 JSON 행은 그대로 두고, 새 행만 바이너리로 저장 (읽기 시 두 형식 모두 지원)
+    op.add_column('eye_tracking_data', sa.Column('tracking_blob', sa.LargeBinary(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('eye_tracking_data', 'tracking_blob')
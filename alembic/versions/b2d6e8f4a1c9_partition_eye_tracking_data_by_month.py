@@ -0,0 +1,94 @@
+"""Partition eye_tracking_data by created_at month
+
+Revision ID: b2d6e8f4a1c9
+Revises: f1b9c3d7e2a8
+Create Date: 2026-10-17 18:41:27.502318
+
+"""
+from datetime import date, datetime
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.config import settings
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b2d6e8f4a1c9'
+down_revision: Union[str, None] = 'f1b9c3d7e2a8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLE = 'eye_tracking_data'
+OLD_TABLE = 'eye_tracking_data_unpartitioned'
+SEQUENCE = 'eye_tracking_data_id_seq'
+
+
+def _next_month(month: date) -> date:
+    return date(month.year + month.month // 12, month.month % 12 + 1, 1)
+
+
+def _create_month_partitions(first: date, last: date) -> None:
+    month = first
+    while month <= last:
+        upper = _next_month(month)
+        op.execute(
+            f"CREATE TABLE {TABLE}_p{month.year:04d}_{month.month:02d} PARTITION OF {TABLE} "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{upper.isoformat()}')"
+        )
+        month = upper
+    # 범위를 벗어난 행이 insert 오류를 내지 않도록 기본 파티션 유지
+    op.execute(f"CREATE TABLE {TABLE}_default PARTITION OF {TABLE} DEFAULT")
+
+
+def _create_constraints_and_indexes(primary_key: Sequence[str]) -> None:
+    op.create_primary_key(f'{TABLE}_pkey', TABLE, list(primary_key))
+    op.create_foreign_key(f'{TABLE}_user_id_fkey', TABLE, 'users', ['user_id'], ['id'], ondelete='CASCADE')
+    op.create_foreign_key(f'{TABLE}_story_id_fkey', TABLE, 'stories', ['story_id'], ['id'], ondelete='CASCADE')
+    op.create_foreign_key(f'{TABLE}_page_id_fkey', TABLE, 'pages', ['page_id'], ['id'], ondelete='CASCADE')
+    op.create_index(op.f('ix_eye_tracking_data_id'), TABLE, ['id'], unique=False)
+    op.create_index('ix_eye_tracking_data_user_story_session', TABLE, ['user_id', 'story_id', 'session_id'], unique=False)
+    op.create_index(op.f('ix_eye_tracking_data_pattern'), TABLE, ['pattern'], unique=False)
+    op.create_index(op.f('ix_eye_tracking_data_completed_at'), TABLE, ['completed_at'], unique=False)
+
+
+def _swap_table(partitioned: bool) -> None:
+    # 시퀀스가 기존 테이블과 함께 삭제되지 않도록 소유 관계를 잠시 해제
+    op.execute(f"ALTER SEQUENCE {SEQUENCE} OWNED BY NONE")
+    op.execute(f"ALTER TABLE {TABLE} RENAME TO {OLD_TABLE}")
+
+    if partitioned:
+        op.execute(
+            f"CREATE TABLE {TABLE} (LIKE {OLD_TABLE} INCLUDING DEFAULTS) "
+            f"PARTITION BY RANGE (created_at)"
+        )
+        first = op.get_bind().execute(sa.text(f"SELECT min(created_at) FROM {OLD_TABLE}")).scalar()
+        today = datetime.utcnow().date().replace(day=1)
+        first = first.date().replace(day=1) if first is not None else today
+        last = today
+        # 이후 월은 파티션 관리 작업(ensure_partitions)이 같은 설정으로 생성
+        for _ in range(settings.TRACKING_PARTITION_MONTHS_AHEAD):
+            last = _next_month(last)
+        _create_month_partitions(first, last)
+    else:
+        op.execute(f"CREATE TABLE {TABLE} (LIKE {OLD_TABLE} INCLUDING DEFAULTS)")
+
+    op.execute(f"INSERT INTO {TABLE} SELECT * FROM {OLD_TABLE}")
+    op.execute(f"DROP TABLE {OLD_TABLE}")
+    op.execute(f"ALTER SEQUENCE {SEQUENCE} OWNED BY {TABLE}.id")
+
+    # 파티션 테이블의 기본 키에는 파티션 키가 포함되어야 함
+    _create_constraints_and_indexes(['id', 'created_at'] if partitioned else ['id'])
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name == 'postgresql':
+        _swap_table(partitioned=True)
+    op.create_index('ix_eye_tracking_data_user_story_created', TABLE, ['user_id', 'story_id', 'created_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_eye_tracking_data_user_story_created', table_name=TABLE)
+    if op.get_bind().dialect.name == 'postgresql':
+        _swap_table(partitioned=False)
@@ -0,0 +1,95 @@
+"""Promote session_id, pattern and completed_at on eye_tracking_data
+
+Revision ID: c7e2b91f0a5d
+Revises: a3c1f7d2e9b4
+Create Date: 2026-10-17 17:02:45.918330
+
+"""
+from datetime import datetime
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7e2b91f0a5d'
+down_revision: Union[str, None] = 'a3c1f7d2e9b4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 1000
+
+eye_tracking_data = sa.table(
+    'eye_tracking_data',
+    sa.column('id', sa.Integer),
+    sa.column('tracking_data', sa.JSON),
+    sa.column('session_id', sa.String),
+    sa.column('pattern', sa.String),
+    sa.column('completed_at', sa.DateTime)
+)
+
+
+def _parse_completed_at(value):
+    if not isinstance(value, str):
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return None
+
+
+def _backfill() -> None:
+    # 기존 JSON 값을 id 순서대로 배치 단위로 옮김 (긴 단일 트랜잭션/전체 로드 방지)
+    bind = op.get_bind()
+    update = eye_tracking_data.update().where(
+        eye_tracking_data.c.id == sa.bindparam('row_id')
+    ).values(
+        session_id=sa.bindparam('session_id'),
+        pattern=sa.bindparam('pattern'),
+        completed_at=sa.bindparam('completed_at')
+    )
+
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(eye_tracking_data.c.id, eye_tracking_data.c.tracking_data)
+            .where(eye_tracking_data.c.id > last_id)
+            .order_by(eye_tracking_data.c.id)
+            .limit(BACKFILL_BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+
+        params = [
+            {
+                'row_id': row.id,
+                'session_id': (row.tracking_data or {}).get('session_id'),
+                'pattern': (row.tracking_data or {}).get('pattern'),
+                'completed_at': _parse_completed_at((row.tracking_data or {}).get('completed_at'))
+            }
+            for row in rows
+        ]
+        bind.execute(update, params)
+        last_id = rows[-1].id
+
+
+def upgrade() -> None:
+    op.add_column('eye_tracking_data', sa.Column('session_id', sa.String(), nullable=True))
+    op.add_column('eye_tracking_data', sa.Column('pattern', sa.String(), nullable=True))
+    op.add_column('eye_tracking_data', sa.Column('completed_at', sa.DateTime(), nullable=True))
+
+    _backfill()
+
+    op.create_index('ix_eye_tracking_data_user_story_session', 'eye_tracking_data', ['user_id', 'story_id', 'session_id'], unique=False)
+    op.create_index(op.f('ix_eye_tracking_data_pattern'), 'eye_tracking_data', ['pattern'], unique=False)
+    op.create_index(op.f('ix_eye_tracking_data_completed_at'), 'eye_tracking_data', ['completed_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_eye_tracking_data_completed_at'), table_name='eye_tracking_data')
+    op.drop_index(op.f('ix_eye_tracking_data_pattern'), table_name='eye_tracking_data')
+    op.drop_index('ix_eye_tracking_data_user_story_session', table_name='eye_tracking_data')
+    op.drop_column('eye_tracking_data', 'completed_at')
+    op.drop_column('eye_tracking_data', 'pattern')
+    op.drop_column('eye_tracking_data', 'session_id')
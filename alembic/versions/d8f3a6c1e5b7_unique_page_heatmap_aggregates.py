@@ -0,0 +1,76 @@
+"""Unique page_heatmap_aggregates per page, user and resolution
+
+Revision ID: d8f3a6c1e5b7
+Revises: b2d6e8f4a1c9
+Create Date: 2026-10-17 19:52:14.306127
+
+"""
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+from alembic import op
+import numpy as np
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd8f3a6c1e5b7'
+down_revision: Union[str, None] = 'b2d6e8f4a1c9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLE = 'page_heatmap_aggregates'
+
+
+def _merge_duplicates() -> None:
+    # 동시 생성으로 중복된 합계 행을 가장 먼저 생성된 행으로 합침 (float64 합계, 세션 수 합산)
+    bind = op.get_bind()
+    rows = bind.execute(sa.text(
+        f"SELECT id, page_id, user_id, resolution, session_count, heatmap_sum FROM {TABLE} ORDER BY id"
+    )).fetchall()
+
+    groups: Dict[Tuple[int, Optional[int], int], List[sa.Row]] = {}
+    for row in rows:
+        groups.setdefault((row.page_id, row.user_id, row.resolution), []).append(row)
+
+    for (_, _, resolution), group in groups.items():
+        if len(group) < 2:
+            continue
+        total = np.zeros((resolution, resolution), dtype='<f8')
+        for row in group:
+            total += np.frombuffer(row.heatmap_sum, dtype='<f8').reshape(resolution, resolution)
+        bind.execute(
+            sa.text(f"UPDATE {TABLE} SET session_count = :count, heatmap_sum = :heatmap_sum WHERE id = :id"),
+            {
+                'id': group[0].id,
+                'count': sum(row.session_count for row in group),
+                'heatmap_sum': total.tobytes()
+            }
+        )
+        bind.execute(
+            sa.text(f"DELETE FROM {TABLE} WHERE id IN :ids").bindparams(sa.bindparam('ids', expanding=True)),
+            {'ids': [row.id for row in group[1:]]}
+        )
+
+
+def upgrade() -> None:
+    _merge_duplicates()
+    op.drop_index('ix_page_heatmap_aggregates_page_user', table_name=TABLE)
+    # user_id가 NULL인 전체 사용자 합계는 일반 유니크 인덱스로 중복을 막을 수 없어 부분 인덱스로 분리
+    op.create_index(
+        'uq_page_heatmap_aggregates_page_user_resolution', TABLE, ['page_id', 'user_id', 'resolution'],
+        unique=True,
+        postgresql_where=sa.text('user_id IS NOT NULL'),
+        sqlite_where=sa.text('user_id IS NOT NULL')
+    )
+    op.create_index(
+        'uq_page_heatmap_aggregates_page_resolution_all', TABLE, ['page_id', 'resolution'],
+        unique=True,
+        postgresql_where=sa.text('user_id IS NULL'),
+        sqlite_where=sa.text('user_id IS NULL')
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('uq_page_heatmap_aggregates_page_resolution_all', table_name=TABLE)
+    op.drop_index('uq_page_heatmap_aggregates_page_user_resolution', table_name=TABLE)
+    op.create_index('ix_page_heatmap_aggregates_page_user', TABLE, ['page_id', 'user_id'], unique=False)
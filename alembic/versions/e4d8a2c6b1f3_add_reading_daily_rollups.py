@@ -0,0 +1,47 @@
+"""Add reading_daily_rollups
+
+Revision ID: e4d8a2c6b1f3
+Revises: c7e2b91f0a5d
+Create Date: 2026-10-17 17:25:31.447208
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4d8a2c6b1f3'
+down_revision: Union[str, None] = 'c7e2b91f0a5d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 기존 데이터는 python -m app.services.tracking.rollup 으로 채움
+    op.create_table('reading_daily_rollups',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('story_id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('session_count', sa.Integer(), nullable=False),
+    sa.Column('total_time', sa.Float(), nullable=False),
+    sa.Column('reading_speed_sum', sa.Float(), nullable=False),
+    sa.Column('comprehension_sum', sa.Float(), nullable=False),
+    sa.Column('attention_sum', sa.Float(), nullable=False),
+    sa.Column('attention_min', sa.Float(), nullable=True),
+    sa.Column('attention_max', sa.Float(), nullable=True),
+    sa.Column('pattern_counts', sa.JSON(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['story_id'], ['stories.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_id', 'story_id', 'day', name='uq_reading_daily_rollups_user_story_day')
+    )
+    op.create_index(op.f('ix_reading_daily_rollups_id'), 'reading_daily_rollups', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_reading_daily_rollups_id'), table_name='reading_daily_rollups')
+    op.drop_table('reading_daily_rollups')
@@ -0,0 +1,41 @@
+"""Add page_heatmap_aggregates
+
+Revision ID: f1b9c3d7e2a8
+Revises: e4d8a2c6b1f3
+Create Date: 2026-10-17 17:58:09.731054
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1b9c3d7e2a8'
+down_revision: Union[str, None] = 'e4d8a2c6b1f3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('page_heatmap_aggregates',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('page_id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=True),
+    sa.Column('resolution', sa.Integer(), nullable=False),
+    sa.Column('session_count', sa.Integer(), nullable=False),
+    sa.Column('heatmap_sum', sa.LargeBinary(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['page_id'], ['pages.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_page_heatmap_aggregates_id'), 'page_heatmap_aggregates', ['id'], unique=False)
+    op.create_index('ix_page_heatmap_aggregates_page_user', 'page_heatmap_aggregates', ['page_id', 'user_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_page_heatmap_aggregates_page_user', table_name='page_heatmap_aggregates')
+    op.drop_index(op.f('ix_page_heatmap_aggregates_id'), table_name='page_heatmap_aggregates')
+    op.drop_table('page_heatmap_aggregates')
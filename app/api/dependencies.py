@@ -14,7 +14,7 @@ from app.services.azure.storage import AzureStorageService
 from app.services.azure.controlnet import ControlNetService
 from app.utils.prompt import PromptGenerator
 
-from typing import Generator
+from typing import Generator, Optional
 
 # OAuth2PasswordBearer 인스턴스 생성
 # tokenUrl은 토큰을 발급받는 엔드포인트 경로
@@ -33,19 +33,25 @@ def get_current_user(
         headers={"WWW-Authenticate": "Bearer"},
     )
     
+    user = get_user_from_token(db, token)
+    if user is None:
+        raise credentials_exception
+        
+    return user
+
+def get_user_from_token(db: Session, token: str) -> Optional[User]:
+    """
+    토큰으로 사용자를 조회합니다. (WebSocket처럼 헤더 인증을 쓸 수 없는 경우에도 사용)
+    """
     payload = verify_token(token)
     if payload is None:
-        raise credentials_exception
+        return None
         
     email: str = payload.get("sub")
     if email is None:
-        raise credentials_exception
-        
-    user = db.query(User).filter(User.email == email).first()
-    if user is None:
-        raise credentials_exception
+        return None
         
-    return user
+    return db.query(User).filter(User.email == email).first()
 
 
 async def get_story(
@@ -1,32 +1,77 @@
 # app/api/v1/tracking.py 생성
-from fastapi import APIRouter, Depends, Path, Query
+import json
+from fastapi import APIRouter, Depends, Path, Query, Request, WebSocket, WebSocketDisconnect, status
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
 from sqlalchemy.orm import Session
 from typing import List, Dict, Any, Optional
 from datetime import datetime
-from app.api.dependencies import get_current_user, get_db, get_story
+from app.api.dependencies import get_current_user, get_db, get_story, get_user_from_token
 from app.models.user import User
+from app.models.story import Story
 from app.schemas.tracking import (
     TrackingData,
     GazePoint,
+    GazeBatch,
     TrackingAnalytics
 )
+from app.services.analytics_cache import analytics_cache
+from app.services.tracking.buffer import gaze_buffer_store, DEFAULT_SESSION
 from app.services.tracking.collector import TrackingCollector
 from app.services.tracking.analyzer import TrackingAnalyzer
-from app.core.exceptions import DrawryException
+from app.services.tracking.heatmap import PageHeatmapService
+from app.utils.tracking import GAZE_FRAME_DTYPE, HEATMAP_PYRAMID_LEVELS, TrackingUtils
+from app.core.config import settings
+from app.core.exceptions import AuthenticationException, DrawryException, PermissionException
 
 router = APIRouter()
 
+HEATMAP_RESOLUTION_DESCRIPTION = "히트맵 해상도 (8, 16, 32, 64 중 하나, 생략 시 기본 해상도)"
+
+def _check_heatmap_resolution(resolution: Optional[int]) -> None:
+    """미리 계산된 히트맵 피라미드 해상도인지 확인"""
+    if resolution is not None and resolution not in HEATMAP_PYRAMID_LEVELS:
+        raise DrawryException(
+            code="INVALID_HEATMAP_RESOLUTION",
+            message="Unsupported heatmap resolution",
+            status_code=400,
+            details={"resolution": resolution, "supported": list(HEATMAP_PYRAMID_LEVELS)}
+        )
+
+def _streamed_without_session(tracking_data: TrackingData, user_id: int) -> bool:
+    """기본 세션 버퍼가 이 세션의 기록인지 확인
+
+    기록 시 session_id를 보내지 않은 클라이언트의 포인트는 기본 세션 버퍼에 있지만, 같은 페이지의
+    이전 세션 상태가 남아 있을 수 있으므로 버퍼의 시간 범위가 완료 요청의 포인트 범위 안에 있을 때만
+    사용합니다. 확인할 수 없으면 완료 요청의 포인트로 다시 계산합니다.
+    """
+    if not tracking_data.gaze_points:
+        return False
+    point_buffer = gaze_buffer_store.peek(
+        (user_id, tracking_data.story_id, tracking_data.page_id, DEFAULT_SESSION)
+    )
+    time_range = point_buffer.time_range() if point_buffer is not None else None
+    if time_range is None:
+        return False
+    timestamps = [point.timestamp for point in tracking_data.gaze_points]
+    return min(timestamps) <= time_range[0] and time_range[1] <= max(timestamps)
+
 @router.post("/stories/{story_id}/pages/{page_id}/tracking")
 async def record_gaze_data(
     gaze_data: GazePoint,  # 기본값이 없는 파라미터를 앞으로
     story_id: int = Path(..., gt=0),
     page_id: int = Path(..., gt=0),
+    session_id: Optional[str] = Query(None, description="읽기 세션 ID"),
     current_user: User = Depends(get_current_user),
     story = Depends(get_story),
     db: Session = Depends(get_db)
 ):
     """실시간 시선 추적 데이터 기록"""
-    collector = TrackingCollector(db)
+    # 요청 간 유지되는 세션 버퍼 사용
+    point_buffer = gaze_buffer_store.get(
+        (current_user.id, story_id, page_id, session_id or DEFAULT_SESSION)
+    )
+    collector = TrackingCollector(db, point_buffer=point_buffer)
     
     try:
         metrics = await collector.process_gaze_data(
@@ -37,6 +82,8 @@ async def record_gaze_data(
         )
         
         return {"status": "success", "metrics": metrics}
+    except DrawryException:
+        raise
     except Exception as e:
         raise DrawryException(
             code="TRACKING_RECORD_ERROR",
@@ -45,35 +92,239 @@ async def record_gaze_data(
             details={"error": str(e)}
         )
 
+@router.post("/stories/{story_id}/pages/{page_id}/tracking/batch")
+async def record_gaze_batch(
+    gaze_batch: GazeBatch,
+    story_id: int = Path(..., gt=0),
+    page_id: int = Path(..., gt=0),
+    session_id: Optional[str] = Query(None, description="읽기 세션 ID"),
+    current_user: User = Depends(get_current_user),
+    story = Depends(get_story),
+    db: Session = Depends(get_db)
+):
+    """시선 추적 데이터 일괄 기록"""
+    point_buffer = gaze_buffer_store.get(
+        (current_user.id, story_id, page_id, session_id or DEFAULT_SESSION)
+    )
+    collector = TrackingCollector(db, point_buffer=point_buffer)
+    
+    try:
+        result = await collector.process_gaze_batch(
+            user_id=current_user.id,
+            story_id=story_id,
+            page_id=page_id,
+            gaze_points=gaze_batch.points
+        )
+        
+        return {"status": "success", **result}
+    except DrawryException:
+        raise
+    except Exception as e:
+        raise DrawryException(
+            code="TRACKING_RECORD_ERROR",
+            message="Failed to record gaze batch",
+            status_code=500,
+            details={"error": str(e)}
+        )
+
+@router.websocket("/stories/{story_id}/pages/{page_id}/tracking/stream")
+async def stream_gaze_data(
+    websocket: WebSocket,
+    story_id: int = Path(..., gt=0),
+    page_id: int = Path(..., gt=0),
+    token: str = Query(..., description="액세스 토큰"),
+    session_id: Optional[str] = Query(None, description="읽기 세션 ID"),
+    db: Session = Depends(get_db)
+):
+    """실시간 시선 추적 스트림
+
+    연결 시 한 번만 인증하고, 이후 프레임마다 시선 포인트를 받아 처리된 메트릭스를 바로 전송합니다.
+    - 텍스트 프레임: GazeBatch JSON ({"points": [...]})
+    - 바이너리 프레임: 포인트당 x(f4), y(f4), timestamp(f8), confidence(f4) 리틀 엔디언 레코드
+    """
+    current_user = get_user_from_token(db, token)
+    story = db.query(Story).filter(Story.id == story_id).first()
+    if current_user is None or story is None or story.user_id != current_user.id:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    await websocket.accept()
+    point_buffer = gaze_buffer_store.get(
+        (current_user.id, story_id, page_id, session_id or DEFAULT_SESSION)
+    )
+    collector = TrackingCollector(db, point_buffer=point_buffer)
+
+    try:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+
+            try:
+                if message.get("bytes") is not None:
+                    # JSON 배치와 같은 포인트 수 제한 (디코딩 전에 크기로 확인)
+                    frame = message["bytes"]
+                    if len(frame) // GAZE_FRAME_DTYPE.itemsize > settings.TRACKING_BATCH_MAX_POINTS:
+                        raise ValueError(
+                            f"Frame must not exceed {settings.TRACKING_BATCH_MAX_POINTS} gaze points"
+                        )
+                    rows = TrackingUtils.decode_gaze_frame(frame)
+                else:
+                    gaze_batch = GazeBatch.model_validate_json(message.get("text") or "")
+                    rows = TrackingUtils.to_rows(gaze_batch.points)
+            except (ValidationError, ValueError) as e:
+                # 잘못된 프레임은 알리고 연결은 유지
+                await websocket.send_json({
+                    "type": "error",
+                    "code": "INVALID_GAZE_FRAME",
+                    "message": str(e)
+                })
+                continue
+
+            try:
+                result = await collector.process_gaze_rows(
+                    user_id=current_user.id,
+                    story_id=story_id,
+                    page_id=page_id,
+                    rows=rows
+                )
+            except DrawryException as e:
+                if e.status_code != 503:
+                    raise
+                # 저장 큐가 가득 찬 경우 프레임의 포인트는 하나도 반영되지 않으므로 연결을 유지하고
+                # 클라이언트가 같은 프레임을 다시 보내게 함
+                await websocket.send_json({
+                    "type": "error",
+                    "code": e.code,
+                    "message": e.message
+                })
+                continue
+
+            # 새로 계산된 메트릭스가 있을 때만 전송
+            if result["processed_chunks"]:
+                await websocket.send_json({"type": "metrics", **result})
+    except WebSocketDisconnect:
+        pass
+    except DrawryException as e:
+        await websocket.send_json({
+            "type": "error",
+            "code": e.code,
+            "message": e.message
+        })
+        await websocket.close(code=status.WS_1011_INTERNAL_ERROR)
+
+@router.get("/stories/{story_id}/pages/{page_id}/tracking/live")
+async def stream_live_metrics(
+    request: Request,
+    story_id: int = Path(..., gt=0),
+    page_id: int = Path(..., gt=0),
+    token: str = Query(..., description="액세스 토큰 (EventSource는 헤더를 보낼 수 없음)"),
+    session_id: Optional[str] = Query(None, description="읽기 세션 ID"),
+    db: Session = Depends(get_db)
+):
+    """읽기 세션 실시간 지표 SSE 스트림
+
+    시선 데이터가 처리될 때마다 최근 구간의 고정 빈도, 집중도, 읽기 패턴을 metrics 이벤트로 보내고,
+    세션이 완료되면 end 이벤트 후 종료합니다. 같은 세션의 관찰자들은 하나의 계산 결과를 공유합니다.
+    기록 중인 세션 버퍼가 없으면 404를 반환합니다.
+    """
+    current_user = get_user_from_token(db, token)
+    if current_user is None:
+        raise AuthenticationException(code="INVALID_TOKEN", message="Could not validate credentials")
+    story = db.query(Story).filter(Story.id == story_id).first()
+    if story is None or story.user_id != current_user.id:
+        raise PermissionException(
+            code="STORY_ACCESS_DENIED",
+            message="You don't have permission to access this story"
+        )
+
+    session_key = session_id or DEFAULT_SESSION
+    buffer_key = (current_user.id, story_id, page_id, session_key)
+    # 관찰만으로 버퍼를 만들지 않음 (기록 중인 세션만 구독 가능)
+    point_buffer = gaze_buffer_store.peek(buffer_key)
+    if point_buffer is None:
+        raise DrawryException(
+            code="TRACKING_SESSION_NOT_FOUND",
+            message="No active tracking session",
+            status_code=404,
+            details={"session_id": session_key}
+        )
+    live = point_buffer.live
+
+    def event(name: str, data: Dict[str, Any]) -> str:
+        return f"event: {name}\ndata: {json.dumps({'session_id': session_key, **data})}\n\n"
+
+    async def events():
+        version, snapshot = live.snapshot()
+        yield event("metrics", snapshot)
+        while not live.closed:
+            if await request.is_disconnected():
+                return
+            # 관찰 중인 세션 버퍼가 유휴 시간 만료로 제거되지 않도록 사용 시각 갱신
+            gaze_buffer_store.peek(buffer_key)
+            update = await live.wait(version, settings.TRACKING_LIVE_KEEPALIVE)
+            if update is None:
+                yield ": keep-alive\n\n"
+                continue
+            if update[0] != version:
+                version, snapshot = update
+                yield event("metrics", snapshot)
+        yield event("end", {"version": version})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @router.post("/stories/{story_id}/pages/{page_id}/tracking/session/complete")
 async def complete_tracking_session(
     tracking_data: TrackingData,  # 기본값이 없는 파라미터를 앞으로
     story_id: int = Path(..., gt=0),
     page_id: int = Path(..., gt=0),
+    heatmap_format: str = Query("dense", pattern="^(dense|sparse)$", description="히트맵 응답 형식"),
+    heatmap_resolution: Optional[int] = Query(None, description=HEATMAP_RESOLUTION_DESCRIPTION),
     current_user: User = Depends(get_current_user),
     story = Depends(get_story),
     db: Session = Depends(get_db)
 ):
     """읽기 세션 완료 및 데이터 저장"""
-    collector = TrackingCollector(db)
+    _check_heatmap_resolution(heatmap_resolution)
+    # 저장/집계 대상은 권한을 확인한 경로의 동화책/페이지 (본문 값은 사용하지 않음)
+    tracking_data = tracking_data.model_copy(update={"story_id": story_id, "page_id": page_id})
+    
+    # 실시간 처리된 세션 버퍼가 있으면 이어서 사용 (세션 종료이므로 저장소에서 제거)
+    point_buffer = gaze_buffer_store.pop(
+        (current_user.id, story_id, page_id, tracking_data.session_id)
+    )
+    if point_buffer is None and _streamed_without_session(tracking_data, current_user.id):
+        point_buffer = gaze_buffer_store.pop(
+            (current_user.id, story_id, page_id, DEFAULT_SESSION)
+        )
+    collector = TrackingCollector(db, point_buffer=point_buffer)
     analyzer = TrackingAnalyzer(db)
     
     try:
         # 세션 데이터 저장
-        session_data = await collector.save_session_data(tracking_data)
+        session_data = await collector.save_session_data(current_user.id, tracking_data)
         
-        # 세션 분석
-        analysis = await analyzer.analyze_reading_session(
-            user_id=current_user.id,
-            story_id=story_id,
-            session_id=tracking_data.session_id
-        )
+        # 세션 분석 (저장한 결과를 다시 조회하지 않고 사용)
+        analysis = analyzer.analyze_completed_session(session_data, heatmap_resolution)
+        
+        # 응답에는 요청한 해상도의 히트맵 하나만 포함 (피라미드는 조회 API로 제공)
+        session_data = {k: v for k, v in session_data.items() if k != "heatmap_pyramid"}
+        if heatmap_resolution is not None:
+            session_data["heatmap"] = analysis["heatmap"]
+        if heatmap_format == "sparse":
+            session_data["heatmap"] = TrackingUtils.sparse_heatmap(session_data["heatmap"])
         
         return {
             "status": "success",
             "session_data": session_data,
             "analysis": analysis
         }
+    except DrawryException:
+        raise
     except Exception as e:
         raise DrawryException(
             code="SESSION_COMPLETION_ERROR",
@@ -86,6 +337,7 @@ async def complete_tracking_session(
 async def get_tracking_analytics(
     story_id: int = Path(..., gt=0),
     time_range: Optional[int] = Query(30, gt=0, description="분석 기간(일)"),
+    granularity: str = Query("day", pattern="^(day|session)$", description="집계 단위"),
     current_user: User = Depends(get_current_user),
     story = Depends(get_story),
     db: Session = Depends(get_db)
@@ -97,7 +349,8 @@ async def get_tracking_analytics(
         progress_analysis = await analyzer.analyze_user_progress(
             user_id=current_user.id,
             story_id=story_id,
-            time_range=time_range
+            time_range=time_range,
+            granularity=granularity
         )
         
         return progress_analysis
@@ -109,29 +362,70 @@ async def get_tracking_analytics(
             details={"error": str(e)}
         )
 
+@router.get("/stories/{story_id}/pages/{page_id}/tracking/heatmap")
+async def get_page_heatmap(
+    story_id: int = Path(..., gt=0),
+    page_id: int = Path(..., gt=0),
+    scope: str = Query("user", pattern="^(user|all)$", description="집계 대상 (user: 본인, all: 전체 사용자)"),
+    resolution: Optional[int] = Query(None, description=HEATMAP_RESOLUTION_DESCRIPTION),
+    current_user: User = Depends(get_current_user),
+    story = Depends(get_story),
+    db: Session = Depends(get_db)
+):
+    """페이지의 세션 평균 히트맵 조회"""
+    _check_heatmap_resolution(resolution)
+    
+    try:
+        return PageHeatmapService(db).get_average(
+            page_id=page_id,
+            user_id=current_user.id if scope == "user" else None,
+            resolution=resolution
+        )
+    except Exception as e:
+        raise DrawryException(
+            code="HEATMAP_AGGREGATE_ERROR",
+            message="Failed to retrieve page heatmap",
+            status_code=500,
+            details={"error": str(e)}
+        )
+
 @router.get("/stories/{story_id}/tracking/sessions/{session_id}")
 async def get_session_analysis(
     story_id: int = Path(..., gt=0),
     session_id: str = Path(...),
+    resolution: Optional[int] = Query(None, description=HEATMAP_RESOLUTION_DESCRIPTION),
     current_user: User = Depends(get_current_user),
     story = Depends(get_story),
     db: Session = Depends(get_db)
 ):
-    """특정 세션의 상세 분석 데이터 조회"""
+    """특정 세션의 상세 분석 데이터 조회 (resolution 지정 시 해당 해상도 히트맵 포함)"""
+    _check_heatmap_resolution(resolution)
     analyzer = TrackingAnalyzer(db)
     
     try:
         session_analysis = await analyzer.analyze_reading_session(
             user_id=current_user.id,
             story_id=story_id,
-            session_id=session_id
+            session_id=session_id,
+            resolution=resolution
         )
         
         return session_analysis
+    except DrawryException:
+        raise
     except Exception as e:
         raise DrawryException(
             code="SESSION_ANALYSIS_ERROR",
             message="Failed to retrieve session analysis",
             status_code=500,
             details={"error": str(e)}
-        )
\ No newline at end of file
+        )
+
+@router.get("/tracking/stats")
+async def get_tracking_stats(
+    current_user: User = Depends(get_current_user)
+):
+    """현재 워커 프로세스의 분석 캐시 상태 조회 (워커별로 다름)"""
+    return {
+        "analytics_cache": analytics_cache.stats()
+    }
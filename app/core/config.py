@@ -1,4 +1,5 @@
 # app/core/config.py
+from pydantic import model_validator
 from pydantic_settings import BaseSettings
 from typing import Optional
 from functools import lru_cache
@@ -36,6 +37,56 @@ class Settings(BaseSettings):
     AZURE_STORAGE_CONTAINER_SKETCHES: str = "sketches"
     AZURE_STORAGE_CONTAINER_GENERATED: str = "generated"
     
+    # 시선 추적 버퍼 설정
+    TRACKING_BUFFER_SIZE: int = 50  # 처리 단위 포인트 수
+    TRACKING_BUFFER_CAPACITY: int = 256  # 세션별 링 버퍼 크기
+    TRACKING_BUFFER_IDLE_TIMEOUT: int = 300  # 초
+    TRACKING_BUFFER_MAX_BYTES: int = 64 * 1024 * 1024
+    TRACKING_BATCH_MAX_POINTS: int = 1000  # 배치 요청당 최대 포인트 수
+    TRACKING_LIVE_WINDOW_MS: float = 10000.0  # 실시간 지표 구간 길이
+    TRACKING_LIVE_KEEPALIVE: float = 15.0  # 갱신이 없을 때 SSE keep-alive 주기 (초)
+    TRACKING_BINARY_STORAGE: bool = True  # 고정점/히트맵을 바이너리로 저장
+    TRACKING_HEATMAP_RESOLUTION: int = 20  # 히트맵 한 변의 셀 수
+    TRACKING_HEATMAP_SIGMA: float = 0.0  # 가우시안 평활화 (셀 단위, 0이면 사용 안 함)
+    TRACKING_FOCUS_GRID_SIZE: int = 20  # 포커스 포인트 빈도 격자 크기
+    # 포인트 축소 방식: none, fixed_rate, lttb
+    # 일괄/스트림 기록은 요청 단위, 실시간 처리 없이 완료된 세션은 세션 전체에 적용 (단건 기록은 적용 안 함)
+    TRACKING_SAMPLING_METHOD: str = "none"
+    TRACKING_SAMPLING_TARGET_HZ: float = 30.0  # fixed_rate 재표본화 주기
+    # lttb 축소 후 최대 포인트 수 (요청당 포인트 수 상한보다 크므로 사실상 실시간 처리 없이 완료된 세션에만 적용)
+    TRACKING_SAMPLING_MAX_POINTS: int = 5000
+    TRACKING_MIN_CONFIDENCE: float = 0.0  # 이 값 미만의 신뢰도 포인트 제거 (0이면 사용 안 함)
+    TRACKING_MAX_GAP_MS: float = 75.0  # 이 길이 이하의 제외 구간은 선형 보간
+    TRACKING_MAX_GAZE_VELOCITY: float = 30.0  # 단발성 튐 판단 속도 (화면 비율/초)
+    TRACKING_MIN_VALID_RATIO: float = 0.7  # 남은 샘플 비율이 이보다 낮으면 품질 불량
+    TRACKING_AOI_GRID_SIZE: int = 32  # 단어 영역 색인 격자 크기
+    TRACKING_AOI_PADDING: float = 0.0  # 단어 영역 확장 여백 (정규화 좌표)
+    TRACKING_AOI_CACHE_SIZE: int = 256  # 캐시할 페이지 레이아웃 수
+    TRACKING_COMPUTE_WORKERS: int = 2  # 세션 분석 프로세스 수 (0이면 스레드 하나에서 실행)
+    TRACKING_COMPUTE_MAX_PENDING: int = 32  # 대기 가능한 최대 세션 분석 수
+    
+    # 트래킹 데이터 지연 일괄 저장 설정
+    TRACKING_WRITE_BEHIND: bool = True
+    TRACKING_WRITE_QUEUE_SIZE: int = 10000  # 대기 가능한 최대 행 수
+    TRACKING_WRITE_BATCH_SIZE: int = 200  # 한 번에 저장하는 행 수
+    TRACKING_WRITE_FLUSH_INTERVAL: float = 1.0  # 초
+
+    # 트래킹 데이터 월별 파티션 (PostgreSQL)
+    TRACKING_PARTITION_MONTHS_AHEAD: int = 2  # 미리 생성할 다음 달 파티션 수
+    TRACKING_RETENTION_MONTHS: int = 12  # 이 기간이 지난 파티션은 분리 후 보관
+    TRACKING_ARCHIVE_DIR: str = "archive/eye_tracking_data"
+    
+    # 분석 결과 캐시 설정
+    ANALYTICS_CACHE_MAX_ENTRIES: int = 1024
+    ANALYTICS_CACHE_TTL: int = 60  # 초 (무효화는 프로세스 단위라 다른 워커의 쓰기는 TTL 후 반영)
+    
+    @model_validator(mode="after")
+    def check_tracking_buffer(self) -> "Settings":
+        # 처리 단위가 링 버퍼보다 크면 버퍼가 가득 차도 처리할 수 없음
+        if self.TRACKING_BUFFER_SIZE > self.TRACKING_BUFFER_CAPACITY:
+            raise ValueError("TRACKING_BUFFER_SIZE must not exceed TRACKING_BUFFER_CAPACITY")
+        return self
+    
     @property
     def CORS_ORIGINS_LIST(self) -> list:
         return [origin.strip() for origin in self.CORS_ORIGINS.split(",")]
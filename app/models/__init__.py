@@ -4,4 +4,4 @@ from app.models.story import Story
 from app.models.page import Page
 from app.models.sketch import Sketch
 from app.models.game import GameProgress
-from app.models.tracking import EyeTrackingData
\ No newline at end of file
+from app.models.tracking import EyeTrackingData, ReadingDailyRollup, PageHeatmapAggregate
\ No newline at end of file
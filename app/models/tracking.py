@@ -1,18 +1,77 @@
 # app/models/tracking.py
-from sqlalchemy import Column, Integer, JSON, ForeignKey
+from datetime import datetime
+from sqlalchemy import Column, Integer, Float, String, Date, DateTime, JSON, ForeignKey, LargeBinary, Index, UniqueConstraint, text
 from sqlalchemy.orm import relationship
 from app.db.base import Base, TimeStampMixin
 
 class EyeTrackingData(Base, TimeStampMixin):
+    # PostgreSQL에서는 created_at 기준 월별 파티션 테이블 (기본 키는 id, created_at)
     __tablename__ = "eye_tracking_data"
+    __table_args__ = (
+        Index("ix_eye_tracking_data_user_story_session", "user_id", "story_id", "session_id"),
+        Index("ix_eye_tracking_data_user_story_created", "user_id", "story_id", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     story_id = Column(Integer, ForeignKey("stories.id", ondelete="CASCADE"), nullable=False)
     page_id = Column(Integer, ForeignKey("pages.id", ondelete="CASCADE"), nullable=False)
     tracking_data = Column(JSON, nullable=False)
+    tracking_blob = Column(LargeBinary, nullable=True)  # 고정점/히트맵 바이너리 (TrackingCodec)
+    session_id = Column(String, nullable=True)
+    pattern = Column(String, nullable=True, index=True)
+    completed_at = Column(DateTime, nullable=True, index=True)
 
     # Relationships
     user = relationship("User", back_populates="eye_tracking_data")
     story = relationship("Story", back_populates="eye_tracking_data")
-    page = relationship("Page", back_populates="eye_tracking_data")
\ No newline at end of file
+    page = relationship("Page", back_populates="eye_tracking_data")
+
+class ReadingDailyRollup(Base):
+    """사용자/동화책/일자별 읽기 지표 집계 (세션 저장 시 갱신)"""
+    __tablename__ = "reading_daily_rollups"
+    __table_args__ = (
+        UniqueConstraint("user_id", "story_id", "day", name="uq_reading_daily_rollups_user_story_day"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    story_id = Column(Integer, ForeignKey("stories.id", ondelete="CASCADE"), nullable=False)
+    day = Column(Date, nullable=False)
+    session_count = Column(Integer, nullable=False, default=0)
+    total_time = Column(Float, nullable=False, default=0.0)
+    reading_speed_sum = Column(Float, nullable=False, default=0.0)
+    comprehension_sum = Column(Float, nullable=False, default=0.0)
+    attention_sum = Column(Float, nullable=False, default=0.0)
+    attention_min = Column(Float, nullable=True)
+    attention_max = Column(Float, nullable=True)
+    pattern_counts = Column(JSON, nullable=False, default=dict)
+    updated_at = Column(DateTime, nullable=False)
+
+
+class PageHeatmapAggregate(Base):
+    """페이지별 세션 히트맵 누적 합계 (user_id가 NULL이면 전체 사용자)"""
+    __tablename__ = "page_heatmap_aggregates"
+    __table_args__ = (
+        # 전체 사용자 합계(user_id NULL)도 중복되지 않도록 부분 유니크 인덱스 두 개로 구분
+        Index(
+            "uq_page_heatmap_aggregates_page_user_resolution", "page_id", "user_id", "resolution",
+            unique=True,
+            postgresql_where=text("user_id IS NOT NULL"),
+            sqlite_where=text("user_id IS NOT NULL")
+        ),
+        Index(
+            "uq_page_heatmap_aggregates_page_resolution_all", "page_id", "resolution",
+            unique=True,
+            postgresql_where=text("user_id IS NULL"),
+            sqlite_where=text("user_id IS NULL")
+        ),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    page_id = Column(Integer, ForeignKey("pages.id", ondelete="CASCADE"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=True)
+    resolution = Column(Integer, nullable=False)
+    session_count = Column(Integer, nullable=False, default=0)
+    heatmap_sum = Column(LargeBinary, nullable=False)  # float64 resolution x resolution
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow)
@@ -2,6 +2,7 @@
 from pydantic import BaseModel, validator
 from typing import List, Dict, Any, Optional
 from datetime import datetime
+from app.core.config import settings
 
 class GazePoint(BaseModel):
     x: float
@@ -15,6 +16,17 @@ class GazePoint(BaseModel):
             raise ValueError("Coordinate must be between 0 and 1")
         return v
 
+class GazeBatch(BaseModel):
+    points: List[GazePoint]
+
+    @validator('points')
+    def validate_points(cls, v):
+        if not v:
+            raise ValueError("Batch must contain at least one gaze point")
+        if len(v) > settings.TRACKING_BATCH_MAX_POINTS:
+            raise ValueError(f"Batch must not exceed {settings.TRACKING_BATCH_MAX_POINTS} gaze points")
+        return v
+
 class ReadingMetrics(BaseModel):
     total_time: float
     fixation_count: int
@@ -0,0 +1,102 @@
+# app/services/analytics_cache.py
+import copy
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Set, Tuple
+from app.core.config import settings
+
+# (분석 종류, user_id, story_id, 파라미터)
+CacheKey = Tuple[str, int, int, Tuple[Any, ...]]
+Scope = Tuple[int, int]
+
+
+class AnalyticsCache:
+    """분석 결과 캐시 (크기/TTL 제한, 사용자+동화책 단위 무효화)
+
+    저장/조회 시 값을 복사하므로 호출하는 쪽에서 결과를 수정해도 캐시에 영향이 없습니다.
+    무효화는 프로세스 안에서만 전파되므로, 워커가 여러 개이면 다른 워커의 쓰기는
+    TTL이 지나야 반영됩니다 (ANALYTICS_CACHE_TTL이 허용 가능한 지연 상한).
+    """
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[CacheKey, Tuple[float, Any]]" = OrderedDict()
+        self._scopes: Dict[Scope, Set[CacheKey]] = {}
+        # 무효화 세대: 계산 도중 무효화된 결과가 저장되지 않도록 확인
+        self._generations: Dict[Scope, int] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.evictions = 0
+
+    def lookup(self, key: CacheKey) -> Tuple[Optional[Any], int]:
+        """캐시 조회 (값, 세대) - 미스면 값은 None, 세대는 store에 그대로 전달"""
+        scope = (key[1], key[2])
+        with self._lock:
+            generation = self._generations.get(scope, 0)
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry[0] < self.ttl:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                value = entry[1]
+            else:
+                if entry is not None:
+                    self._remove(key)
+                self.misses += 1
+                return None, generation
+        # 저장된 값은 교체만 되고 수정되지 않으므로 잠금 밖에서 복사
+        return copy.deepcopy(value), generation
+
+    def store(self, key: CacheKey, value: Any, generation: int) -> None:
+        """결과 저장 (조회 이후 무효화되었으면 저장하지 않음)"""
+        scope = (key[1], key[2])
+        value = copy.deepcopy(value)
+        with self._lock:
+            if self._generations.get(scope, 0) != generation:
+                return
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            self._scopes.setdefault(scope, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def invalidate(self, user_id: int, story_id: int) -> None:
+        """사용자+동화책의 모든 분석 결과 제거 (쓰기 경로에서 호출)"""
+        scope = (user_id, story_id)
+        with self._lock:
+            self._generations[scope] = self._generations.get(scope, 0) + 1
+            for key in self._scopes.pop(scope, set()):
+                self._entries.pop(key, None)
+            self.invalidations += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """캐시 상태"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "invalidations": self.invalidations,
+                "evictions": self.evictions
+            }
+
+    def _remove(self, key: CacheKey) -> None:
+        self._entries.pop(key, None)
+        scope_keys = self._scopes.get((key[1], key[2]))
+        if scope_keys is not None:
+            scope_keys.discard(key)
+            if not scope_keys:
+                del self._scopes[(key[1], key[2])]
+
+analytics_cache = AnalyticsCache(
+    max_entries=settings.ANALYTICS_CACHE_MAX_ENTRIES,
+    ttl=settings.ANALYTICS_CACHE_TTL
+)
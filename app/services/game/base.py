@@ -6,6 +6,7 @@ from app.models.game import GameProgress
 from app.schemas.game import GameType, GameStatus
 from app.utils.game import GameProgressTracker, GameAnalyzer
 from app.core.exceptions import DrawryException
+from app.services.analytics_cache import analytics_cache
 
 class GameService:
     def __init__(self, db: Session):
@@ -31,6 +32,7 @@ class GameService:
             self.db.add(game)
             self.db.commit()
             self.db.refresh(game)
+            analytics_cache.invalidate(game.user_id, game.story_id)
             return game
         except Exception as e:
             self.db.rollback()
@@ -69,6 +71,7 @@ class GameService:
             
             self.db.commit()
             self.db.refresh(game)
+            analytics_cache.invalidate(game.user_id, game.story_id)
             return game
         except Exception as e:
             self.db.rollback()
@@ -95,6 +98,7 @@ class GameService:
             
             self.db.commit()
             self.db.refresh(game)
+            analytics_cache.invalidate(game.user_id, game.story_id)
             return game
         except Exception as e:
             self.db.rollback()
@@ -111,6 +115,11 @@ class GameService:
         story_id: int
     ) -> Dict[str, Any]:
         """게임 분석 데이터 조회"""
+        cache_key = ("game_analytics", user_id, story_id, ())
+        cached, generation = analytics_cache.lookup(cache_key)
+        if cached is not None:
+            return cached
+
         games = self.db.query(GameProgress).filter(
             GameProgress.user_id == user_id,
             GameProgress.story_id == story_id
@@ -131,4 +140,5 @@ class GameService:
                     "completed": len([g for g in type_games if g.status == GameStatus.COMPLETED.value])
                 }
 
+        analytics_cache.store(cache_key, analytics, generation)
         return analytics
\ No newline at end of file
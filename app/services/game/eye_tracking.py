@@ -1,9 +1,16 @@
 # app/services/game/eye_tracking.py 생성
 from datetime import datetime
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+import numpy as np
 from sqlalchemy.orm import Session
 from app.models.tracking import EyeTrackingData
+from app.core.config import settings
 from app.core.exceptions import DrawryException
+from app.services.analytics_cache import analytics_cache
+
+FOCUS_STREAM_BATCH_SIZE = 500
+LINEAR_Y_THRESHOLD = 0.1  # 줄 이동으로 보는 y 변화량
+ATTENTION_ZONE_LIMIT = 5
 
 class EyeTrackingService:
     def __init__(self, db: Session):
@@ -28,6 +35,7 @@ class EyeTrackingService:
             self.db.add(tracking)
             self.db.commit()
             self.db.refresh(tracking)
+            analytics_cache.invalidate(user_id, story_id)
             return tracking
         except Exception as e:
             self.db.rollback()
@@ -45,6 +53,11 @@ class EyeTrackingService:
         page_id: Optional[int] = None
     ) -> Dict[str, Any]:
         """아이트래킹 데이터 분석"""
+        cache_key = ("eye_tracking", user_id, story_id, (page_id,))
+        cached, generation = analytics_cache.lookup(cache_key)
+        if cached is not None:
+            return cached
+
         query = self.db.query(EyeTrackingData).filter(
             EyeTrackingData.user_id == user_id,
             EyeTrackingData.story_id == story_id
@@ -53,65 +66,127 @@ class EyeTrackingService:
         if page_id:
             query = query.filter(EyeTrackingData.page_id == page_id)
 
-        tracking_data = query.all()
-        
-        if not tracking_data:
+        # 포커스 포인트와 읽기 시간만 조회하여 세션 단위로 스트리밍
+        rows = query.with_entities(
+            EyeTrackingData.tracking_data["focus_points"].label("focus_points"),
+            EyeTrackingData.tracking_data["reading_time"].label("reading_time")
+        ).yield_per(FOCUS_STREAM_BATCH_SIZE)
+
+        analysis = self._analyze_reading_patterns(rows)
+        if analysis is None:
             return {
                 "total_sessions": 0,
                 "analysis": {}
             }
 
-        return {
-            "total_sessions": len(tracking_data),
-            "analysis": self._analyze_reading_patterns(tracking_data)
+        total_sessions, analysis = analysis
+        result = {
+            "total_sessions": total_sessions,
+            "analysis": analysis
         }
+        analytics_cache.store(cache_key, result, generation)
+        return result
 
-    def _analyze_reading_patterns(
-        self,
-        tracking_data: List[EyeTrackingData]
-    ) -> Dict[str, Any]:
-        """읽기 패턴 분석"""
-        total_focus_points = []
+    def _analyze_reading_patterns(self, rows: Iterable[Any]) -> Optional[Tuple[int, Dict[str, Any]]]:
+        """읽기 패턴 분석 (세션 수, 분석 결과)
+
+        세션을 하나씩 격자에 누적하므로 포인트 수와 관계없이 grid_size² 크기만 유지합니다.
+        """
+        grid_size = settings.TRACKING_FOCUS_GRID_SIZE
+        counts = np.zeros(grid_size * grid_size, dtype=np.int64)
         total_reading_time = 0
+        sessions = 0
+        # 세션을 이어 붙인 순서대로 y 변화 횟수 누적
+        total_points = 0
+        y_changes = 0
+        prev_y = None
 
-        for data in tracking_data:
-            focus_points = data.tracking_data.get("focus_points", [])
-            reading_time = data.tracking_data.get("reading_time", 0)
-            
-            total_focus_points.extend(focus_points)
-            total_reading_time += reading_time
+        for focus_points, reading_time in rows:
+            sessions += 1
+            total_reading_time += reading_time or 0
+            if not focus_points:
+                continue
 
-        return {
-            "average_reading_time": total_reading_time / len(tracking_data),
-            "focus_points_frequency": self._calculate_focus_points_frequency(total_focus_points),
-            "reading_pattern_summary": self._summarize_reading_pattern(total_focus_points)
+            x, y = self._to_arrays(focus_points)
+            counts += self._grid_counts(x, y, grid_size)
+
+            if prev_y is not None:
+                y_changes += int(abs(y[0] - prev_y) > LINEAR_Y_THRESHOLD)
+            y_changes += int(np.count_nonzero(np.abs(np.diff(y)) > LINEAR_Y_THRESHOLD))
+            prev_y = y[-1]
+            total_points += x.size
+
+        if sessions == 0:
+            return None
+
+        return sessions, {
+            "average_reading_time": total_reading_time / sessions,
+            "focus_points_frequency": self._calculate_focus_points_frequency(counts, grid_size),
+            "reading_pattern_summary": self._summarize_reading_pattern(counts, grid_size, total_points, y_changes)
         }
 
-    def _calculate_focus_points_frequency(self, focus_points: List[Dict[str, Any]]) -> Dict[str, int]:
-        """포커스 포인트 빈도 계산"""
+    @staticmethod
+    def _to_arrays(focus_points: List[Dict[str, Any]]) -> Tuple[np.ndarray, np.ndarray]:
+        count = len(focus_points)
+        x = np.fromiter((p.get('x', 0) for p in focus_points), dtype=np.float64, count=count)
+        y = np.fromiter((p.get('y', 0) for p in focus_points), dtype=np.float64, count=count)
+        return x, y
+
+    @staticmethod
+    def _grid_counts(x: np.ndarray, y: np.ndarray, grid_size: int) -> np.ndarray:
+        """정규화 좌표를 격자 셀로 양자화하여 셀별 개수 계산"""
+        x_idx = np.clip((x * grid_size).astype(np.intp), 0, grid_size - 1)
+        y_idx = np.clip((y * grid_size).astype(np.intp), 0, grid_size - 1)
+        return np.bincount(y_idx * grid_size + x_idx, minlength=grid_size * grid_size)
+
+    @staticmethod
+    def _cell_center(cell: int, grid_size: int) -> Tuple[float, float]:
+        row, col = divmod(cell, grid_size)
+        return (col + 0.5) / grid_size, (row + 0.5) / grid_size
+
+    def _calculate_focus_points_frequency(self, counts: np.ndarray, grid_size: int) -> Dict[str, int]:
+        """포커스 포인트 빈도 계산 (격자 셀 중심 좌표 "x-y" 키, 비어 있지 않은 셀만)"""
         frequency = {}
-        for point in focus_points:
-            area = f"{point.get('x', 0)}-{point.get('y', 0)}"
-            frequency[area] = frequency.get(area, 0) + 1
+        for cell in np.flatnonzero(counts).tolist():
+            x, y = self._cell_center(cell, grid_size)
+            frequency[f"{x:.4f}-{y:.4f}"] = int(counts[cell])
         return frequency
 
-    def _summarize_reading_pattern(self, focus_points: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def _summarize_reading_pattern(
+        self,
+        counts: np.ndarray,
+        grid_size: int,
+        total_points: int,
+        y_changes: int
+    ) -> Dict[str, Any]:
         """읽기 패턴 요약"""
-        if not focus_points:
+        if total_points == 0:
             return {}
 
         return {
-            "pattern_type": "linear" if self._is_linear_pattern(focus_points) else "scattered",
-            "attention_zones": self._identify_attention_zones(focus_points)
+            "pattern_type": "linear" if self._is_linear_pattern(total_points, y_changes) else "scattered",
+            "attention_zones": self._identify_attention_zones(counts, grid_size)
         }
 
-    def _is_linear_pattern(self, focus_points: List[Dict[str, Any]]) -> bool:
-        """선형 읽기 패턴 여부 확인"""
-        if len(focus_points) < 3:
+    def _is_linear_pattern(self, total_points: int, y_changes: int) -> bool:
+        """선형 읽기 패턴 여부 확인 (줄 이동 비율이 절반 이하)"""
+        if total_points < 3:
             return True
+        return y_changes / (total_points - 1) <= 0.5
 
-        prev_y = focus_points[0].get('y', 0)
-        y_changes = 0
+    def _identify_attention_zones(self, counts: np.ndarray, grid_size: int) -> List[Dict[str, Any]]:
+        """포커스 포인트가 가장 많이 모인 셀 목록"""
+        nonzero = np.flatnonzero(counts)
+        top = nonzero[np.argsort(counts[nonzero], kind="stable")[::-1][:ATTENTION_ZONE_LIMIT]]
+        total = counts.sum()
 
-        for point in focus_points[1:]:
-            curr_y = point.get('y', 0)
\ No newline at end of file
+        zones = []
+        for cell in top.tolist():
+            x, y = self._cell_center(cell, grid_size)
+            zones.append({
+                "x": x,
+                "y": y,
+                "count": int(counts[cell]),
+                "ratio": float(counts[cell] / total)
+            })
+        return zones
@@ -1,11 +1,22 @@
 # app/services/tracking/analyzer.py 생성
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterable, Optional
 from datetime import datetime, timedelta
+import numpy as np
 from sqlalchemy import func
 from sqlalchemy.orm import Session
-from app.models.tracking import EyeTrackingData
+from app.models.tracking import EyeTrackingData, ReadingDailyRollup
 from app.core.exceptions import DrawryException
 from app.utils.tracking import TrackingUtils
+from app.utils.tracking_codec import TrackingCodec
+from app.services.analytics_cache import analytics_cache
+
+# 세션 단위 분석 시 한 번에 가져오는 행 수
+SESSION_STREAM_BATCH_SIZE = 500
+
+# 주의 영역 분석 기준 (히트맵 최대값 대비 비율)
+FOCUS_AREA_THRESHOLD = 0.5  # 이 이상인 셀이 연결된 영역을 집중 영역으로 묶음
+PEAK_ZONE_THRESHOLD = 0.2  # 이 이하인 국소 최대값은 잡음으로 무시
+MAX_ATTENTION_ZONES = 5
 
 class TrackingAnalyzer:
     def __init__(self, db: Session):
@@ -16,14 +27,20 @@ class TrackingAnalyzer:
         self,
         user_id: int,
         story_id: int,
-        session_id: str
+        session_id: str,
+        resolution: Optional[int] = None
     ) -> Dict[str, Any]:
-        """특정 세션의 읽기 패턴 분석"""
+        """특정 세션의 읽기 패턴 분석 (resolution을 지정하면 해당 해상도 히트맵으로 분석하고 함께 반환)"""
+        cache_key = ("reading_session", user_id, story_id, (session_id, resolution))
+        cached, generation = analytics_cache.lookup(cache_key)
+        if cached is not None:
+            return cached
+
         try:
             session_data = self.db.query(EyeTrackingData).filter(
                 EyeTrackingData.user_id == user_id,
                 EyeTrackingData.story_id == story_id,
-                EyeTrackingData.tracking_data["session_id"].astext == session_id
+                EyeTrackingData.session_id == session_id
             ).first()
 
             if not session_data:
@@ -34,13 +51,16 @@ class TrackingAnalyzer:
                 )
 
             tracking_data = session_data.tracking_data
-            return {
-                "session_id": session_id,
-                "reading_pattern": tracking_data["pattern"],
-                "reading_metrics": self._analyze_reading_metrics(tracking_data["metrics"]),
-                "attention_map": self._analyze_attention_distribution(tracking_data["heatmap"]),
-                "completion_time": tracking_data.get("completed_at")
-            }
+            analysis = self._build_session_analysis(
+                session_id=session_id,
+                pattern=session_data.pattern or tracking_data["pattern"],
+                metrics=tracking_data["metrics"],
+                heatmap=self._read_session_heatmap(tracking_data, session_data.tracking_blob, resolution),
+                completed_at=session_data.completed_at or tracking_data.get("completed_at"),
+                resolution=resolution
+            )
+            analytics_cache.store(cache_key, analysis, generation)
+            return analysis
 
         except DrawryException:
             raise
@@ -52,44 +72,119 @@ class TrackingAnalyzer:
                 details={"error": str(e)}
             )
 
+    def analyze_completed_session(
+        self,
+        session_data: Dict[str, Any],
+        resolution: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """방금 저장한 세션 결과를 다시 조회하지 않고 바로 분석"""
+        try:
+            return self._build_session_analysis(
+                session_id=session_data["session_id"],
+                pattern=session_data["pattern"],
+                metrics=session_data["metrics"],
+                heatmap=(
+                    session_data["heatmap"] if resolution is None
+                    else session_data["heatmap_pyramid"][resolution]
+                ),
+                completed_at=session_data.get("completed_at"),
+                resolution=resolution
+            )
+        except Exception as e:
+            raise DrawryException(
+                code="ANALYSIS_ERROR",
+                message="Failed to analyze reading session",
+                status_code=500,
+                details={"error": str(e)}
+            )
+
+    def _build_session_analysis(
+        self,
+        session_id: str,
+        pattern: str,
+        metrics: Dict[str, Any],
+        heatmap: Any,
+        completed_at: Any,
+        resolution: Optional[int] = None
+    ) -> Dict[str, Any]:
+        heatmap = np.asarray(heatmap, dtype=np.float64)
+        analysis = {
+            "session_id": session_id,
+            "reading_pattern": pattern,
+            "reading_metrics": self._analyze_reading_metrics(metrics),
+            # 히트맵 하나의 계산은 1ms 안팎이라 작업 풀 전달 비용이 더 크므로 요청 안에서 바로 계산
+            "attention_map": self._analyze_attention_distribution(heatmap),
+            "completion_time": completed_at
+        }
+        if resolution is not None:
+            analysis["heatmap_resolution"] = resolution
+            analysis["heatmap"] = heatmap.tolist()
+        return analysis
+
+    def _read_session_heatmap(
+        self,
+        tracking_data: Dict[str, Any],
+        blob: Optional[bytes],
+        resolution: Optional[int]
+    ) -> np.ndarray:
+        """저장된 세션 히트맵 조회 (resolution이 None이면 기본 히트맵, 그 외에는 피라미드 단계)"""
+        if resolution is None:
+            return TrackingCodec.read_heatmap(tracking_data, blob)
+
+        heatmap = TrackingCodec.read_pyramid(tracking_data, blob).get(resolution)
+        if heatmap is None:
+            # 피라미드 저장 이전 세션은 저장된 고정점에서 계산
+            fixations = TrackingCodec.read_fixations(tracking_data, blob)
+            heatmap = self.utils.heatmap_pyramid(
+                fixations["x"], fixations["y"], fixations["duration"], levels=(resolution,)
+            )[resolution]
+        return heatmap
+
     async def analyze_user_progress(
         self,
         user_id: int,
         story_id: int,
-        time_range: Optional[int] = 30  # 기본 30일
+        time_range: Optional[int] = 30,  # 기본 30일
+        granularity: str = "day"
     ) -> Dict[str, Any]:
-        """사용자의 읽기 진행도 분석"""
+        """사용자의 읽기 진행도 분석
+
+        - day: 일별 집계(ReadingDailyRollup)로 분석 (기본)
+        - session: 저장된 세션 전체를 읽어서 세션 단위로 분석
+        """
+        cache_key = ("user_progress", user_id, story_id, (time_range, granularity))
+        cached, generation = analytics_cache.lookup(cache_key)
+        if cached is not None:
+            return cached
+
         try:
             start_date = datetime.utcnow() - timedelta(days=time_range)
+
+            if granularity == "day":
+                progress = self._analyze_daily_progress(user_id, story_id, start_date)
+                analytics_cache.store(cache_key, progress, generation)
+                return progress
             
-            sessions = self.db.query(EyeTrackingData).filter(
+            # 분석에 필요한 컬럼과 metrics 하위 필드만 조회하고 배치 단위로 스트리밍
+            # (created_at 범위 조건으로 기간에 해당하는 월 파티션만 조회)
+            rows = self.db.query(
+                EyeTrackingData.created_at,
+                func.coalesce(
+                    EyeTrackingData.pattern,
+                    EyeTrackingData.tracking_data["pattern"].as_string()
+                ).label("pattern"),
+                EyeTrackingData.tracking_data["metrics"].label("metrics")
+            ).filter(
                 EyeTrackingData.user_id == user_id,
                 EyeTrackingData.story_id == story_id,
-                EyeTrackingData.created_at >= start_date
-            ).order_by(EyeTrackingData.created_at).all()
-
-            if not sessions:
-                return {
-                    "total_sessions": 0,
-                    "progress_data": {}
-                }
+                EyeTrackingData.created_at >= start_date,
+                # 버퍼 청크 행은 제외하고 세션 단위 행만 분석
+                EyeTrackingData.session_id.isnot(None)
+            ).order_by(EyeTrackingData.created_at).yield_per(SESSION_STREAM_BATCH_SIZE)
 
-            # 진행도 분석
-            progress_data = self._analyze_progress_trend(sessions)
-            
-            # 패턴 변화 분석
-            pattern_changes = self._analyze_pattern_changes(sessions)
-            
-            # 집중도 변화 분석
-            attention_trends = self._analyze_attention_trends(sessions)
-
-            return {
-                "total_sessions": len(sessions),
-                "progress_data": progress_data,
-                "pattern_changes": pattern_changes,
-                "attention_trends": attention_trends,
-                "improvement_suggestions": self._generate_suggestions(progress_data)
-            }
+            progress = self._analyze_session_stream(rows)
+            analytics_cache.store(cache_key, progress, generation)
+            return progress
 
         except Exception as e:
             raise DrawryException(
@@ -99,64 +194,241 @@ class TrackingAnalyzer:
                 details={"error": str(e)}
             )
 
+    def _analyze_daily_progress(
+        self,
+        user_id: int,
+        story_id: int,
+        start_date: datetime
+    ) -> Dict[str, Any]:
+        """일별 집계 기반 진행도 분석"""
+        rollups = self.db.query(ReadingDailyRollup).filter(
+            ReadingDailyRollup.user_id == user_id,
+            ReadingDailyRollup.story_id == story_id,
+            ReadingDailyRollup.day >= start_date.date()
+        ).order_by(ReadingDailyRollup.day).all()
+
+        if not rollups:
+            return {
+                "total_sessions": 0,
+                "progress_data": {}
+            }
+
+        trend_data = []
+        pattern_counts: Dict[str, int] = {}
+        daily_patterns = []
+        total_sessions = 0
+        attention_sum = 0.0
+        for rollup in rollups:
+            count = rollup.session_count
+            total_sessions += count
+            attention_sum += rollup.attention_sum
+            trend_data.append({
+                "date": rollup.day.isoformat(),
+                "sessions": count,
+                "reading_speed": rollup.reading_speed_sum / count,
+                "comprehension": rollup.comprehension_sum / count,
+                "attention": rollup.attention_sum / count
+            })
+            for pattern, pattern_count in rollup.pattern_counts.items():
+                pattern_counts[pattern] = pattern_counts.get(pattern, 0) + pattern_count
+            # 그날 가장 많이 나타난 패턴
+            daily_patterns.append(max(rollup.pattern_counts, key=rollup.pattern_counts.get))
+
+        progress_data = {
+            "trend_data": trend_data,
+            "improvement_rate": self._calculate_improvement_rate(trend_data)
+        }
+        daily_attention = [d["attention"] for d in trend_data]
+
+        return {
+            "total_sessions": total_sessions,
+            "progress_data": progress_data,
+            "pattern_changes": {
+                "pattern_distribution": pattern_counts,
+                "pattern_evolution": self._analyze_pattern_evolution(daily_patterns)
+            },
+            "attention_trends": {
+                "average_attention": attention_sum / total_sessions,
+                "attention_trend": self._calculate_trend(daily_attention),
+                "attention_stability": self._calculate_stability(daily_attention)
+            },
+            "improvement_suggestions": self._generate_suggestions(progress_data)
+        }
+
     def _analyze_reading_metrics(self, metrics: Dict[str, Any]) -> Dict[str, Any]:
         """읽기 메트릭스 상세 분석"""
         return {
             "reading_speed": self._calculate_reading_speed(metrics),
             "comprehension_estimate": self._estimate_comprehension(metrics),
             "attention_score": metrics.get("attention_score", 0),
-            "efficiency_score": self._calculate_efficiency(metrics)
+            "efficiency_score": self._calculate_efficiency(metrics),
+            # 도약 지표가 없는 이전 데이터는 None
+            "saccade_count": metrics.get("saccade_count"),
+            "regression_count": metrics.get("regression_count"),
+            "line_return_count": metrics.get("line_return_count"),
+            "regression_rate": metrics.get("regression_rate")
         }
 
-    def _analyze_attention_distribution(self, heatmap: List[List[float]]) -> Dict[str, Any]:
+    @staticmethod
+    def _analyze_attention_distribution(heatmap: np.ndarray) -> Dict[str, Any]:
         """주의 집중 분포 분석"""
-        import numpy as np
-        heatmap_array = np.array(heatmap)
+        heatmap_array = np.asarray(heatmap, dtype=np.float64)
+        empty = heatmap_array.size == 0
         
         return {
-            "focus_areas": self._identify_focus_areas(heatmap_array),
-            "attention_density": float(np.mean(heatmap_array)),
-            "attention_variance": float(np.var(heatmap_array)),
-            "peak_attention_zones": self._find_peak_attention_zones(heatmap_array)
+            "focus_areas": TrackingAnalyzer._identify_focus_areas(heatmap_array),
+            "attention_density": 0.0 if empty else float(np.mean(heatmap_array)),
+            "attention_variance": 0.0 if empty else float(np.var(heatmap_array)),
+            "peak_attention_zones": TrackingAnalyzer._find_peak_attention_zones(heatmap_array)
         }
 
-    def _analyze_progress_trend(self, sessions: List[EyeTrackingData]) -> Dict[str, Any]:
-        """진행도 추세 분석"""
+    @staticmethod
+    def _identify_focus_areas(heatmap: np.ndarray) -> List[Dict[str, Any]]:
+        """최대값 대비 FOCUS_AREA_THRESHOLD 이상인 셀이 연결된 영역 (주의 합계 내림차순)
+
+        좌표는 페이지 기준 정규화 값이며, attention_share는 전체 히트맵 합계 대비 영역 합계 비율입니다.
+        """
+        if heatmap.ndim != 2 or heatmap.size == 0:
+            return []
+        peak = heatmap.max()
+        if peak <= 0:
+            return []
+
+        rows, cols = heatmap.shape
+        labels, count = TrackingUtils.label_regions(heatmap >= peak * FOCUS_AREA_THRESHOLD)
+        cell_y, cell_x = np.nonzero(labels >= 0)
+        region = labels[cell_y, cell_x]
+        values = heatmap[cell_y, cell_x]
+
+        # 영역별 합계/무게중심은 bincount로 계산
+        cell_count = np.bincount(region, minlength=count)
+        attention = np.bincount(region, weights=values, minlength=count)
+        center_x = np.bincount(region, weights=values * (cell_x + 0.5), minlength=count) / attention / cols
+        center_y = np.bincount(region, weights=values * (cell_y + 0.5), minlength=count) / attention / rows
+
+        # 최대값/경계는 영역 순으로 안정 정렬한 뒤 구간별로 계산 (모든 영역에 셀이 있으므로 구간 수 = count)
+        order = np.argsort(region, kind="stable")
+        sorted_region = region[order]
+        starts = np.concatenate(([0], np.flatnonzero(sorted_region[1:] != sorted_region[:-1]) + 1))
+        ends = np.append(starts[1:], order.size) - 1
+        sorted_x, sorted_y = cell_x[order], cell_y[order]
+        region_peak = np.maximum.reduceat(values[order], starts)
+        x0 = np.minimum.reduceat(sorted_x, starts)
+        x1 = np.maximum.reduceat(sorted_x, starts) + 1
+        # 셀이 행 우선 순서이므로 영역의 첫 셀/마지막 셀이 위/아래 경계
+        y0 = sorted_y[starts]
+        y1 = sorted_y[ends] + 1
+
+        total = heatmap.sum()
+        order = np.argsort(-attention, kind="stable")[:MAX_ATTENTION_ZONES]
+        return [
+            {
+                "rank": rank,
+                "center": {"x": float(center_x[i]), "y": float(center_y[i])},
+                "bounds": {
+                    "x0": float(x0[i] / cols),
+                    "y0": float(y0[i] / rows),
+                    "x1": float(x1[i] / cols),
+                    "y1": float(y1[i] / rows)
+                },
+                "cell_count": int(cell_count[i]),
+                "peak": float(region_peak[i]),
+                "attention_share": float(attention[i] / total)
+            }
+            for rank, i in enumerate(order.tolist(), start=1)
+        ]
+
+    @staticmethod
+    def _find_peak_attention_zones(heatmap: np.ndarray) -> List[Dict[str, Any]]:
+        """히트맵 국소 최대값 (값 내림차순, 최대값 대비 PEAK_ZONE_THRESHOLD 초과만)"""
+        if heatmap.ndim != 2 or heatmap.size == 0:
+            return []
+        peak = heatmap.max()
+        if peak <= 0:
+            return []
+
+        rows, cols = heatmap.shape
+        indices = TrackingUtils.local_maxima(heatmap, peak * PEAK_ZONE_THRESHOLD)[:MAX_ATTENTION_ZONES]
+        cell_y, cell_x = np.divmod(indices, cols)
+        return [
+            {
+                "rank": rank,
+                "x": (x + 0.5) / cols,
+                "y": (y + 0.5) / rows,
+                "value": value
+            }
+            for rank, (x, y, value) in enumerate(
+                zip(cell_x.tolist(), cell_y.tolist(), heatmap.ravel()[indices].tolist()),
+                start=1
+            )
+        ]
+
+    def _analyze_session_stream(self, rows: Iterable[Any]) -> Dict[str, Any]:
+        """세션별 진행도/패턴 변화/집중도 추세를 한 번의 순회로 분석
+
+        조회 결과는 배치 단위로 순회하고 패턴 분포와 집중도 통계는 누적 값만 유지하지만,
+        응답에 포함되는 trend_data와 pattern_evolution은 세션 수에 비례해 커집니다.
+        """
         trend_data = []
-        for session in sessions:
-            metrics = session.tracking_data["metrics"]
+        pattern_distribution: Dict[str, int] = {}
+        pattern_evolution = []
+        previous_pattern = None
+        count = 0
+        attention_sum = 0.0
+        attention_first = attention_last = 0.0
+        attention_min = attention_max = 0.0
+
+        for created_at, pattern, metrics in rows:
+            metrics = metrics or {}
+            attention = metrics.get("attention_score", 0)
+
+            # 진행도
             trend_data.append({
-                "date": session.created_at.isoformat(),
+                "date": created_at.isoformat(),
                 "reading_speed": self._calculate_reading_speed(metrics),
                 "comprehension": self._estimate_comprehension(metrics),
-                "attention": metrics.get("attention_score", 0)
+                "attention": attention
             })
 
-        return {
+            # 패턴 변화
+            pattern_distribution[pattern] = pattern_distribution.get(pattern, 0) + 1
+            if count and pattern != previous_pattern:
+                pattern_evolution.append({"index": count, "from": previous_pattern, "to": pattern})
+            previous_pattern = pattern
+
+            # 집중도
+            if count == 0:
+                attention_first = attention_min = attention_max = attention
+            attention_min = min(attention_min, attention)
+            attention_max = max(attention_max, attention)
+            attention_last = attention
+            attention_sum += attention
+            count += 1
+
+        if count == 0:
+            return {
+                "total_sessions": 0,
+                "progress_data": {}
+            }
+
+        progress_data = {
             "trend_data": trend_data,
             "improvement_rate": self._calculate_improvement_rate(trend_data)
         }
 
-    def _analyze_pattern_changes(self, sessions: List[EyeTrackingData]) -> Dict[str, Any]:
-        """읽기 패턴 변화 분석"""
-        patterns = [s.tracking_data["pattern"] for s in sessions]
-        
-        return {
-            "pattern_distribution": self._calculate_pattern_distribution(patterns),
-            "pattern_evolution": self._analyze_pattern_evolution(patterns)
-        }
-
-    def _analyze_attention_trends(self, sessions: List[EyeTrackingData]) -> Dict[str, Any]:
-        """집중도 변화 추세 분석"""
-        attention_scores = [
-            s.tracking_data["metrics"].get("attention_score", 0) 
-            for s in sessions
-        ]
-        
         return {
-            "average_attention": sum(attention_scores) / len(attention_scores),
-            "attention_trend": self._calculate_trend(attention_scores),
-            "attention_stability": self._calculate_stability(attention_scores)
+            "total_sessions": count,
+            "progress_data": progress_data,
+            "pattern_changes": {
+                "pattern_distribution": pattern_distribution,
+                "pattern_evolution": pattern_evolution
+            },
+            "attention_trends": {
+                "average_attention": attention_sum / count,
+                "attention_trend": self._trend(attention_first, attention_last, count),
+                "attention_stability": self._stability(attention_min, attention_max)
+            },
+            "improvement_suggestions": self._generate_suggestions(progress_data)
         }
 
     def _generate_suggestions(self, progress_data: Dict[str, Any]) -> List[str]:
@@ -187,18 +459,11 @@ class TrackingAnalyzer:
     # 유틸리티 메서드들
     def _calculate_reading_speed(self, metrics: Dict[str, Any]) -> float:
         """읽기 속도 계산"""
-        total_time = metrics.get("total_time", 0)
-        if total_time == 0:
-            return 0
-        return metrics.get("fixation_count", 0) / total_time
+        return self.utils.reading_speed(metrics)
 
     def _estimate_comprehension(self, metrics: Dict[str, Any]) -> float:
         """이해도 추정"""
-        attention_score = metrics.get("attention_score", 0)
-        fixation_duration = metrics.get("average_fixation_duration", 0)
-        
-        # 이해도는 집중도와 평균 고정 시간을 고려하여 추정
-        return min(1.0, (attention_score * 0.7 + (fixation_duration / 300) * 0.3))
+        return self.utils.estimate_comprehension(metrics)
 
     def _calculate_efficiency(self, metrics: Dict[str, Any]) -> float:
         """읽기 효율성 계산"""
@@ -208,12 +473,36 @@ class TrackingAnalyzer:
 
     def _calculate_trend(self, values: List[float]) -> float:
         """추세 계산"""
-        if len(values) < 2:
+        if not values:
             return 0
-        return (values[-1] - values[0]) / len(values)
+        return self._trend(values[0], values[-1], len(values))
 
     def _calculate_stability(self, values: List[float]) -> float:
         """안정성 계산"""
         if not values:
             return 0
-        return 1 - (max(values) - min(values)) / max(1, max(values))
\ No newline at end of file
+        return self._stability(min(values), max(values))
+
+    @staticmethod
+    def _trend(first: float, last: float, count: int) -> float:
+        """첫 값/마지막 값/개수로 추세 계산 (스트리밍 집계와 공용)"""
+        if count < 2:
+            return 0
+        return (last - first) / count
+
+    @staticmethod
+    def _stability(minimum: float, maximum: float) -> float:
+        """최솟값/최댓값으로 안정성 계산 (스트리밍 집계와 공용)"""
+        return 1 - (maximum - minimum) / max(1, maximum)
+
+    def _calculate_improvement_rate(self, trend_data: List[Dict[str, Any]]) -> float:
+        """개선율 계산 (이해도 추세)"""
+        return self._calculate_trend([d["comprehension"] for d in trend_data])
+
+    def _analyze_pattern_evolution(self, patterns: List[str]) -> List[Dict[str, Any]]:
+        """패턴이 바뀐 지점 목록"""
+        return [
+            {"index": i, "from": patterns[i - 1], "to": patterns[i]}
+            for i in range(1, len(patterns))
+            if patterns[i] != patterns[i - 1]
+        ]
@@ -0,0 +1,191 @@
+# app/services/tracking/aoi.py
+"""단어 단위 관심 영역(AOI) 매핑
+
+page_info["words"]의 단어 영역으로 균일 격자 공간 색인을 만들고,
+시선 고정점을 한 번에 단어에 배정해 단어별 체류 시간과 회귀를 계산합니다.
+
+    page_info = {
+        "version": "3",  # 선택, 없으면 단어 목록으로 계산
+        "words": [{"text": "옛날", "bbox": [x0, y0, x1, y1]}, ...]  # 0~1 정규화 좌표, 읽는 순서
+    }
+"""
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+import numpy as np
+from app.core.config import settings
+
+# (page_id, 레이아웃 버전)
+IndexKey = Tuple[int, Hashable]
+
+
+class WordGridIndex:
+    """단어 영역 균일 격자 색인 (셀마다 겹치는 단어 번호를 CSR 형태로 저장)"""
+
+    def __init__(self, boxes: np.ndarray, texts: List[str], grid_size: int = 32, padding: float = 0.0):
+        self.grid_size = grid_size
+        self.texts = texts
+        self.boxes = boxes.astype(np.float64).reshape(-1, 4)
+        self.boxes[:, :2] -= padding
+        self.boxes[:, 2:] += padding
+        self.centers = np.column_stack([
+            (self.boxes[:, 0] + self.boxes[:, 2]) / 2,
+            (self.boxes[:, 1] + self.boxes[:, 3]) / 2
+        ])
+
+        # 단어마다 겹치는 셀 범위를 펼쳐 (셀, 단어) 쌍 생성
+        lo = self._cells(self.boxes[:, :2])
+        hi = self._cells(self.boxes[:, 2:])
+        nx = hi[:, 0] - lo[:, 0] + 1
+        ny = hi[:, 1] - lo[:, 1] + 1
+        spans = nx * ny
+        words = np.repeat(np.arange(len(texts)), spans)
+        local = np.arange(spans.sum()) - np.repeat(np.cumsum(spans) - spans, spans)
+        cell_x = np.repeat(lo[:, 0], spans) + local % np.repeat(nx, spans)
+        cell_y = np.repeat(lo[:, 1], spans) + local // np.repeat(nx, spans)
+        cells = cell_y * grid_size + cell_x
+
+        order = np.argsort(cells, kind="stable")
+        self.cell_words = words[order]
+        self.cell_starts = np.searchsorted(cells[order], np.arange(grid_size * grid_size + 1))
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    @classmethod
+    def from_page_info(cls, page_info: Dict[str, Any], grid_size: int = 32, padding: float = 0.0) -> "WordGridIndex":
+        words = page_info.get("words") or []
+        boxes = np.array([word["bbox"] for word in words], dtype=np.float64).reshape(-1, 4)
+        return cls(boxes, [word.get("text", "") for word in words], grid_size, padding)
+
+    def _cells(self, points: np.ndarray) -> np.ndarray:
+        return np.clip(np.floor(points * self.grid_size), 0, self.grid_size - 1).astype(np.intp)
+
+    def assign(self, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        """각 좌표가 속한 단어 번호 (없으면 -1, 여러 개면 중심이 가장 가까운 단어)"""
+        n = x.size
+        assigned = np.full(n, -1, dtype=np.intp)
+        if n == 0 or len(self) == 0:
+            return assigned
+
+        cells = self._cells(np.column_stack([x, y]))
+        cells = cells[:, 1] * self.grid_size + cells[:, 0]
+        starts = self.cell_starts[cells]
+        counts = self.cell_starts[cells + 1] - starts
+
+        # 좌표별 후보 단어를 펼쳐서 한 번에 포함 여부 검사
+        points = np.repeat(np.arange(n), counts)
+        local = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        candidates = self.cell_words[np.repeat(starts, counts) + local]
+        px, py = x[points], y[points]
+        boxes = self.boxes[candidates]
+        inside = (
+            (px >= boxes[:, 0]) & (px <= boxes[:, 2]) &
+            (py >= boxes[:, 1]) & (py <= boxes[:, 3])
+        )
+        points, candidates = points[inside], candidates[inside]
+        if points.size == 0:
+            return assigned
+
+        distance = np.hypot(px[inside] - self.centers[candidates, 0], py[inside] - self.centers[candidates, 1])
+        order = np.lexsort((distance, points))
+        first = np.unique(points[order], return_index=True)[1]
+        assigned[points[order][first]] = candidates[order][first]
+        return assigned
+
+    def word_metrics(self, x: np.ndarray, y: np.ndarray, duration: np.ndarray) -> Dict[str, Any]:
+        """고정점 배열로 단어별 체류 시간/고정 횟수/첫 고정 시간/회귀/방문 횟수 계산"""
+        n_words = len(self)
+        assigned = self.assign(x, y)
+        hit = assigned >= 0
+        sequence = assigned[hit]
+        durations = duration[hit]
+
+        dwell = np.bincount(sequence, weights=durations, minlength=n_words)
+        fixation_count = np.bincount(sequence, minlength=n_words)
+
+        first_duration = np.zeros(n_words)
+        words, first = np.unique(sequence, return_index=True)
+        first_duration[words] = durations[first]
+
+        # 읽는 순서상 앞 단어로 돌아온 고정 = 회귀 (도착 단어 기준)
+        regressions = np.bincount(sequence[1:][sequence[1:] < sequence[:-1]], minlength=n_words)
+        # 다른 단어에서 넘어온 횟수 = 방문 횟수
+        entries = np.ones(sequence.size, dtype=bool)
+        entries[1:] = sequence[1:] != sequence[:-1]
+        passes = np.bincount(sequence[entries], minlength=n_words)
+
+        return {
+            "word_count": n_words,
+            "fixated_words": int(np.count_nonzero(fixation_count)),
+            "unassigned_fixations": int(np.count_nonzero(~hit)),
+            "regression_count": int(regressions.sum()),
+            "words": [
+                {
+                    "index": i,
+                    "text": self.texts[i],
+                    "dwell_time": float(dwell[i]),
+                    "fixation_count": int(fixation_count[i]),
+                    "first_fixation_duration": float(first_duration[i]),
+                    "regressions": int(regressions[i]),
+                    "passes": int(passes[i])
+                }
+                for i in range(n_words)
+            ]
+        }
+
+
+class WordIndexCache:
+    """페이지 레이아웃 버전별 단어 색인 LRU 캐시"""
+
+    def __init__(self, max_entries: int, grid_size: int, padding: float):
+        self.max_entries = max_entries
+        self.grid_size = grid_size
+        self.padding = padding
+        self._entries: "OrderedDict[IndexKey, WordGridIndex]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def layout_version(page_info: Dict[str, Any]) -> Hashable:
+        """page_info의 version 값 (없으면 단어 목록 해시)"""
+        version = page_info.get("version")
+        if version is not None:
+            return version
+        words = json.dumps(page_info.get("words") or [], sort_keys=True, ensure_ascii=False)
+        return hashlib.sha1(words.encode("utf-8")).hexdigest()
+
+    def get(self, page_id: int, page_info: Dict[str, Any]) -> Optional[WordGridIndex]:
+        """페이지 단어 색인 (단어 정보가 없으면 None)"""
+        if not page_info.get("words"):
+            return None
+        key = (page_id, self.layout_version(page_info))
+        with self._lock:
+            index = self._entries.get(key)
+            if index is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return index
+            self.misses += 1
+
+        index = WordGridIndex.from_page_info(page_info, self.grid_size, self.padding)
+        with self._lock:
+            self._entries[key] = index
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return index
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+word_index_cache = WordIndexCache(
+    max_entries=settings.TRACKING_AOI_CACHE_SIZE,
+    grid_size=settings.TRACKING_AOI_GRID_SIZE,
+    padding=settings.TRACKING_AOI_PADDING
+)
@@ -0,0 +1,221 @@
+# app/services/tracking/buffer.py
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+import numpy as np
+from app.core.config import settings
+from app.services.tracking.live import LiveMetricsWindow
+from app.utils.tracking import IncrementalFixationDetector
+
+# (user_id, story_id, page_id, session_id)
+BufferKey = Tuple[int, int, int, str]
+
+DEFAULT_SESSION = "default"
+
+class GazeRingBuffer:
+    """미리 할당된 배열 기반 시선 포인트 링 버퍼 (x, y, timestamp, confidence)
+
+    세션의 고정점 검출 상태(detector)도 함께 보관하여 처리 청크 간에 이어집니다.
+    """
+
+    COLUMNS = 4
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.data = np.empty((capacity, self.COLUMNS), dtype=np.float64)
+        self.head = 0  # 가장 오래된 포인트 위치
+        self.size = 0
+        self.total_points = 0
+        self.dropped_points = 0
+        self.last_access = time.monotonic()
+        self.detector = IncrementalFixationDetector()
+        self.quality_counts: Dict[str, int] = {}  # 세션 누적 품질 필터 개수
+        self.quality_context: Optional[np.ndarray] = None  # 이전 요청의 마지막 유효 샘플 (품질 필터 기준)
+        self.live = LiveMetricsWindow(settings.TRACKING_LIVE_WINDOW_MS)  # 실시간 지표 (관찰자 공유)
+
+    def __len__(self) -> int:
+        return self.size
+
+    @property
+    def nbytes(self) -> int:
+        return self.data.nbytes
+
+    def append(self, x: float, y: float, timestamp: float, confidence: Optional[float] = None) -> None:
+        """포인트 추가 (가득 차면 가장 오래된 포인트를 덮어씀)"""
+        tail = (self.head + self.size) % self.capacity
+        self.data[tail] = (x, y, timestamp, math.nan if confidence is None else confidence)
+        if self.size == self.capacity:
+            self.head = (self.head + 1) % self.capacity
+            self.dropped_points += 1
+        else:
+            self.size += 1
+        self.total_points += 1
+        self.last_access = time.monotonic()
+
+    def extend(self, rows: np.ndarray) -> None:
+        """여러 포인트를 한 번에 추가 (rows: (n, 4) 배열)"""
+        count = rows.shape[0]
+        if count == 0:
+            return
+        if count > self.capacity:
+            # 버퍼보다 많으면 최신 포인트만 유지
+            self.dropped_points += count - self.capacity
+            self.total_points += count - self.capacity
+            rows = rows[-self.capacity:]
+            count = self.capacity
+
+        overflow = max(0, self.size + count - self.capacity)
+        tail = (self.head + self.size) % self.capacity
+        first = min(count, self.capacity - tail)
+        self.data[tail:tail + first] = rows[:first]
+        self.data[:count - first] = rows[first:]
+
+        self.head = (self.head + overflow) % self.capacity
+        self.size = min(self.capacity, self.size + count)
+        self.dropped_points += overflow
+        self.total_points += count
+        self.last_access = time.monotonic()
+
+    def peek(self, count: Optional[int] = None) -> np.ndarray:
+        """가장 오래된 포인트부터 count개를 꺼내지 않고 복사 (처리 성공 후 drain)"""
+        count = self.size if count is None else min(count, self.size)
+        indices = (self.head + np.arange(count)) % self.capacity
+        return self.data[indices]
+
+    def checkpoint(self) -> Dict[str, Any]:
+        """요청 처리 전 상태 스냅샷 (처리하지 않은 포인트, 카운터, 검출/품질 상태)
+
+        요청 처리 중 실패하면 restore로 되돌려 요청의 포인트가 하나도 반영되지 않게 합니다.
+        """
+        return {
+            "pending": self.peek(),
+            "total_points": self.total_points,
+            "dropped_points": self.dropped_points,
+            "detector": self.detector.checkpoint(),
+            "quality_counts": self.quality_counts,
+            "quality_context": self.quality_context
+        }
+
+    def restore(self, state: Dict[str, Any]) -> None:
+        """checkpoint 시점의 상태로 복원"""
+        pending = state["pending"]
+        self.head = 0
+        self.size = pending.shape[0]
+        self.data[:self.size] = pending
+        self.total_points = state["total_points"]
+        self.dropped_points = state["dropped_points"]
+        self.detector.restore(state["detector"])
+        self.quality_counts = state["quality_counts"]
+        self.quality_context = state["quality_context"]
+
+    def time_range(self) -> Optional[Tuple[float, float]]:
+        """기록된 포인트의 시간 범위 (실시간 처리된 포인트 포함, 기록이 없으면 None)"""
+        detector = self.detector
+        if detector.points_seen:
+            first, last = detector.first_timestamp, detector.last_timestamp
+        elif self.size:
+            first = last = float(self.data[self.head, 2])
+        else:
+            return None
+        if self.size:
+            last = max(last, float(self.data[(self.head + self.size - 1) % self.capacity, 2]))
+        return first, last
+
+    def drain(self, count: Optional[int] = None) -> np.ndarray:
+        """가장 오래된 포인트부터 count개를 꺼냄 (연속 배열 복사본)"""
+        chunk = self.peek(count)
+        count = chunk.shape[0]
+        self.head = (self.head + count) % self.capacity
+        self.size -= count
+        self.last_access = time.monotonic()
+        return chunk
+
+class GazeBufferStore:
+    """프로세스 단위 세션별 시선 버퍼 저장소 (유휴 시간 만료 및 메모리 상한 적용)"""
+
+    def __init__(self, capacity: int, idle_timeout: float, max_bytes: int):
+        self.capacity = capacity
+        self.idle_timeout = idle_timeout
+        self.max_bytes = max_bytes
+        self._buffers: "OrderedDict[BufferKey, GazeRingBuffer]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._evicted = 0
+
+    def get(self, key: BufferKey) -> GazeRingBuffer:
+        """세션 버퍼 조회 (없으면 생성)"""
+        with self._lock:
+            self._evict_idle(time.monotonic())
+            buffer = self._buffers.get(key)
+            if buffer is None:
+                buffer = GazeRingBuffer(self.capacity)
+                self._buffers[key] = buffer
+                self._evict_over_limit()
+            else:
+                self._buffers.move_to_end(key)
+            buffer.last_access = time.monotonic()
+            return buffer
+
+    def peek(self, key: BufferKey) -> Optional[GazeRingBuffer]:
+        """기존 세션 버퍼 조회 (없으면 생성하지 않고 None, 있으면 사용 시각 갱신)"""
+        with self._lock:
+            self._evict_idle(time.monotonic())
+            buffer = self._buffers.get(key)
+            if buffer is not None:
+                self._buffers.move_to_end(key)
+                buffer.last_access = time.monotonic()
+            return buffer
+
+    def pop(self, key: BufferKey) -> Optional[GazeRingBuffer]:
+        """세션 버퍼 제거"""
+        with self._lock:
+            buffer = self._buffers.pop(key, None)
+        if buffer is not None:
+            buffer.live.close()
+        return buffer
+
+    def evict_idle(self) -> int:
+        """유휴 버퍼 정리"""
+        with self._lock:
+            return self._evict_idle(time.monotonic())
+
+    def stats(self) -> Dict[str, Any]:
+        """버퍼 저장소 상태"""
+        with self._lock:
+            return {
+                "sessions": len(self._buffers),
+                "bytes": self._total_bytes(),
+                "max_bytes": self.max_bytes,
+                "evicted": self._evicted
+            }
+
+    def _total_bytes(self) -> int:
+        # 모든 버퍼가 같은 크기로 미리 할당되므로 개수로 계산
+        return len(self._buffers) * self.capacity * GazeRingBuffer.COLUMNS * 8
+
+    def _evict_idle(self, now: float) -> int:
+        # 접근 순서로 정렬되어 있으므로 앞에서부터 만료 여부 확인
+        evicted = 0
+        while self._buffers:
+            key, buffer = next(iter(self._buffers.items()))
+            if now - buffer.last_access < self.idle_timeout:
+                break
+            del self._buffers[key]
+            buffer.live.close()
+            evicted += 1
+        self._evicted += evicted
+        return evicted
+
+    def _evict_over_limit(self) -> None:
+        # 메모리 상한 초과 시 가장 오래 사용되지 않은 버퍼부터 제거
+        while len(self._buffers) > 1 and self._total_bytes() > self.max_bytes:
+            _, buffer = self._buffers.popitem(last=False)
+            buffer.live.close()
+            self._evicted += 1
+
+gaze_buffer_store = GazeBufferStore(
+    capacity=settings.TRACKING_BUFFER_CAPACITY,
+    idle_timeout=settings.TRACKING_BUFFER_IDLE_TIMEOUT,
+    max_bytes=settings.TRACKING_BUFFER_MAX_BYTES
+)
@@ -1,18 +1,51 @@
 # app/services/tracking/collector.py 생성
+import asyncio
+import logging
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
+import numpy as np
 from sqlalchemy.orm import Session
 from app.models.tracking import EyeTrackingData
 from app.schemas.tracking import TrackingData, GazePoint
+from app.services.tracking.buffer import GazeRingBuffer
+from app.services.tracking.compute import summarize_session, tracking_compute_pool
+from app.services.tracking.heatmap import PageHeatmapService
+from app.services.tracking.rollup import ReadingRollupService
+from app.services.analytics_cache import analytics_cache
+from app.services.tracking.writer import tracking_write_queue
+from app.utils.gaze_quality import GazeQualityFilter
+from app.utils.gaze_sampling import GazeSampler
 from app.utils.tracking import TrackingUtils
+from app.utils.tracking_codec import TrackingCodec
+from app.core.config import settings
 from app.core.exceptions import DrawryException
 
+logger = logging.getLogger(__name__)
+
 class TrackingCollector:
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, point_buffer: Optional[GazeRingBuffer] = None):
         self.db = db
         self.utils = TrackingUtils()
-        self.buffer_size = 50  # 버퍼 크기 (50개의 포인트마다 처리)
-        self.point_buffer: List[GazePoint] = []
+        self.rollups = ReadingRollupService(db)
+        self.page_heatmaps = PageHeatmapService(db)
+        self.buffer_size = settings.TRACKING_BUFFER_SIZE  # 버퍼 크기 (기본 50개의 포인트마다 처리)
+        # 고정점 검출 전 품질 정제 단계 (신뢰도/화면 밖/튐 제외, 짧은 구간 보간)
+        self.quality = GazeQualityFilter(
+            min_confidence=settings.TRACKING_MIN_CONFIDENCE,
+            max_gap_ms=settings.TRACKING_MAX_GAP_MS,
+            max_velocity=settings.TRACKING_MAX_GAZE_VELOCITY,
+            min_valid_ratio=settings.TRACKING_MIN_VALID_RATIO
+        )
+        # 저장/분석 전 포인트 축소 단계 (적용 범위는 TRACKING_SAMPLING_METHOD 설정 참고)
+        self.sampler = GazeSampler(
+            method=settings.TRACKING_SAMPLING_METHOD,
+            target_hz=settings.TRACKING_SAMPLING_TARGET_HZ,
+            max_points=settings.TRACKING_SAMPLING_MAX_POINTS
+        )
+        # 요청 간 유지되는 세션 버퍼가 주어지지 않으면 임시 버퍼 사용
+        if point_buffer is None:
+            point_buffer = GazeRingBuffer(max(self.buffer_size, settings.TRACKING_BUFFER_CAPACITY))
+        self.point_buffer = point_buffer
 
     async def process_gaze_data(
         self,
@@ -23,17 +56,14 @@ class TrackingCollector:
     ) -> Optional[Dict[str, Any]]:
         """실시간 시선 데이터 처리"""
         try:
-            # 버퍼에 데이터 추가
-            self.point_buffer.append(gaze_point)
-            
-            # 버퍼가 가득 차면 처리
-            if len(self.point_buffer) >= self.buffer_size:
-                metrics = self._process_buffer(user_id, story_id, page_id)
-                self.point_buffer = []  # 버퍼 초기화
-                return metrics
-                
-            return None
+            # 품질 기준을 통과한 포인트만 버퍼에 추가하고, 버퍼가 가득 차면 처리
+            results = self._ingest(
+                user_id, story_id, page_id, self.utils.to_rows([gaze_point]), sample=False
+            )[0]
+            return results[-1] if results else None
             
+        except DrawryException:
+            raise
         except Exception as e:
             raise DrawryException(
                 code="GAZE_PROCESSING_ERROR",
@@ -42,31 +72,135 @@ class TrackingCollector:
                 details={"error": str(e)}
             )
 
-    def _process_buffer(
+    async def process_gaze_batch(
         self,
         user_id: int,
         story_id: int,
-        page_id: int
+        page_id: int,
+        gaze_points: List[GazePoint]
+    ) -> Dict[str, Any]:
+        """여러 시선 포인트를 한 번에 처리"""
+        return await self.process_gaze_rows(
+            user_id, story_id, page_id, self.utils.to_rows(gaze_points)
+        )
+
+    async def process_gaze_rows(
+        self,
+        user_id: int,
+        story_id: int,
+        page_id: int,
+        rows: np.ndarray
     ) -> Dict[str, Any]:
-        """버퍼된 데이터 처리"""
-        # 시선 고정점 계산
-        fixations = self.utils.calculate_fixations(self.point_buffer)
+        """(n, 4) 배열 형태의 시선 포인트를 한 번에 처리"""
+        try:
+            accepted = int(rows.shape[0])
+            results, quality, sampling = self._ingest(user_id, story_id, page_id, rows)
+
+            return {
+                "accepted": accepted,
+                "processed_chunks": len(results),
+                "buffered": len(self.point_buffer),
+                "metrics": [result["metrics"] for result in results],
+                "quality": quality,
+                "sampling": sampling
+            }
+
+        except DrawryException:
+            raise
+        except Exception as e:
+            raise DrawryException(
+                code="GAZE_PROCESSING_ERROR",
+                message="Failed to process gaze batch",
+                status_code=500,
+                details={"error": str(e)}
+            )
+
+    def _ingest(
+        self,
+        user_id: int,
+        story_id: int,
+        page_id: int,
+        rows: np.ndarray,
+        sample: bool = True
+    ) -> Tuple[List[Dict[str, Any]], Dict[str, Any], Optional[Dict[str, Any]]]:
+        """포인트를 정제해 버퍼에 추가하고 가득 찬 청크를 처리/저장 (처리 결과, 품질, 샘플링 보고 반환)
+
+        요청 단위로 반영됩니다. 청크 저장까지 모두 성공해야 반영되고, 실패하면 (저장 큐가 가득 찬 503 포함)
+        버퍼/검출/품질 상태를 요청 전으로 되돌리므로 클라이언트는 같은 포인트를 그대로 다시 보내면 됩니다.
+        """
+        checkpoint = self.point_buffer.checkpoint()
+        try:
+            rows, quality = self._filter_quality(rows)
+            sampling = None
+            if sample:
+                rows, sampling = self.sampler.apply(rows)
+            chunks = []
+            offset = 0
+
+            # 버퍼가 넘치지 않도록 남은 공간만큼씩 나눠서 추가
+            while offset < rows.shape[0]:
+                space = self.point_buffer.capacity - len(self.point_buffer)
+                self.point_buffer.extend(rows[offset:offset + space])
+                offset += space
+
+                # 버퍼가 가득 찼으면 처리 단위보다 적어도 처리해서 공간 확보
+                while len(self.point_buffer) >= min(self.buffer_size, self.point_buffer.capacity):
+                    chunks.append(self._process_chunk(user_id, story_id, page_id))
+
+            self._save_tracking_rows([row for _, row, _, _ in chunks])
+        except Exception:
+            self.point_buffer.restore(checkpoint)
+            raise
+
+        # 실시간 지표 창 갱신 (SSE 관찰자에게 전달, 저장에 성공한 청크만)
+        first_timestamp = self.point_buffer.detector.first_timestamp
+        for _, _, columns, last_timestamp in chunks:
+            self.point_buffer.live.update(columns, first_timestamp, last_timestamp)
+        return [tracking_data for tracking_data, _, _, _ in chunks], quality, sampling
+
+    def _filter_quality(self, rows: np.ndarray) -> Tuple[np.ndarray, Dict[str, Any]]:
+        """품질 정제 후 세션 누적 개수에 반영 (이전 요청의 마지막 유효 샘플을 기준으로 이어서 검사)"""
+        rows, quality = self.quality.apply(rows, self.point_buffer.quality_context)
+        if rows.shape[0]:
+            self.point_buffer.quality_context = rows[-1].copy()
+        self.point_buffer.quality_counts = GazeQualityFilter.merge_counts(
+            self.point_buffer.quality_counts, quality
+        )
+        return rows, quality
+
+    def _process_chunk(
+        self,
+        user_id: int,
+        story_id: int,
+        page_id: int
+    ) -> Tuple[Dict[str, Any], Dict[str, Any], Dict[str, np.ndarray], float]:
+        """버퍼에서 처리 단위만큼 꺼내 고정점/지표/히트맵 계산
+
+        처리 결과, 저장할 행, 이번에 종료된 고정점 열, 마지막 시각을 반환합니다 (저장은 _ingest에서 요청 단위로 수행).
+        """
+        chunk = self.point_buffer.drain(self.buffer_size)
+        x, y, t = chunk[:, 0], chunk[:, 1], chunk[:, 2]
+        
+        # 시선 고정점 계산 (이전 청크에서 이어지는 고정점 포함, 종료된 고정점만)
+        columns = self.point_buffer.detector.update(x, y, t)
+        fixations = self.utils.fixations_to_list(columns)
         
         # 읽기 패턴 감지
         pattern = self.utils.detect_reading_pattern(fixations)
         
         # 시간 계산
-        start_time = self.point_buffer[0].timestamp
-        end_time = self.point_buffer[-1].timestamp
-        total_time = end_time - start_time
+        total_time = float(t[-1] - t[0])
         
         # 메트릭스 계산
         metrics = self.utils.calculate_reading_metrics(fixations, total_time)
         
         # 히트맵 생성
-        heatmap = self.utils.generate_heatmap(fixations)
+        heatmap = self.utils.generate_heatmap(
+            fixations,
+            resolution=settings.TRACKING_HEATMAP_RESOLUTION,
+            sigma=settings.TRACKING_HEATMAP_SIGMA
+        )
         
-        # 결과 저장
         tracking_data = {
             "user_id": user_id,
             "story_id": story_id,
@@ -77,29 +211,31 @@ class TrackingCollector:
             "heatmap": heatmap,
             "timestamp": datetime.utcnow()
         }
-        
-        self._save_tracking_data(tracking_data)
-        
-        return tracking_data
+        row = self.build_row(
+            user_id=user_id,
+            story_id=story_id,
+            page_id=page_id,
+            tracking_data={
+                "fixations": fixations,
+                "pattern": pattern,
+                "metrics": metrics,
+                "heatmap": heatmap
+            }
+        )
+        return tracking_data, row, columns, float(t[-1])
+
+    def _save_tracking_rows(self, rows: List[Dict[str, Any]]) -> None:
+        """요청에서 처리된 청크 행들을 한 번에 저장"""
+        if not rows:
+            return
+
+        if settings.TRACKING_WRITE_BEHIND:
+            # 저장 완료를 기다리지 않음 (실패는 작업 스레드에서 기록)
+            tracking_write_queue.submit_many(rows)
+            return
 
-    def _save_tracking_data(self, data: Dict[str, Any]) -> None:
-        """트래킹 데이터 저장"""
         try:
-            tracking_record = EyeTrackingData(
-                user_id=data["user_id"],
-                story_id=data["story_id"],
-                page_id=data["page_id"],
-                tracking_data={
-                    "fixations": data["fixations"],
-                    "pattern": data["pattern"],
-                    "metrics": data["metrics"],
-                    "heatmap": data["heatmap"]
-                }
-            )
-            
-            self.db.add(tracking_record)
-            self.db.commit()
-            
+            self.insert_rows(rows)
         except Exception as e:
             self.db.rollback()
             raise DrawryException(
@@ -109,55 +245,138 @@ class TrackingCollector:
                 details={"error": str(e)}
             )
 
+    def insert_row(self, row: Dict[str, Any]) -> None:
+        """요청 세션에서 바로 저장 (지연 저장을 사용하지 않는 경우)"""
+        self.insert_rows([row])
+
+    def insert_rows(self, rows: List[Dict[str, Any]]) -> None:
+        """여러 행을 요청 세션에서 한 트랜잭션으로 저장"""
+        self.db.add_all([EyeTrackingData(**row) for row in rows])
+        self.rollups.record_rows(rows)
+        self.page_heatmaps.record_rows(rows)
+        self.db.commit()
+        for scope in {(row["user_id"], row["story_id"]) for row in rows}:
+            analytics_cache.invalidate(*scope)
+
+    def build_row(
+        self,
+        user_id: int,
+        story_id: int,
+        page_id: int,
+        tracking_data: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """저장 형식 설정에 따라 트래킹 행 생성"""
+        completed_at = tracking_data.get("completed_at")
+        row = {
+            "user_id": user_id,
+            "story_id": story_id,
+            "page_id": page_id,
+            # 조회에 쓰이는 필드는 인덱스 컬럼으로도 저장
+            "session_id": tracking_data.get("session_id"),
+            "pattern": tracking_data.get("pattern"),
+            "completed_at": completed_at,
+            "created_at": datetime.utcnow(),
+            "tracking_blob": None
+        }
+
+        if completed_at is not None:
+            tracking_data = {**tracking_data, "completed_at": completed_at.isoformat()}
+
+        if settings.TRACKING_BINARY_STORAGE:
+            row["tracking_data"] = TrackingCodec.pack(tracking_data)
+            row["tracking_blob"] = TrackingCodec.encode(
+                tracking_data["fixations"],
+                tracking_data["heatmap"],
+                tracking_data.get("heatmap_pyramid")
+            )
+        else:
+            pyramid = tracking_data.get("heatmap_pyramid")
+            if pyramid is not None:
+                # JSON 저장 시 해상도 키는 문자열, 단계 히트맵은 리스트로 변환
+                tracking_data = {
+                    **tracking_data,
+                    "heatmap_pyramid": {
+                        str(level): np.asarray(level_map).tolist() for level, level_map in pyramid.items()
+                    }
+                }
+            row["tracking_data"] = tracking_data
+        return row
+
     async def save_session_data(
         self,
+        user_id: int,
         tracking_data: TrackingData
     ) -> Dict[str, Any]:
         """세션 완료 시 최종 데이터 저장"""
         try:
-            # 전체 시선 고정점 계산
-            fixations = self.utils.calculate_fixations(tracking_data.gaze_points)
-            
-            # 전체 패턴 분석
-            pattern = self.utils.detect_reading_pattern(fixations)
-            
-            # 전체 시간 계산
-            total_time = (
-                tracking_data.gaze_points[-1].timestamp - 
-                tracking_data.gaze_points[0].timestamp
+            detector = self.point_buffer.detector
+            streamed = detector.points_seen > 0
+            if streamed and self.point_buffer.dropped_points and tracking_data.gaze_points:
+                # 링 버퍼가 넘쳐 실시간 처리에서 빠진 포인트가 있으면 전송된 전체 포인트로 다시 계산
+                logger.warning(
+                    f"Session {tracking_data.session_id} dropped {self.point_buffer.dropped_points} "
+                    f"buffered points, recomputing from {len(tracking_data.gaze_points)} gaze points"
+                )
+                streamed = False
+
+            if streamed:
+                # 실시간 처리 중 계산된 고정점 재사용 (버퍼에 남은 포인트만 이어서 처리)
+                rest = self.point_buffer.drain()
+                detector.update(rest[:, 0], rest[:, 1], rest[:, 2])
+                rows, fixations, total_time = None, detector.fixations(), detector.total_time
+                quality = self.quality.summarize(self.point_buffer.quality_counts)
+            else:
+                rows, fixations, total_time = self.utils.to_rows(tracking_data.gaze_points), None, 0.0
+                quality = None
+
+            # 고정점/패턴/지표/히트맵 계산은 이벤트 루프 밖의 작업 풀에서 실행
+            summary = await tracking_compute_pool.run(
+                summarize_session,
+                rows,
+                fixations,
+                total_time,
+                tracking_data.page_id,
+                tracking_data.page_info,
+                self.quality,
+                self.sampler
             )
             
-            # 전체 메트릭스 계산
-            metrics = self.utils.calculate_reading_metrics(fixations, total_time)
-            
-            # 전체 히트맵 생성
-            heatmap = self.utils.generate_heatmap(fixations)
-            
             # 최종 데이터 저장
             session_data = {
                 "session_id": tracking_data.session_id,
                 "story_id": tracking_data.story_id,
                 "page_id": tracking_data.page_id,
-                "fixations": fixations,
-                "pattern": pattern,
-                "metrics": metrics,
-                "heatmap": heatmap,
+                "fixations": self.utils.fixations_to_list(summary["fixations"]),
+                "pattern": summary["pattern"],
+                "metrics": summary["metrics"],
+                "heatmap": summary["heatmap"].tolist(),
+                # 저장 형식으로는 build_row에서 변환 (응답에는 포함하지 않음)
+                "heatmap_pyramid": summary["heatmap_pyramid"],
                 "page_info": tracking_data.page_info,
+                "quality": quality or summary["quality"],
                 "completed_at": datetime.utcnow()
             }
+            for key in ("sampling", "word_metrics"):
+                if summary[key] is not None:
+                    session_data[key] = summary[key]
             
-            tracking_record = EyeTrackingData(
-                user_id=tracking_data.user_id,
+            row = self.build_row(
+                user_id=user_id,
                 story_id=tracking_data.story_id,
                 page_id=tracking_data.page_id,
                 tracking_data=session_data
             )
             
-            self.db.add(tracking_record)
-            self.db.commit()
+            if settings.TRACKING_WRITE_BEHIND:
+                # 다른 기록과 함께 일괄 저장되며, 완료 후 응답
+                await asyncio.wrap_future(tracking_write_queue.submit(row))
+            else:
+                self.insert_row(row)
             
             return session_data
             
+        except DrawryException:
+            raise
         except Exception as e:
             self.db.rollback()
             raise DrawryException(
@@ -165,4 +384,4 @@ class TrackingCollector:
                 message="Failed to save session data",
                 status_code=500,
                 details={"error": str(e)}
-            )
\ No newline at end of file
+            )
@@ -0,0 +1,187 @@
+# app/services/tracking/compute.py
+import asyncio
+import logging
+import multiprocessing
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+import numpy as np
+from app.core.config import settings
+from app.core.exceptions import DrawryException
+from app.services.tracking.aoi import word_index_cache
+from app.utils.gaze_quality import GazeQualityFilter
+from app.utils.gaze_sampling import GazeSampler
+from app.utils.tracking import TrackingUtils
+
+logger = logging.getLogger(__name__)
+
+
+def summarize_session(
+    rows: Optional[np.ndarray],
+    fixations: Optional[Dict[str, np.ndarray]],
+    total_time: float,
+    page_id: int,
+    page_info: Dict[str, Any],
+    quality: GazeQualityFilter,
+    sampler: GazeSampler
+) -> Dict[str, Any]:
+    """세션 전체 고정점/패턴/지표/히트맵/단어 지표 계산 (작업 프로세스에서 실행)
+
+    실시간 처리된 고정점(열 단위)이 있으면 그대로 쓰고, 없으면 (n, 4) 시선 배열을 정제/축소한 뒤 검출합니다.
+    고정점은 열 단위, 히트맵은 배열, 히트맵 피라미드는 해상도 -> 배열로 반환합니다.
+    """
+    utils = TrackingUtils()
+    report = sampling = None
+    if fixations is None:
+        # 품질 정제 및 축소 후 전체 시선 고정점 계산
+        rows, report = quality.apply(rows)
+        rows, sampling = sampler.apply(rows)
+        fixations = utils.detect_fixations(rows[:, 0], rows[:, 1], rows[:, 2])
+        total_time = float(rows[-1, 2] - rows[0, 2]) if rows.shape[0] else 0.0
+
+    fixation_list = utils.fixations_to_list(fixations)
+    pattern = utils.detect_reading_pattern(fixation_list)
+    metrics = utils.calculate_reading_metrics(fixation_list, total_time)
+    heatmap = utils.heatmap_array(
+        fixations["x"],
+        fixations["y"],
+        fixations["duration"],
+        resolution=settings.TRACKING_HEATMAP_RESOLUTION,
+        sigma=settings.TRACKING_HEATMAP_SIGMA
+    )
+    heatmap_pyramid = utils.heatmap_pyramid(fixations["x"], fixations["y"], fixations["duration"])
+
+    return {
+        "fixations": fixations,
+        "pattern": pattern,
+        "metrics": metrics,
+        "heatmap": heatmap,
+        "heatmap_pyramid": heatmap_pyramid,
+        "quality": report,
+        "sampling": sampling,
+        "word_metrics": word_metrics(page_id, page_info, fixations)
+    }
+
+
+def word_metrics(
+    page_id: int,
+    page_info: Dict[str, Any],
+    fixations: Dict[str, np.ndarray]
+) -> Optional[Dict[str, Any]]:
+    """페이지 단어 영역에 고정점을 배정한 단어별 지표 (단어 정보가 없으면 None)"""
+    try:
+        word_index = word_index_cache.get(page_id, page_info)
+    except (KeyError, TypeError, ValueError) as e:
+        logger.warning(f"Invalid word layout for page {page_id}: {str(e)}")
+        return None
+    if word_index is None:
+        return None
+    return word_index.word_metrics(
+        np.asarray(fixations["x"], dtype=np.float64),
+        np.asarray(fixations["y"], dtype=np.float64),
+        np.asarray(fixations["duration"], dtype=np.float64)
+    )
+
+
+def _timed(fn: Callable[..., Any], args: Tuple[Any, ...]) -> Tuple[float, float, Any]:
+    """작업 시작/종료 시각과 결과 반환 (프로세스 간 비교를 위해 wall clock 사용)"""
+    started = time.time()
+    result = fn(*args)
+    return started, time.time(), result
+
+
+class TrackingComputePool:
+    """CPU 사용량이 큰 세션 분석을 이벤트 루프 밖에서 실행하는 작업 풀
+
+    workers가 0이면 스레드 하나에서, 그 외에는 ProcessPoolExecutor에서 실행합니다.
+    작업 프로세스는 spawn으로 시작하므로 쓰기 큐 스레드 등이 잡고 있던 잠금을 물려받지 않습니다.
+    실행 대기 중인 작업이 max_pending개를 넘으면 503 오류로 부하를 되돌립니다.
+    """
+
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.queue_time_total = 0.0
+        self.queue_time_max = 0.0
+        self.run_time_total = 0.0
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """fn(*args)를 작업 풀에서 실행하고 결과 반환 (fn과 인자는 pickle 가능해야 함)"""
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self.rejected += 1
+                raise DrawryException(
+                    code="TRACKING_COMPUTE_BUSY",
+                    message="Too many tracking analyses in progress, retry later",
+                    status_code=503,
+                    details={"pending": self._pending}
+                )
+            self._pending += 1
+            executor = self._ensure_executor()
+
+        submitted = time.time()
+        try:
+            started, finished, result = await asyncio.get_running_loop().run_in_executor(
+                executor, _timed, fn, args
+            )
+        except Exception:
+            with self._lock:
+                self.failed += 1
+            raise
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+        queue_time = max(started - submitted, 0.0)
+        with self._lock:
+            self.completed += 1
+            self.queue_time_total += queue_time
+            self.queue_time_max = max(self.queue_time_max, queue_time)
+            self.run_time_total += finished - started
+        logger.debug(f"{fn.__name__} waited {queue_time:.3f}s, ran {finished - started:.3f}s")
+        return result
+
+    def close(self) -> None:
+        """실행 중인 작업을 마치고 작업 풀 종료"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    def stats(self) -> Dict[str, Any]:
+        """작업 풀 상태 (대기/실행 시간은 초)"""
+        with self._lock:
+            completed = self.completed
+            return {
+                "workers": self.workers,
+                "pending": self._pending,
+                "completed": completed,
+                "failed": self.failed,
+                "rejected": self.rejected,
+                "average_queue_time": self.queue_time_total / completed if completed else 0.0,
+                "max_queue_time": self.queue_time_max,
+                "average_run_time": self.run_time_total / completed if completed else 0.0
+            }
+
+    def _ensure_executor(self) -> Executor:
+        if self._executor is None:
+            if self.workers > 0:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="tracking-compute")
+        return self._executor
+
+tracking_compute_pool = TrackingComputePool(
+    workers=settings.TRACKING_COMPUTE_WORKERS,
+    max_pending=settings.TRACKING_COMPUTE_MAX_PENDING
+)
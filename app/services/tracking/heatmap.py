@@ -0,0 +1,266 @@
+# app/services/tracking/heatmap.py
+"""페이지별 세션 히트맵 합계
+
+세션이 저장될 때 같은 트랜잭션에서 해상도별 합계 행을 갱신합니다. 합계 도입 이전 세션과
+히트맵 피라미드 저장 이전 세션은 실시간 갱신에 포함되지 않으므로, 재구성 명령으로
+저장된 고정점에서 피라미드를 계산해 행에 채우고 합계를 다시 만듭니다 (여러 번 실행해도 같은 결과).
+재구성 전에는 해상도마다 session_count가 다를 수 있습니다.
+합계는 기간 구분 없이 누적되므로, 보관된 파티션이 있으면 보관된 세션이 합계에서 빠지지 않도록
+재구성을 실행하지 않습니다.
+
+    python -m app.services.tracking.heatmap --page-id 1
+"""
+import argparse
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import numpy as np
+from sqlalchemy import update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Query, Session
+from app.core.config import settings
+from app.models.tracking import EyeTrackingData, PageHeatmapAggregate
+from app.services.tracking.partitions import TrackingPartitionManager
+from app.utils.tracking import HEATMAP_PYRAMID_LEVELS, TrackingUtils
+from app.utils.tracking_codec import VERSION, TrackingCodec
+
+# (page_id, user_id) - user_id가 None이면 전체 사용자 합계
+AggregateKey = Tuple[int, Optional[int]]
+
+HEATMAP_SUM_DTYPE = np.dtype("<f8")
+
+REBUILD_BATCH_SIZE = 500
+
+
+class PageHeatmapService:
+    """페이지별 세션 히트맵 누적 합계 (세션 저장 시 갱신, 조회는 해상도² 연산)
+
+    기본 히트맵과 히트맵 피라미드의 각 해상도를 별도 합계 행으로 누적합니다.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def record_rows(self, rows: Iterable[Dict[str, Any]]) -> None:
+        """완료된 세션 행의 히트맵을 사용자별/전체, 해상도별 합계에 더함 (commit은 호출하는 쪽에서 수행)"""
+        # 합계 대상별 해상도 -> 더할 히트맵 목록
+        sums: Dict[AggregateKey, Dict[int, List[np.ndarray]]] = {}
+        for row in rows:
+            # 버퍼 청크 행은 제외하고 세션 단위 행만 반영
+            if row.get("session_id") is None:
+                continue
+            heatmaps = TrackingCodec.read_heatmaps(row["tracking_data"], row.get("tracking_blob"))
+            for key in ((row["page_id"], row["user_id"]), (row["page_id"], None)):
+                levels = sums.setdefault(key, {})
+                for resolution, heatmap in heatmaps.items():
+                    if heatmap.ndim == 2 and heatmap.size:
+                        levels.setdefault(resolution, []).append(heatmap)
+
+        for (page_id, user_id), levels in sums.items():
+            # 해상도별 합계 행은 한 번에 조회
+            aggregates = {
+                aggregate.resolution: aggregate
+                for aggregate in self._query(page_id, user_id, list(levels), for_update=True)
+            }
+            for resolution, heatmaps in levels.items():
+                aggregate = aggregates.get(resolution)
+                if aggregate is None:
+                    aggregate = self._create(page_id, user_id, resolution)
+
+                total = self.decode_sum(aggregate) + np.sum(heatmaps, axis=0, dtype=HEATMAP_SUM_DTYPE)
+                aggregate.heatmap_sum = total.tobytes()
+                aggregate.session_count += len(heatmaps)
+                aggregate.updated_at = datetime.utcnow()
+
+    def rebuild(self, page_id: Optional[int] = None, store_pyramids: bool = True) -> int:
+        """저장된 세션 행으로 해상도별 합계를 다시 생성 (반영한 세션 수 반환)
+
+        피라미드가 없거나 일부 해상도가 빠진 행은 저장된 고정점으로 계산하며,
+        store_pyramids이면 계산한 피라미드를 행에도 저장합니다.
+        보관된 파티션이 있으면 합계를 지우지 않고 RuntimeError를 발생시킵니다.
+        """
+        archived = TrackingPartitionManager(self.db).archived_partitions()
+        if archived:
+            raise RuntimeError(
+                f"Cannot rebuild page heatmaps: {len(archived)} archived partitions "
+                f"(oldest {archived[0][0]}) are included in the aggregates"
+            )
+
+        aggregate_query = self.db.query(PageHeatmapAggregate)
+        source_query = self.db.query(
+            EyeTrackingData.id,
+            EyeTrackingData.page_id,
+            EyeTrackingData.user_id,
+            EyeTrackingData.tracking_data,
+            EyeTrackingData.tracking_blob
+        ).filter(EyeTrackingData.session_id.isnot(None))
+        if page_id is not None:
+            aggregate_query = aggregate_query.filter(PageHeatmapAggregate.page_id == page_id)
+            source_query = source_query.filter(EyeTrackingData.page_id == page_id)
+
+        aggregate_query.delete(synchronize_session=False)
+
+        # (page_id, user_id, resolution) -> [세션 수, 합계]
+        sums: Dict[Tuple[int, Optional[int], int], List[Any]] = {}
+        updates: List[Dict[str, Any]] = []
+        count = 0
+        for row in source_query.order_by(EyeTrackingData.id).yield_per(REBUILD_BATCH_SIZE):
+            heatmaps, stored = self._backfill_heatmaps(row)
+            if stored is not None and store_pyramids:
+                updates.append(stored)
+                if len(updates) >= REBUILD_BATCH_SIZE:
+                    self.db.execute(update(EyeTrackingData), updates)
+                    updates = []
+
+            for user_id in (row.user_id, None):
+                for resolution, heatmap in heatmaps.items():
+                    if heatmap.ndim != 2 or not heatmap.size:
+                        continue
+                    entry = sums.setdefault(
+                        (row.page_id, user_id, resolution),
+                        [0, np.zeros((resolution, resolution), dtype=HEATMAP_SUM_DTYPE)]
+                    )
+                    entry[0] += 1
+                    entry[1] += heatmap
+            count += 1
+
+        if updates:
+            self.db.execute(update(EyeTrackingData), updates)
+        now = datetime.utcnow()
+        self.db.add_all(
+            PageHeatmapAggregate(
+                page_id=key_page_id,
+                user_id=user_id,
+                resolution=resolution,
+                session_count=session_count,
+                heatmap_sum=total.tobytes(),
+                updated_at=now
+            )
+            for (key_page_id, user_id, resolution), (session_count, total) in sums.items()
+        )
+        self.db.commit()
+        return count
+
+    @staticmethod
+    def _backfill_heatmaps(row: Any) -> Tuple[Dict[int, np.ndarray], Optional[Dict[str, Any]]]:
+        """행의 해상도 -> 히트맵과, 피라미드를 새로 계산했으면 행에 저장할 변경 값 반환"""
+        tracking_data, blob = row.tracking_data, row.tracking_blob
+        if blob is not None:
+            decoded = TrackingCodec.decode(blob)
+            pyramid, heatmap = decoded["pyramid"], decoded["heatmap"]
+        else:
+            pyramid = TrackingCodec.read_pyramid(tracking_data, None)
+            heatmap = TrackingCodec.read_heatmap(tracking_data, None)
+
+        stored = None
+        if any(level not in pyramid for level in HEATMAP_PYRAMID_LEVELS):
+            fixations = TrackingCodec.read_fixations(tracking_data, blob)
+            pyramid = TrackingUtils.heatmap_pyramid(fixations["x"], fixations["y"], fixations["duration"])
+            if blob is not None:
+                stored = {
+                    "id": row.id,
+                    "tracking_data": {**tracking_data, "encoding": VERSION},
+                    "tracking_blob": TrackingCodec.encode(
+                        TrackingUtils.fixations_to_list(fixations), heatmap, pyramid
+                    )
+                }
+            else:
+                stored = {
+                    "id": row.id,
+                    "tracking_data": {
+                        **tracking_data,
+                        "heatmap_pyramid": {str(level): level_map.tolist() for level, level_map in pyramid.items()}
+                    }
+                }
+            # 세션 저장 시 합계와 같도록 저장 형식(양자화/float32)으로 읽은 값을 사용
+            pyramid = TrackingCodec.read_pyramid(stored["tracking_data"], stored.get("tracking_blob"))
+
+        # 세션 저장 시와 같이 해상도가 겹치면 피라미드 단계 사용
+        heatmaps = dict(pyramid)
+        if heatmap.ndim == 2 and heatmap.size:
+            heatmaps.setdefault(heatmap.shape[0], heatmap)
+        return heatmaps, stored
+
+    def get_average(
+        self,
+        page_id: int,
+        user_id: Optional[int] = None,
+        resolution: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """페이지 평균 히트맵 (user_id가 None이면 전체 사용자, resolution이 None이면 기본 해상도)"""
+        aggregate = self._query(page_id, user_id, [resolution or settings.TRACKING_HEATMAP_RESOLUTION]).first()
+        if aggregate is None or aggregate.session_count == 0:
+            return {
+                "page_id": page_id,
+                "session_count": 0,
+                "resolution": 0,
+                "heatmap": []
+            }
+
+        return {
+            "page_id": page_id,
+            "session_count": aggregate.session_count,
+            "resolution": aggregate.resolution,
+            "heatmap": (self.decode_sum(aggregate) / aggregate.session_count).tolist()
+        }
+
+    @staticmethod
+    def decode_sum(aggregate: PageHeatmapAggregate) -> np.ndarray:
+        resolution = aggregate.resolution
+        return np.frombuffer(aggregate.heatmap_sum, dtype=HEATMAP_SUM_DTYPE).reshape(resolution, resolution)
+
+    def _create(self, page_id: int, user_id: Optional[int], resolution: int) -> PageHeatmapAggregate:
+        """합계 행을 savepoint 안에서 생성 (동시에 먼저 생성되었으면 그 행을 잠가서 반환)"""
+        aggregate = PageHeatmapAggregate(
+            page_id=page_id,
+            user_id=user_id,
+            resolution=resolution,
+            session_count=0,
+            heatmap_sum=np.zeros((resolution, resolution), dtype=HEATMAP_SUM_DTYPE).tobytes(),
+            updated_at=datetime.utcnow()
+        )
+        try:
+            with self.db.begin_nested():
+                self.db.add(aggregate)
+                self.db.flush()
+        except IntegrityError:
+            return self._query(page_id, user_id, [resolution], for_update=True).one()
+        return aggregate
+
+    def _query(self, page_id: int, user_id: Optional[int], resolutions: List[int], for_update: bool = False) -> Query:
+        query = self.db.query(PageHeatmapAggregate).filter(
+            PageHeatmapAggregate.page_id == page_id,
+            PageHeatmapAggregate.resolution.in_(resolutions)
+        )
+        if user_id is None:
+            query = query.filter(PageHeatmapAggregate.user_id.is_(None))
+        else:
+            query = query.filter(PageHeatmapAggregate.user_id == user_id)
+        if for_update:
+            query = query.with_for_update()
+        return query
+
+
+def main() -> None:
+    from app.db.session import SessionLocal
+
+    parser = argparse.ArgumentParser(description="Backfill heatmap pyramids and rebuild page heatmap aggregates")
+    parser.add_argument("--page-id", type=int, default=None)
+    parser.add_argument(
+        "--no-store-pyramids",
+        action="store_true",
+        help="rebuild aggregates without writing computed pyramids back to tracking rows"
+    )
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        count = PageHeatmapService(db).rebuild(page_id=args.page_id, store_pyramids=not args.no_store_pyramids)
+        print(f"rebuilt page heatmaps from {count} sessions")
+    except RuntimeError as e:
+        parser.exit(1, f"{e}\n")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
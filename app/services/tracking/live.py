@@ -0,0 +1,115 @@
+# app/services/tracking/live.py
+import asyncio
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+import numpy as np
+from app.utils.tracking import LINE_CHANGE_THRESHOLD, TrackingUtils
+
+# (도착 시각 ms, y, 고정 시간 ms)
+WindowFixation = Tuple[float, float, float]
+
+
+class LiveMetricsWindow:
+    """세션별 최근 window_ms 구간의 실시간 읽기 지표
+
+    수집 경로에서 종료된 고정점이 들어올 때마다 한 번 갱신되고, 여러 관찰자는 같은 결과를 기다립니다.
+    고정 시간 합계와 줄 이동 수를 누적 값으로 유지하므로 갱신 비용은 추가/만료된 고정점 수에 비례합니다.
+    고정점의 시각은 해당 고정점이 종료된 처리 청크의 마지막 시선 시각입니다.
+    """
+
+    def __init__(self, window_ms: float):
+        self.window_ms = window_ms
+        self.version = 0
+        self.closed = False
+        self._fixations: Deque[WindowFixation] = deque()
+        self._duration_sum = 0.0
+        self._vertical_changes = 0
+        self._first_timestamp: Optional[float] = None
+        self._now = 0.0
+        self._snapshot: Dict[str, Any] = self._build_snapshot()
+        self._waiters: List[asyncio.Future] = []
+        self._lock = threading.Lock()
+
+    def update(self, fixations: Dict[str, np.ndarray], first_timestamp: float, now: float) -> Dict[str, Any]:
+        """새로 종료된 고정점(열 단위)을 반영하고 now 기준으로 오래된 고정점 만료"""
+        with self._lock:
+            if self._first_timestamp is None:
+                self._first_timestamp = first_timestamp
+            self._now = now
+
+            for y, duration in zip(fixations["y"].tolist(), fixations["duration"].tolist()):
+                if self._fixations and abs(y - self._fixations[-1][1]) > LINE_CHANGE_THRESHOLD:
+                    self._vertical_changes += 1
+                self._fixations.append((now, y, duration))
+                self._duration_sum += duration
+
+            while self._fixations and self._fixations[0][0] < now - self.window_ms:
+                _, y, duration = self._fixations.popleft()
+                self._duration_sum -= duration
+                if self._fixations and abs(self._fixations[0][1] - y) > LINE_CHANGE_THRESHOLD:
+                    self._vertical_changes -= 1
+
+            self.version += 1
+            self._snapshot = self._build_snapshot()
+            return self._notify()
+
+    def snapshot(self) -> Tuple[int, Dict[str, Any]]:
+        """(버전, 최신 지표)"""
+        with self._lock:
+            return self.version, self._snapshot
+
+    async def wait(self, version: int, timeout: float) -> Optional[Tuple[int, Dict[str, Any]]]:
+        """version 이후 갱신을 기다림 (timeout이면 None, 세션이 끝나면 closed가 True)"""
+        with self._lock:
+            if self.version != version or self.closed:
+                return self.version, self._snapshot
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+        try:
+            return await asyncio.wait_for(waiter, timeout)
+        except asyncio.TimeoutError:
+            return None
+        finally:
+            with self._lock:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+
+    def close(self) -> None:
+        """세션 종료 알림"""
+        with self._lock:
+            self.closed = True
+            self._notify()
+
+    def _notify(self) -> Dict[str, Any]:
+        # 다른 스레드에서 갱신되어도 각 관찰자의 이벤트 루프에서 결과 설정
+        result = (self.version, self._snapshot)
+        for waiter in self._waiters:
+            try:
+                waiter.get_loop().call_soon_threadsafe(self._resolve, waiter, result)
+            except RuntimeError:
+                # 관찰자의 이벤트 루프가 이미 종료됨
+                pass
+        self._waiters = []
+        return self._snapshot
+
+    @staticmethod
+    def _resolve(waiter: asyncio.Future, result: Tuple[int, Dict[str, Any]]) -> None:
+        if not waiter.done():
+            waiter.set_result(result)
+
+    def _build_snapshot(self) -> Dict[str, Any]:
+        count = len(self._fixations)
+        elapsed = self._now - self._first_timestamp if self._first_timestamp is not None else 0.0
+        span = min(self.window_ms, elapsed)
+        return {
+            "timestamp": self._now,
+            "window_ms": self.window_ms,
+            "fixation_count": count,
+            "fixation_rate": count / (span / 1000.0) if span > 0 else 0.0,
+            "attention_score": self._duration_sum / span if span > 0 else 0.0,
+            "pattern": (
+                TrackingUtils.classify_reading_pattern(self._vertical_changes, count - 1)
+                if count else "unknown"
+            )
+        }
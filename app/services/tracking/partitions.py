@@ -0,0 +1,241 @@
+# app/services/tracking/partitions.py
+"""eye_tracking_data 월별 파티션 관리 (PostgreSQL)
+
+다음 달 파티션을 미리 만들고 (기본 파티션에 들어간 해당 월 행은 새 파티션으로 이동),
+보존 기간이 지난 파티션은 분리한 뒤
+gzip JSON Lines 파일로 보관하고 삭제합니다. 일별 집계와 페이지 히트맵 합계는
+별도 테이블에 남으므로 보관 이후에도 일 단위 진행 분석은 유지됩니다.
+보관 이후 일별 집계 재구성은 보관되지 않은 월부터만 다시 계산하고, 페이지 히트맵 합계
+재구성은 보관된 세션을 지우게 되므로 실행하지 않습니다.
+
+    python -m app.services.tracking.partitions --ensure --archive
+"""
+import argparse
+import base64
+import gzip
+import json
+import os
+import re
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from app.core.config import settings
+
+TABLE = "eye_tracking_data"
+DEFAULT_PARTITION = f"{TABLE}_default"
+PARTITION_NAME = re.compile(rf"^{TABLE}_p(\d{{4}})_(\d{{2}})$")
+
+ARCHIVE_BATCH_SIZE = 1000
+ARCHIVE_SUFFIX = ".jsonl.gz"
+
+
+def month_start(day: date) -> date:
+    return date(day.year, day.month, 1)
+
+
+def add_months(month: date, count: int) -> date:
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"{TABLE}_p{month.year:04d}_{month.month:02d}"
+
+
+class TrackingPartitionManager:
+    def __init__(self, db: Session):
+        self.db = db
+
+    @property
+    def supported(self) -> bool:
+        """파티션 테이블을 쓰는 데이터베이스인지 여부"""
+        return self.db.get_bind().dialect.name == "postgresql"
+
+    def list_partitions(self) -> List[Tuple[str, date]]:
+        """월별 파티션 (이름, 시작 월) 목록 (기본 파티션 제외, 오래된 순)"""
+        if not self.supported:
+            return []
+        names = self.db.execute(text(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = CAST(:table AS regclass)"
+        ), {"table": TABLE}).scalars()
+
+        partitions = []
+        for name in names:
+            match = PARTITION_NAME.match(name)
+            if match:
+                partitions.append((name, date(int(match.group(1)), int(match.group(2)), 1)))
+        return sorted(partitions, key=lambda partition: partition[1])
+
+    def archived_partitions(
+        self,
+        archive_dir: Optional[str] = settings.TRACKING_ARCHIVE_DIR
+    ) -> List[Tuple[str, date]]:
+        """보관된 월 파티션 (이름, 시작 월) 목록 (분리된 채 남은 테이블과 보관 파일 기준, 오래된 순)"""
+        if not self.supported:
+            return []
+        attached = {name for name, _ in self.list_partitions()}
+        names = set(self.db.execute(text(
+            "SELECT relname FROM pg_class WHERE relkind = 'r' AND relname LIKE :prefix"
+        ), {"prefix": f"{TABLE}_p%"}).scalars()) - attached
+        if archive_dir and os.path.isdir(archive_dir):
+            names.update(
+                file[:-len(ARCHIVE_SUFFIX)] for file in os.listdir(archive_dir) if file.endswith(ARCHIVE_SUFFIX)
+            )
+
+        partitions = []
+        for name in names:
+            match = PARTITION_NAME.match(name)
+            if match:
+                partitions.append((name, date(int(match.group(1)), int(match.group(2)), 1)))
+        return sorted(partitions, key=lambda partition: partition[1])
+
+    def live_since(self) -> Optional[date]:
+        """원본 행이 남아 있는 가장 오래된 월 (보관된 파티션이 없으면 None - 전체 행이 남아 있음)"""
+        archived = self.archived_partitions()
+        if not archived:
+            return None
+        partitions = self.list_partitions()
+        return partitions[0][1] if partitions else add_months(archived[-1][1], 1)
+
+    def ensure_partitions(self, months_ahead: int = settings.TRACKING_PARTITION_MONTHS_AHEAD) -> List[str]:
+        """이번 달부터 months_ahead개월 뒤까지 없는 파티션 생성 (생성한 이름 반환)"""
+        if not self.supported:
+            return []
+        existing = {name for name, _ in self.list_partitions()}
+        current = month_start(datetime.utcnow().date())
+
+        created = []
+        for offset in range(months_ahead + 1):
+            month = add_months(current, offset)
+            name = partition_name(month)
+            if name in existing:
+                continue
+            try:
+                self._create_partition(name, month, add_months(month, 1))
+                self.db.commit()
+            except Exception:
+                self.db.rollback()
+                raise
+            created.append(name)
+        return created
+
+    def _create_partition(self, name: str, lower: date, upper: date) -> None:
+        """월 파티션 생성 (기본 파티션에 이미 들어간 해당 범위 행은 같은 트랜잭션에서 이동)
+
+        기본 파티션에 범위 안의 행이 있으면 CREATE TABLE ... PARTITION OF가 실패하므로
+        기본 파티션을 잠시 분리하고, 새 파티션 생성과 행 이동 후 다시 연결합니다.
+        """
+        bounds = {"lower": lower, "upper": upper}
+        in_range = "created_at >= :lower AND created_at < :upper"
+        create = text(
+            f"CREATE TABLE {name} PARTITION OF {TABLE} "
+            f"FOR VALUES FROM ('{lower.isoformat()}') TO ('{upper.isoformat()}')"
+        )
+
+        has_default_rows = self.db.execute(
+            text(f"SELECT EXISTS (SELECT 1 FROM {DEFAULT_PARTITION} WHERE {in_range})"), bounds
+        ).scalar()
+        if not has_default_rows:
+            self.db.execute(create)
+            return
+
+        self.db.execute(text(f"ALTER TABLE {TABLE} DETACH PARTITION {DEFAULT_PARTITION}"))
+        self.db.execute(create)
+        self.db.execute(text(f"INSERT INTO {name} SELECT * FROM {DEFAULT_PARTITION} WHERE {in_range}"), bounds)
+        self.db.execute(text(f"DELETE FROM {DEFAULT_PARTITION} WHERE {in_range}"), bounds)
+        self.db.execute(text(f"ALTER TABLE {TABLE} ATTACH PARTITION {DEFAULT_PARTITION} DEFAULT"))
+
+    def archive_partitions(
+        self,
+        retention_months: int = settings.TRACKING_RETENTION_MONTHS,
+        archive_dir: Optional[str] = settings.TRACKING_ARCHIVE_DIR
+    ) -> List[Dict[str, Any]]:
+        """보존 기간이 지난 파티션을 분리하고 보관 (archive_dir이 없으면 분리만 수행)"""
+        if not self.supported:
+            return []
+        if retention_months < 1:
+            raise ValueError("retention_months must be at least 1")
+
+        cutoff = add_months(month_start(datetime.utcnow().date()), -retention_months)
+        archived = []
+        for name, month in self.list_partitions():
+            if add_months(month, 1) > cutoff:
+                break
+
+            self.db.execute(text(f"ALTER TABLE {TABLE} DETACH PARTITION {name}"))
+            self.db.commit()
+
+            result = {"partition": name, "month": month.isoformat(), "rows": 0, "path": None}
+            if archive_dir:
+                path = os.path.join(archive_dir, f"{name}{ARCHIVE_SUFFIX}")
+                result["rows"] = self._export(name, path)
+                result["path"] = path
+                self.db.execute(text(f"DROP TABLE {name}"))
+                self.db.commit()
+            archived.append(result)
+        return archived
+
+    def _export(self, name: str, path: str) -> int:
+        """분리된 파티션을 gzip JSON Lines 파일로 저장 (배치 단위 스트리밍)"""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        partial = f"{path}.partial"
+        count = 0
+        rows = self.db.execute(
+            text(f"SELECT * FROM {name} ORDER BY id").execution_options(yield_per=ARCHIVE_BATCH_SIZE)
+        ).mappings()
+        with gzip.open(partial, "wt", encoding="utf-8") as archive:
+            for row in rows:
+                archive.write(json.dumps(self._serialize(row), ensure_ascii=False))
+                archive.write("\n")
+                count += 1
+        # 파일이 완전히 쓰인 뒤에만 최종 이름으로 변경
+        os.replace(partial, path)
+        return count
+
+    @staticmethod
+    def _serialize(row: Any) -> Dict[str, Any]:
+        serialized = {}
+        for key, value in row.items():
+            if isinstance(value, (datetime, date)):
+                value = value.isoformat()
+            elif isinstance(value, (bytes, memoryview)):
+                value = base64.b64encode(bytes(value)).decode("ascii")
+            serialized[key] = value
+        return serialized
+
+
+def main() -> None:
+    from app.db.session import SessionLocal
+
+    parser = argparse.ArgumentParser(description="Maintain monthly eye_tracking_data partitions")
+    parser.add_argument("--ensure", action="store_true", help="create upcoming monthly partitions")
+    parser.add_argument("--archive", action="store_true", help="detach and archive expired partitions")
+    parser.add_argument("--months-ahead", type=int, default=settings.TRACKING_PARTITION_MONTHS_AHEAD)
+    parser.add_argument("--retention-months", type=int, default=settings.TRACKING_RETENTION_MONTHS)
+    parser.add_argument("--archive-dir", default=settings.TRACKING_ARCHIVE_DIR)
+    parser.add_argument("--detach-only", action="store_true", help="keep detached tables instead of archiving")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        manager = TrackingPartitionManager(db)
+        if not manager.supported:
+            print("eye_tracking_data partitioning requires PostgreSQL, nothing to do")
+            return
+        if args.ensure:
+            for name in manager.ensure_partitions(args.months_ahead):
+                print(f"created {name}")
+        if args.archive:
+            archive_dir = None if args.detach_only else args.archive_dir
+            for result in manager.archive_partitions(args.retention_months, archive_dir):
+                target = result["path"] or "detached table"
+                print(f"archived {result['partition']} ({result['rows']} rows) -> {target}")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+# app/services/tracking/rollup.py
+"""일별 읽기 지표 집계
+
+세션이 저장될 때 같은 트랜잭션에서 (user_id, story_id, day) 집계 행을 갱신합니다.
+기존 데이터는 재구성 명령으로 채웁니다. 보관된 파티션이 있으면 원본 행이 남아 있는 월부터만
+다시 계산하고, 보관된 월의 집계는 그대로 둡니다.
+
+    python -m app.services.tracking.rollup --user-id 1
+"""
+import argparse
+from datetime import date, datetime, time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.models.tracking import EyeTrackingData, ReadingDailyRollup
+from app.services.tracking.partitions import TrackingPartitionManager
+from app.utils.tracking import TrackingUtils
+
+RollupKey = Tuple[int, int, date]
+
+REBUILD_BATCH_SIZE = 1000
+
+
+class ReadingRollupService:
+    def __init__(self, db: Session):
+        self.db = db
+        self.utils = TrackingUtils()
+
+    def record_rows(self, rows: Iterable[Dict[str, Any]]) -> None:
+        """저장할 트래킹 행들을 일별 집계에 반영 (commit은 호출하는 쪽에서 수행)
+
+        같은 (user_id, story_id, day) 행은 한 번만 조회/생성합니다.
+        """
+        grouped: Dict[RollupKey, List[Dict[str, Any]]] = {}
+        for row in rows:
+            # 버퍼 청크 행은 제외하고 세션 단위 행만 반영
+            if row.get("session_id") is None:
+                continue
+            recorded_at = row.get("completed_at") or row.get("created_at") or datetime.utcnow()
+            key = (row["user_id"], row["story_id"], recorded_at.date())
+            grouped.setdefault(key, []).append(row)
+
+        for (user_id, story_id, day), key_rows in grouped.items():
+            rollup = self._lock_rollup(user_id, story_id, day)
+            for row in key_rows:
+                self._apply(rollup, row["tracking_data"].get("metrics", {}), row.get("pattern"))
+
+    def rebuild(self, user_id: Optional[int] = None, story_id: Optional[int] = None) -> int:
+        """저장된 세션 행으로 일별 집계를 다시 생성 (반영한 세션 수 반환, 버퍼 청크 행 제외)
+
+        보관된 파티션이 있으면 원본 행이 남아 있는 월 이후의 날짜만 다시 생성합니다.
+        """
+        rollup_query = self.db.query(ReadingDailyRollup)
+        source_query = self.db.query(
+            EyeTrackingData.user_id,
+            EyeTrackingData.story_id,
+            EyeTrackingData.completed_at,
+            EyeTrackingData.created_at,
+            EyeTrackingData.pattern,
+            EyeTrackingData.tracking_data
+        ).filter(EyeTrackingData.session_id.isnot(None))
+        if user_id is not None:
+            rollup_query = rollup_query.filter(ReadingDailyRollup.user_id == user_id)
+            source_query = source_query.filter(EyeTrackingData.user_id == user_id)
+        if story_id is not None:
+            rollup_query = rollup_query.filter(ReadingDailyRollup.story_id == story_id)
+            source_query = source_query.filter(EyeTrackingData.story_id == story_id)
+
+        since = TrackingPartitionManager(self.db).live_since()
+        if since is not None:
+            # 보관된 월은 원본 행이 없으므로 집계를 유지하고 남아 있는 월부터 다시 계산
+            start = datetime.combine(since, time.min)
+            rollup_query = rollup_query.filter(ReadingDailyRollup.day >= since)
+            source_query = source_query.filter(
+                EyeTrackingData.created_at >= start,
+                func.coalesce(EyeTrackingData.completed_at, EyeTrackingData.created_at) >= start
+            )
+
+        rollup_query.delete(synchronize_session=False)
+
+        rollups: Dict[RollupKey, ReadingDailyRollup] = {}
+        count = 0
+        for row in source_query.order_by(EyeTrackingData.id).yield_per(REBUILD_BATCH_SIZE):
+            # 실시간 갱신과 같은 날짜 기준 (완료 시각, 없으면 생성 시각)
+            key = (row.user_id, row.story_id, (row.completed_at or row.created_at).date())
+            rollup = rollups.get(key)
+            if rollup is None:
+                rollup = rollups[key] = self._new_rollup(*key)
+            self._apply(
+                rollup,
+                row.tracking_data.get("metrics", {}),
+                row.pattern or row.tracking_data.get("pattern")
+            )
+            count += 1
+
+        self.db.add_all(rollups.values())
+        self.db.commit()
+        return count
+
+    def _lock_rollup(self, user_id: int, story_id: int, day: date) -> ReadingDailyRollup:
+        """집계 행을 잠근 채 조회하고, 없으면 savepoint 안에서 생성
+
+        동시에 같은 행을 처음 생성하면 유니크 제약 위반이 나므로
+        savepoint만 되돌리고 먼저 생성된 행을 다시 잠가서 사용합니다.
+        """
+        query = self.db.query(ReadingDailyRollup).filter(
+            ReadingDailyRollup.user_id == user_id,
+            ReadingDailyRollup.story_id == story_id,
+            ReadingDailyRollup.day == day
+        ).with_for_update()
+
+        rollup = query.first()
+        if rollup is not None:
+            return rollup
+
+        rollup = self._new_rollup(user_id, story_id, day)
+        try:
+            with self.db.begin_nested():
+                self.db.add(rollup)
+                self.db.flush()
+        except IntegrityError:
+            return query.one()
+        return rollup
+
+    def _new_rollup(self, user_id: int, story_id: int, day: date) -> ReadingDailyRollup:
+        return ReadingDailyRollup(
+            user_id=user_id,
+            story_id=story_id,
+            day=day,
+            session_count=0,
+            total_time=0.0,
+            reading_speed_sum=0.0,
+            comprehension_sum=0.0,
+            attention_sum=0.0,
+            pattern_counts={},
+            updated_at=datetime.utcnow()
+        )
+
+    def _apply(self, rollup: ReadingDailyRollup, metrics: Dict[str, Any], pattern: Optional[str]) -> None:
+        attention = float(metrics.get("attention_score", 0))
+
+        rollup.session_count += 1
+        rollup.total_time += float(metrics.get("total_time", 0))
+        rollup.reading_speed_sum += float(self.utils.reading_speed(metrics))
+        rollup.comprehension_sum += float(self.utils.estimate_comprehension(metrics))
+        rollup.attention_sum += attention
+        rollup.attention_min = attention if rollup.attention_min is None else min(rollup.attention_min, attention)
+        rollup.attention_max = attention if rollup.attention_max is None else max(rollup.attention_max, attention)
+
+        # JSON 컬럼 변경 감지를 위해 새 딕셔너리로 교체
+        pattern_counts = dict(rollup.pattern_counts or {})
+        pattern_key = pattern or "unknown"
+        pattern_counts[pattern_key] = pattern_counts.get(pattern_key, 0) + 1
+        rollup.pattern_counts = pattern_counts
+        rollup.updated_at = datetime.utcnow()
+
+
+def main() -> None:
+    from app.db.session import SessionLocal
+
+    parser = argparse.ArgumentParser(description="Rebuild daily reading rollups")
+    parser.add_argument("--user-id", type=int, default=None)
+    parser.add_argument("--story-id", type=int, default=None)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        count = ReadingRollupService(db).rebuild(user_id=args.user_id, story_id=args.story_id)
+        print(f"rebuilt rollups from {count} sessions")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
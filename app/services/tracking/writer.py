@@ -0,0 +1,193 @@
+# app/services/tracking/writer.py
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.exceptions import DrawryException
+from app.db.session import SessionLocal
+from app.models.tracking import EyeTrackingData
+from app.services.analytics_cache import analytics_cache
+from app.services.tracking.heatmap import PageHeatmapService
+from app.services.tracking.rollup import ReadingRollupService
+
+logger = logging.getLogger(__name__)
+
+# 종료 신호
+_STOP = object()
+
+
+class TrackingWriteQueue:
+    """트래킹 레코드 지연 일괄 저장 큐
+
+    요청 처리 중에는 큐에 넣기만 하고, 백그라운드 스레드가 batch_size개가 모이거나
+    flush_interval초가 지나면 한 번의 bulk insert와 commit으로 저장합니다.
+    큐가 가득 차면 기다리지 않고 바로 503 오류로 부하를 되돌립니다 (이벤트 루프에서 호출됨).
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        max_size: int,
+        batch_size: int,
+        flush_interval: float
+    ):
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=max_size)
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._closed = False
+        self.flushed_rows = 0
+        self.commits = 0
+        self.failed_rows = 0
+
+    def submit(self, row: Dict[str, Any]) -> Future:
+        """저장할 행 추가 (commit 완료 시 결과가 설정되는 Future 반환)"""
+        return self.submit_many([row])[0]
+
+    def submit_many(self, rows: List[Dict[str, Any]]) -> List[Future]:
+        """여러 행을 한 번에 추가 (남은 공간이 모자라면 하나도 넣지 않고 503)"""
+        with self._lock:
+            if self._closed:
+                raise DrawryException(
+                    code="TRACKING_QUEUE_CLOSED",
+                    message="Tracking write queue is shut down",
+                    status_code=503
+                )
+            self._ensure_started()
+            queued = self._queue.qsize()
+            if self._queue.maxsize - queued < len(rows):
+                raise DrawryException(
+                    code="TRACKING_QUEUE_FULL",
+                    message="Tracking write queue is full, retry later",
+                    status_code=503,
+                    details={"queued": queued}
+                )
+            # 작업 스레드는 꺼내기만 하므로 확인한 공간은 줄어들지 않음
+            futures = []
+            for row in rows:
+                future: Future = Future()
+                self._queue.put_nowait((row, future))
+                futures.append(future)
+        return futures
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """남은 행을 모두 저장하고 작업 스레드 종료"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            thread = self._thread
+        if thread is None:
+            return
+        self._queue.put(_STOP)
+        thread.join(timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        """큐 상태"""
+        return {
+            "queued": self._queue.qsize(),
+            "flushed_rows": self.flushed_rows,
+            "commits": self.commits,
+            "failed_rows": self.failed_rows
+        }
+
+    def _ensure_started(self) -> None:
+        # _lock을 잡은 상태에서 호출
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run,
+                name="tracking-write-queue",
+                daemon=True
+            )
+            self._thread.start()
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+
+            batch: List[Tuple[Dict[str, Any], Future]] = [item]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            self._flush(batch)
+
+        # 종료 신호 이후에 들어온 행까지 저장
+        leftover = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not _STOP:
+                leftover.append(item)
+        for start in range(0, len(leftover), self.batch_size):
+            self._flush(leftover[start:start + self.batch_size])
+
+    def _flush(self, batch: List[Tuple[Dict[str, Any], Future]]) -> None:
+        """배치를 한 트랜잭션으로 저장
+
+        실패하면 배치를 반으로 나눠 다시 저장하므로, 잘못된 행(예: 외래 키 위반)이 있어도
+        그 행의 Future만 실패하고 같은 배치의 다른 행은 저장됩니다.
+        """
+        rows = [row for row, _ in batch]
+        try:
+            self._write(rows)
+        except Exception as e:
+            if len(batch) > 1:
+                logger.warning(f"Failed to flush {len(rows)} tracking rows, retrying in halves: {str(e)}")
+                middle = len(batch) // 2
+                self._flush(batch[:middle])
+                self._flush(batch[middle:])
+                return
+            self.failed_rows += 1
+            logger.error(f"Failed to flush tracking row: {str(e)}")
+            batch[0][1].set_exception(e)
+            return
+
+        self.flushed_rows += len(rows)
+        self.commits += 1
+        for scope in {(row["user_id"], row["story_id"]) for row in rows}:
+            analytics_cache.invalidate(*scope)
+        for _, future in batch:
+            future.set_result(None)
+
+    def _write(self, rows: List[Dict[str, Any]]) -> None:
+        db = self.session_factory()
+        try:
+            db.execute(insert(EyeTrackingData), rows)
+            ReadingRollupService(db).record_rows(rows)
+            PageHeatmapService(db).record_rows(rows)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+tracking_write_queue = TrackingWriteQueue(
+    session_factory=SessionLocal,
+    max_size=settings.TRACKING_WRITE_QUEUE_SIZE,
+    batch_size=settings.TRACKING_WRITE_BATCH_SIZE,
+    flush_interval=settings.TRACKING_WRITE_FLUSH_INTERVAL
+)
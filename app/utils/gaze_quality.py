@@ -0,0 +1,132 @@
+# app/utils/gaze_quality.py
+from typing import Any, Dict, Optional, Tuple
+import numpy as np
+
+QUALITY_COUNTERS = (
+    "samples_in",
+    "low_confidence",
+    "off_screen",
+    "velocity_outliers",
+    "interpolated",
+    "removed",
+    "samples_out"
+)
+
+
+class GazeQualityFilter:
+    """고정점 검출 전 시선 데이터 정제 (rows: (n, 4) 배열 - x, y, timestamp, confidence)
+
+    1. confidence가 min_confidence 미만이거나 좌표가 화면(0~1) 밖/유효하지 않은 샘플 제외
+    2. 앞뒤 샘플 모두와의 속도가 max_velocity(화면 비율/초)를 넘는 단발성 튐 제외
+    3. 제외된 구간의 길이가 max_gap_ms 이하이면 앞뒤 샘플로 선형 보간해 되살림 (신뢰도는 NaN)
+    남은 샘플 비율이 min_valid_ratio 미만이면 품질 불량으로 표시합니다.
+
+    요청 단위로 나뉘어 들어오는 경우 previous(이전 요청의 마지막 유효 샘플)를 넘기면
+    첫 샘플의 들어오는 속도와 요청 경계의 짧은 구간 보간까지 검사합니다. 마지막 샘플은
+    나가는 속도를 알 수 없으므로 속도 검사를 하지 않으며, 포인트 하나씩 들어오는
+    요청에서는 사실상 신뢰도/화면 밖 검사만 적용됩니다.
+    """
+
+    def __init__(
+        self,
+        min_confidence: float = 0.0,
+        max_gap_ms: float = 75.0,
+        max_velocity: float = 30.0,
+        min_valid_ratio: float = 0.7
+    ):
+        self.min_confidence = min_confidence
+        self.max_gap_ms = max_gap_ms
+        self.max_velocity = max_velocity
+        self.min_valid_ratio = min_valid_ratio
+
+    def apply(self, rows: np.ndarray, previous: Optional[np.ndarray] = None) -> Tuple[np.ndarray, Dict[str, Any]]:
+        """정제된 배열과 제거/보간 개수 보고 반환 (previous는 검사 기준으로만 쓰고 결과/개수에서 제외)"""
+        context = previous is not None and rows.shape[0] > 0
+        if context:
+            rows = np.vstack((previous, rows))
+        n = rows.shape[0]
+        x, y, t, confidence = rows[:, 0], rows[:, 1], rows[:, 2], rows[:, 3]
+
+        low_confidence = confidence < self.min_confidence  # NaN(값 없음)은 유지
+        off_screen = ~(np.isfinite(x) & np.isfinite(y) & (x >= 0) & (x <= 1) & (y >= 0) & (y <= 1))
+        if context:
+            # 이전 샘플은 이미 통과한 샘플이므로 유효로 고정 (맨 앞이라 튐으로도 판정되지 않음)
+            low_confidence[0] = off_screen[0] = False
+        valid = ~(low_confidence | off_screen)
+
+        outliers = np.zeros(n, dtype=bool)
+        if self.max_velocity > 0:
+            outliers[valid] = self._velocity_outliers(x[valid], y[valid], t[valid])
+        valid &= ~outliers
+
+        interpolated = np.zeros(n, dtype=bool)
+        if self.max_gap_ms > 0 and valid.any() and not valid.all():
+            interpolated = self._short_gaps(t, valid)
+
+        keep = valid | interpolated
+        if context:
+            keep[0] = False
+        cleaned = rows[keep]
+        if interpolated.any():
+            cleaned = cleaned.copy()
+            filled = interpolated[keep]
+            kept_t = t[valid]
+            cleaned[filled, 0] = np.interp(cleaned[filled, 2], kept_t, x[valid])
+            cleaned[filled, 1] = np.interp(cleaned[filled, 2], kept_t, y[valid])
+            cleaned[filled, 3] = np.nan
+
+        n -= int(context)
+        report = {
+            "samples_in": n,
+            "low_confidence": int(np.count_nonzero(low_confidence)),
+            "off_screen": int(np.count_nonzero(off_screen & ~low_confidence)),
+            "velocity_outliers": int(np.count_nonzero(outliers)),
+            "interpolated": int(np.count_nonzero(interpolated)),
+            "removed": int(n - cleaned.shape[0]),
+            "samples_out": int(cleaned.shape[0])
+        }
+        return cleaned, self.summarize(report)
+
+    def summarize(self, counts: Dict[str, int]) -> Dict[str, Any]:
+        """개수 보고에 유효 비율과 품질 불량 여부 추가 (세션 누적 개수에도 사용)"""
+        samples_in = counts.get("samples_in", 0)
+        valid_ratio = counts.get("samples_out", 0) / samples_in if samples_in else 1.0
+        return {
+            **{key: int(counts.get(key, 0)) for key in QUALITY_COUNTERS},
+            "valid_ratio": float(valid_ratio),
+            "poor_quality": bool(valid_ratio < self.min_valid_ratio)
+        }
+
+    def _velocity_outliers(self, x: np.ndarray, y: np.ndarray, t: np.ndarray) -> np.ndarray:
+        """들어오는 속도와 나가는 속도가 모두 한계를 넘는 샘플 (양 끝은 한쪽만 검사하지 않음)"""
+        n = x.size
+        if n < 3:
+            return np.zeros(n, dtype=bool)
+        dt = np.diff(t) / 1000.0
+        distance = np.hypot(np.diff(x), np.diff(y))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            speed = np.where(dt > 0, distance / dt, np.inf)
+        fast = speed > self.max_velocity
+        outliers = np.zeros(n, dtype=bool)
+        outliers[1:-1] = fast[:-1] & fast[1:]
+        return outliers
+
+    def _short_gaps(self, t: np.ndarray, valid: np.ndarray) -> np.ndarray:
+        """앞뒤 유효 샘플 사이 간격이 max_gap_ms 이하인 제외 샘플"""
+        valid_t = t[valid]
+        invalid = np.flatnonzero(~valid)
+        after = np.searchsorted(valid_t, t[invalid], side="right")
+        inside = (after > 0) & (after < valid_t.size)  # 앞뒤 모두 유효 샘플이 있어야 보간
+
+        fill = np.zeros(t.size, dtype=bool)
+        gap = valid_t[after[inside]] - valid_t[after[inside] - 1]
+        fill[invalid[inside][gap <= self.max_gap_ms]] = True
+        return fill
+
+    @staticmethod
+    def merge_counts(total: Optional[Dict[str, int]], report: Dict[str, Any]) -> Dict[str, int]:
+        """세션 누적 개수에 배치 보고 더하기"""
+        total = dict(total or {})
+        for key in QUALITY_COUNTERS:
+            total[key] = total.get(key, 0) + report.get(key, 0)
+        return total
@@ -0,0 +1,107 @@
+# app/utils/gaze_sampling.py
+from typing import Any, Dict, Tuple
+import numpy as np
+
+SAMPLING_METHODS = ("none", "fixed_rate", "lttb")
+
+
+class GazeSampler:
+    """저장/분석 전 시선 포인트 축소 단계 (rows: (n, 4) 배열 - x, y, timestamp, confidence)
+
+    신뢰도 필터는 앞 단계의 GazeQualityFilter에서 적용합니다.
+    - fixed_rate: target_hz 간격 구간별 평균으로 재표본화
+    - lttb: Largest-Triangle-Three-Buckets로 max_points개까지 형태를 보존하며 축소
+    """
+
+    def __init__(
+        self,
+        method: str = "none",
+        target_hz: float = 30.0,
+        max_points: int = 5000
+    ):
+        if method not in SAMPLING_METHODS:
+            raise ValueError(f"Unknown sampling method: {method}. Must be one of {list(SAMPLING_METHODS)}")
+        self.method = method
+        self.target_hz = target_hz
+        self.max_points = max_points
+
+    def apply(self, rows: np.ndarray) -> Tuple[np.ndarray, Dict[str, Any]]:
+        """축소를 적용하고 (결과, 충실도 보고) 반환"""
+        if self.method == "fixed_rate":
+            sampled = self.resample_fixed_rate(rows, self.target_hz)
+        elif self.method == "lttb":
+            sampled = self.lttb(rows, self.max_points)
+        else:
+            sampled = rows
+
+        return sampled, {
+            "method": self.method,
+            "points_in": rows.shape[0],
+            "points_out": sampled.shape[0],
+            **self.reconstruction_error(rows, sampled)
+        }
+
+    @staticmethod
+    def resample_fixed_rate(rows: np.ndarray, target_hz: float) -> np.ndarray:
+        """일정 시간 간격 구간별 평균으로 재표본화 (timestamp는 ms)"""
+        if rows.shape[0] < 2 or target_hz <= 0:
+            return rows
+        period = 1000.0 / target_hz
+        t = rows[:, 2]
+        buckets = np.floor((t - t[0]) / period).astype(np.intp)
+        # 정렬된 시간이므로 구간 번호도 정렬되어 있음
+        _, starts, counts = np.unique(buckets, return_index=True, return_counts=True)
+        sums = np.add.reduceat(rows, starts, axis=0)
+        return sums / counts[:, None]
+
+    @staticmethod
+    def lttb(rows: np.ndarray, max_points: int) -> np.ndarray:
+        """Largest-Triangle-Three-Buckets 축소 (x, y 두 축의 삼각형 넓이 합 기준)"""
+        n = rows.shape[0]
+        if max_points >= n or max_points < 3:
+            return rows
+
+        t = rows[:, 2]
+        span = t[-1] - t[0]
+        # 좌표와 비슷한 크기가 되도록 시간을 0~1로 정규화
+        t = (t - t[0]) / span if span > 0 else np.linspace(0, 1, n)
+        x = rows[:, 0]
+        y = rows[:, 1]
+
+        edges = np.linspace(1, n - 1, max_points - 1).astype(np.intp)
+        selected = np.empty(max_points, dtype=np.intp)
+        selected[0] = 0
+        selected[-1] = n - 1
+
+        a = 0
+        for i in range(max_points - 2):
+            start, end = edges[i], edges[i + 1]
+            # 다음 구간 평균점
+            next_start, next_end = end, edges[i + 2] if i + 2 < edges.size else n
+            avg_t = t[next_start:next_end].mean()
+            avg_x = x[next_start:next_end].mean()
+            avg_y = y[next_start:next_end].mean()
+
+            bt = t[start:end]
+            area = (
+                np.abs((t[a] - avg_t) * (x[start:end] - x[a]) - (t[a] - bt) * (avg_x - x[a])) +
+                np.abs((t[a] - avg_t) * (y[start:end] - y[a]) - (t[a] - bt) * (avg_y - y[a]))
+            )
+            a = start + int(np.argmax(area))
+            selected[i + 1] = a
+
+        return rows[selected]
+
+    @staticmethod
+    def reconstruction_error(original: np.ndarray, sampled: np.ndarray) -> Dict[str, float]:
+        """축소 결과를 원래 시각으로 선형 보간했을 때의 위치 오차"""
+        if original.shape[0] == 0 or sampled.shape[0] == 0:
+            return {"rmse": 0.0, "max_error": 0.0}
+        t = original[:, 2]
+        x = np.interp(t, sampled[:, 2], sampled[:, 0])
+        y = np.interp(t, sampled[:, 2], sampled[:, 1])
+        error = np.hypot(x - original[:, 0], y - original[:, 1])
+        return {
+            "rmse": float(np.sqrt(np.mean(error ** 2))),
+            "max_error": float(error.max())
+        }
@@ -1,41 +1,218 @@
 # app/utils/tracking.py 생성
-from typing import List, Dict, Any
+from functools import lru_cache
+from typing import List, Dict, Any, Tuple
 import numpy as np
 from app.schemas.tracking import GazePoint
 
+FIXATION_METHODS = ("distance", "dispersion")
+
+# 도약 분석 기준 (정규화 좌표)
+LINE_CHANGE_THRESHOLD = 0.1  # 이 이상 y가 변하면 줄 이동으로 판단
+REGRESSION_MIN_DISTANCE = 0.01  # 이보다 작은 왼쪽 이동은 흔들림으로 무시
+
+# 세션 저장 시 미리 계산하는 히트맵 피라미드 해상도 (가장 큰 값이 나머지의 배수여야 함)
+HEATMAP_PYRAMID_LEVELS = (8, 16, 32, 64)
+
+# 바이너리 시선 프레임 레코드 형식 (리틀 엔디언, 포인트당 20바이트)
+GAZE_FRAME_DTYPE = np.dtype([
+    ("x", "<f4"),
+    ("y", "<f4"),
+    ("timestamp", "<f8"),
+    ("confidence", "<f4")
+])
+
 class TrackingUtils:
     @staticmethod
-    def calculate_fixations(gaze_points: List[GazePoint], threshold: float = 0.1) -> List[Dict[str, Any]]:
+    def to_arrays(gaze_points: List[GazePoint]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """GazePoint 리스트를 x/y/timestamp 배열로 한 번에 변환"""
+        n = len(gaze_points)
+        coords = np.fromiter(
+            (v for p in gaze_points for v in (p.x, p.y, p.timestamp)),
+            dtype=np.float64,
+            count=3 * n
+        ).reshape(n, 3)
+        x, y, t = np.ascontiguousarray(coords.T)
+        return x, y, t
+
+    @staticmethod
+    def to_rows(gaze_points: List[GazePoint]) -> np.ndarray:
+        """GazePoint 리스트를 (n, 4) 배열로 변환 (x, y, timestamp, confidence)"""
+        n = len(gaze_points)
+        return np.fromiter(
+            (
+                v for p in gaze_points
+                for v in (p.x, p.y, p.timestamp, np.nan if p.confidence is None else p.confidence)
+            ),
+            dtype=np.float64,
+            count=4 * n
+        ).reshape(n, 4)
+
+    @staticmethod
+    def decode_gaze_frame(frame: bytes) -> np.ndarray:
+        """바이너리 시선 프레임을 (n, 4) 배열로 변환 (confidence가 없으면 NaN)"""
+        if len(frame) % GAZE_FRAME_DTYPE.itemsize:
+            raise ValueError(f"Frame size must be a multiple of {GAZE_FRAME_DTYPE.itemsize} bytes")
+        records = np.frombuffer(frame, dtype=GAZE_FRAME_DTYPE)
+
+        rows = np.empty((records.size, 4), dtype=np.float64)
+        rows[:, 0] = records["x"]
+        rows[:, 1] = records["y"]
+        rows[:, 2] = records["timestamp"]
+        rows[:, 3] = records["confidence"]
+
+        coords = rows[:, :2]
+        if not np.all((coords >= 0) & (coords <= 1)):
+            raise ValueError("Coordinate must be between 0 and 1")
+        if not np.all(np.isfinite(rows[:, 2])):
+            raise ValueError("Timestamp must be finite")
+        return rows
+
+    @staticmethod
+    def calculate_fixations(
+        gaze_points: List[GazePoint],
+        threshold: float = 0.1,
+        method: str = "distance",
+        min_points: int = 3
+    ) -> List[Dict[str, Any]]:
         """시선 고정점 계산"""
-        fixations = []
-        current_points = []
-        
-        for point in gaze_points:
-            if not current_points:
-                current_points.append(point)
+        if not gaze_points:
+            return []
+        x, y, t = TrackingUtils.to_arrays(gaze_points)
+        columns = TrackingUtils.detect_fixations(x, y, t, threshold, method, min_points)
+        return TrackingUtils.fixations_to_list(columns)
+
+    @staticmethod
+    def detect_fixations(
+        x: np.ndarray,
+        y: np.ndarray,
+        t: np.ndarray,
+        threshold: float = 0.1,
+        method: str = "distance",
+        min_points: int = 3
+    ) -> Dict[str, np.ndarray]:
+        """배열 기반 시선 고정점 검출 (열 단위 결과 반환)
+
+        - distance: 연속 포인트 간 거리가 threshold 이상이면 구간을 나눔 (I-VT 방식)
+        - dispersion: 윈도우의 (x 범위 + y 범위)가 threshold 이하인 구간을 고정으로 판단 (I-DT 방식)
+        """
+        if method == "distance":
+            starts, ends = TrackingUtils._distance_segments(x, y, threshold)
+        elif method == "dispersion":
+            starts, ends = TrackingUtils._dispersion_segments(x, y, threshold, min_points)
+        else:
+            raise ValueError(f"Unknown fixation method: {method}. Must be one of {list(FIXATION_METHODS)}")
+
+        counts = ends - starts
+        keep = counts >= min_points
+        starts, ends, counts = starts[keep], ends[keep], counts[keep]
+
+        if starts.size == 0:
+            return TrackingUtils._empty_fixations()
+
+        return {
+            "x": TrackingUtils._segment_sums(x, starts, ends) / counts,
+            "y": TrackingUtils._segment_sums(y, starts, ends) / counts,
+            "duration": t[ends - 1] - t[starts],
+            "points_count": counts
+        }
+
+    @staticmethod
+    def _distance_segments(x: np.ndarray, y: np.ndarray, threshold: float) -> Tuple[np.ndarray, np.ndarray]:
+        """연속 거리 기준 구간 분할 (구간 시작/끝 인덱스)"""
+        n = x.size
+        if n < 2:
+            return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+
+        dx = np.diff(x)
+        dy = np.diff(y)
+        distance = np.sqrt(dx ** 2 + dy ** 2)
+
+        # 거리가 임계값 이상인 지점에서 새 구간 시작
+        boundaries = np.flatnonzero(distance >= threshold) + 1
+        starts = np.concatenate(([0], boundaries))
+        ends = np.concatenate((boundaries, [n]))
+
+        # 마지막 구간은 아직 종료되지 않았으므로 제외 (기존 동작과 동일)
+        return starts[:-1], ends[:-1]
+
+    @staticmethod
+    def _dispersion_segments(
+        x: np.ndarray,
+        y: np.ndarray,
+        threshold: float,
+        min_points: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """분산 기준 구간 분할 (I-DT)"""
+        n = x.size
+        starts: List[int] = []
+        ends: List[int] = []
+        i = 0
+
+        while i + min_points <= n:
+            # 최소 윈도우의 분산 확인
+            j = i + min_points
+            dispersion = np.ptp(x[i:j]) + np.ptp(y[i:j])
+            if dispersion > threshold:
+                i += 1
                 continue
-                
-            # 이전 포인트와의 거리 계산
-            prev_point = current_points[-1]
-            distance = np.sqrt(
-                (point.x - prev_point.x) ** 2 + 
-                (point.y - prev_point.y) ** 2
+
+            # 누적 최대/최소로 윈도우 확장 지점 탐색 (청크 크기를 두 배씩 늘림)
+            end = n
+            chunk = 64
+            while True:
+                stop = min(n, i + chunk)
+                wx = x[i:stop]
+                wy = y[i:stop]
+                spread = (
+                    np.maximum.accumulate(wx) - np.minimum.accumulate(wx) +
+                    np.maximum.accumulate(wy) - np.minimum.accumulate(wy)
+                )
+                exceeded = np.flatnonzero(spread > threshold)
+                if exceeded.size:
+                    end = i + int(exceeded[0])
+                    break
+                if stop == n:
+                    break
+                chunk *= 2
+
+            starts.append(i)
+            ends.append(end)
+            i = end
+
+        return np.asarray(starts, dtype=np.intp), np.asarray(ends, dtype=np.intp)
+
+    @staticmethod
+    def _segment_sums(values: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+        """[start, end) 구간별 합계"""
+        indices = np.empty(starts.size * 2, dtype=np.intp)
+        indices[0::2] = starts
+        indices[1::2] = ends
+        # end가 배열 길이와 같을 수 있으므로 끝에 0을 덧붙임
+        padded = np.append(values, 0.0)
+        return np.add.reduceat(padded, indices)[0::2]
+
+    @staticmethod
+    def _empty_fixations() -> Dict[str, np.ndarray]:
+        """빈 고정점 결과"""
+        return {
+            "x": np.empty(0),
+            "y": np.empty(0),
+            "duration": np.empty(0),
+            "points_count": np.empty(0, dtype=np.intp)
+        }
+
+    @staticmethod
+    def fixations_to_list(columns: Dict[str, np.ndarray]) -> List[Dict[str, Any]]:
+        """열 단위 고정점을 기존 딕셔너리 리스트 형식으로 변환"""
+        return [
+            {"x": x, "y": y, "duration": duration, "points_count": count}
+            for x, y, duration, count in zip(
+                columns["x"].tolist(),
+                columns["y"].tolist(),
+                columns["duration"].tolist(),
+                columns["points_count"].tolist()
             )
-            
-            if distance < threshold:
-                current_points.append(point)
-            else:
-                if len(current_points) > 2:  # 최소 고정 포인트 수
-                    fixation = {
-                        "x": np.mean([p.x for p in current_points]),
-                        "y": np.mean([p.y for p in current_points]),
-                        "duration": current_points[-1].timestamp - current_points[0].timestamp,
-                        "points_count": len(current_points)
-                    }
-                    fixations.append(fixation)
-                current_points = [point]
-                
-        return fixations
+        ]
 
     @staticmethod
     def detect_reading_pattern(fixations: List[Dict[str, Any]]) -> str:
@@ -49,14 +226,19 @@ class TrackingUtils:
             y_change = fixations[i]["y"] - fixations[i-1]["y"]
             y_changes.append(y_change)
             
+        vertical_changes = sum(abs(y) > LINE_CHANGE_THRESHOLD for y in y_changes)
+        return TrackingUtils.classify_reading_pattern(vertical_changes, len(y_changes))
+
+    @staticmethod
+    def classify_reading_pattern(vertical_changes: int, transitions: int) -> str:
+        """고정점 간 이동 수와 그중 줄 이동 수로 읽기 패턴 분류 (누적 값으로 계산할 때 사용)"""
         # 패턴 분석
-        if len(y_changes) < 3:
+        if transitions < 3:
             return "insufficient_data"
             
-        vertical_changes = sum(abs(y) > 0.1 for y in y_changes)
-        if vertical_changes / len(y_changes) < 0.2:
+        if vertical_changes / transitions < 0.2:
             return "linear"
-        elif vertical_changes / len(y_changes) > 0.5:
+        elif vertical_changes / transitions > 0.5:
             return "scattered"
         else:
             return "mixed"
@@ -65,26 +247,391 @@ class TrackingUtils:
     def calculate_reading_metrics(fixations: List[Dict[str, Any]], total_time: float) -> Dict[str, Any]:
         """읽기 관련 지표 계산"""
         total_fixation_time = sum(f["duration"] for f in fixations)
+        count = len(fixations)
+        x = np.fromiter((f["x"] for f in fixations), dtype=np.float64, count=count)
+        y = np.fromiter((f["y"] for f in fixations), dtype=np.float64, count=count)
         
         return {
             "total_time": total_time,
             "fixation_count": len(fixations),
             "average_fixation_duration": total_fixation_time / len(fixations) if fixations else 0,
-            "attention_score": total_fixation_time / total_time if total_time > 0 else 0
+            "attention_score": total_fixation_time / total_time if total_time > 0 else 0,
+            **TrackingUtils.saccade_metrics(x, y)
+        }
+
+    @staticmethod
+    def detect_saccades(
+        x: np.ndarray,
+        y: np.ndarray,
+        line_threshold: float = LINE_CHANGE_THRESHOLD,
+        regression_threshold: float = REGRESSION_MIN_DISTANCE
+    ) -> Dict[str, np.ndarray]:
+        """연속 고정점 사이의 도약(saccade) 분석 (열 단위 결과)
+
+        - amplitude: 도약 거리, direction: 진행 방향 각도(도, +x 기준)
+        - regression: 같은 줄 안에서 왼쪽(이전 단어)으로 돌아간 도약
+        - line_return: 다음 줄의 시작으로 내려간 도약 (y 증가 + x 감소)
+        """
+        dx = np.diff(x)
+        dy = np.diff(y)
+        same_line = np.abs(dy) < line_threshold
+        return {
+            "amplitude": np.hypot(dx, dy),
+            "direction": np.degrees(np.arctan2(dy, dx)),
+            "regression": same_line & (dx <= -regression_threshold),
+            "line_return": (dy >= line_threshold) & (dx < 0)
+        }
+
+    @staticmethod
+    def saccade_metrics(x: np.ndarray, y: np.ndarray) -> Dict[str, Any]:
+        """도약/역행 지표 (ReadingMetrics의 saccade_count, regression_count 포함)"""
+        saccades = TrackingUtils.detect_saccades(x, y)
+        count = saccades["amplitude"].size
+        regression_count = int(np.count_nonzero(saccades["regression"]))
+        return {
+            "saccade_count": count,
+            "regression_count": regression_count,
+            "line_return_count": int(np.count_nonzero(saccades["line_return"])),
+            "regression_rate": regression_count / count if count else 0,
+            "average_saccade_amplitude": float(saccades["amplitude"].mean()) if count else 0
         }
 
     @staticmethod
-    def generate_heatmap(fixations: List[Dict[str, Any]], resolution: int = 20) -> List[List[float]]:
+    def reading_speed(metrics: Dict[str, Any]) -> float:
+        """읽기 속도 (초당 고정점 수 기준)"""
+        total_time = metrics.get("total_time", 0)
+        if total_time == 0:
+            return 0
+        return metrics.get("fixation_count", 0) / total_time
+
+    @staticmethod
+    def estimate_comprehension(metrics: Dict[str, Any]) -> float:
+        """이해도 추정 (집중도와 평균 고정 시간을 고려)"""
+        attention_score = metrics.get("attention_score", 0)
+        fixation_duration = metrics.get("average_fixation_duration", 0)
+        return min(1.0, (attention_score * 0.7 + (fixation_duration / 300) * 0.3))
+
+    @staticmethod
+    def generate_heatmap(
+        fixations: List[Dict[str, Any]],
+        resolution: int = 20,
+        sigma: float = 0.0
+    ) -> List[List[float]]:
         """시선 히트맵 생성"""
-        heatmap = np.zeros((resolution, resolution))
-        
-        for fixation in fixations:
-            x_idx = min(int(fixation["x"] * resolution), resolution - 1)
-            y_idx = min(int(fixation["y"] * resolution), resolution - 1)
-            heatmap[y_idx, x_idx] += fixation["duration"]
-            
+        count = len(fixations)
+        x = np.fromiter((f["x"] for f in fixations), dtype=np.float64, count=count)
+        y = np.fromiter((f["y"] for f in fixations), dtype=np.float64, count=count)
+        duration = np.fromiter((f["duration"] for f in fixations), dtype=np.float64, count=count)
+        return TrackingUtils.heatmap_array(x, y, duration, resolution, sigma).tolist()
+
+    @staticmethod
+    def heatmap_array(
+        x: np.ndarray,
+        y: np.ndarray,
+        duration: np.ndarray,
+        resolution: int = 20,
+        sigma: float = 0.0
+    ) -> np.ndarray:
+        """배열 기반 히트맵 생성 (고정 시간 가중, 최대값 1로 정규화)
+
+        sigma > 0이면 셀 단위 가우시안 평활화를 가로/세로 1차원 합성곱으로 적용합니다.
+        """
+        x_idx = np.clip((x * resolution).astype(np.intp), 0, resolution - 1)
+        y_idx = np.clip((y * resolution).astype(np.intp), 0, resolution - 1)
+        heatmap = np.bincount(
+            y_idx * resolution + x_idx,
+            weights=duration,
+            minlength=resolution * resolution
+        ).reshape(resolution, resolution)
+
+        if sigma > 0:
+            heatmap = TrackingUtils._gaussian_smooth(heatmap, sigma)
+
         # 정규화
-        if heatmap.max() > 0:
-            heatmap = heatmap / heatmap.max()
-            
-        return heatmap.tolist()
\ No newline at end of file
+        peak = heatmap.max() if heatmap.size else 0
+        if peak > 0:
+            heatmap = heatmap / peak
+
+        return heatmap
+
+    @staticmethod
+    def heatmap_pyramid(
+        x: np.ndarray,
+        y: np.ndarray,
+        duration: np.ndarray,
+        levels: Tuple[int, ...] = HEATMAP_PYRAMID_LEVELS
+    ) -> Dict[int, np.ndarray]:
+        """여러 해상도의 히트맵 (해상도 -> 최대값 1로 정규화된 배열, 평활화 없음)
+
+        가장 세밀한 해상도에서 한 번만 집계하고, 낮은 해상도는 바로 위 단계의 인접 셀을 합산 풀링해 만듭니다.
+        """
+        base = max(levels)
+        if any(base % level for level in levels):
+            raise ValueError(f"Heatmap pyramid levels must divide {base}: {list(levels)}")
+
+        x_idx = np.clip((x * base).astype(np.intp), 0, base - 1)
+        y_idx = np.clip((y * base).astype(np.intp), 0, base - 1)
+        sums = np.bincount(
+            y_idx * base + x_idx,
+            weights=duration,
+            minlength=base * base
+        ).reshape(base, base)
+
+        pyramid = {}
+        for level in sorted(set(levels), reverse=True):
+            factor = sums.shape[0] // level
+            if factor > 1:
+                sums = sums.reshape(level, factor, level, factor).sum(axis=(1, 3))
+            peak = sums.max()
+            pyramid[level] = sums / peak if peak > 0 else sums.copy()
+        return pyramid
+
+    @staticmethod
+    def _gaussian_smooth(heatmap: np.ndarray, sigma: float) -> np.ndarray:
+        """분리 가능한 가우시안 커널로 평활화 (경계 밖은 0)"""
+        radius = max(1, int(np.ceil(3 * sigma)))
+        offsets = np.arange(-radius, radius + 1)
+        kernel = np.exp(-0.5 * (offsets / sigma) ** 2)
+        kernel /= kernel.sum()
+
+        rows, cols = heatmap.shape
+        padded = np.pad(heatmap, radius)
+        # 가로 방향
+        horizontal = np.zeros((rows + 2 * radius, cols))
+        for i, weight in enumerate(kernel):
+            horizontal += weight * padded[:, i:i + cols]
+        # 세로 방향
+        smoothed = np.zeros((rows, cols))
+        for i, weight in enumerate(kernel):
+            smoothed += weight * horizontal[i:i + rows]
+        return smoothed
+
+    @staticmethod
+    def local_maxima(heatmap: np.ndarray, min_value: float = 0.0) -> np.ndarray:
+        """8방향 이웃 중 더 큰 값이 없는 봉우리의 평탄화 인덱스 (값 내림차순, min_value 초과만)
+
+        같은 값으로 이어진 평탄한 영역은 하나의 봉우리로 보고, 영역의 어느 셀에도 더 큰 이웃이
+        없을 때만 영역의 첫 셀(위/왼쪽) 하나를 남깁니다.
+        """
+        rows, cols = heatmap.shape
+        flat = heatmap.ravel()
+        padded = np.full((rows + 2, cols + 2), -np.inf)
+        padded[1:-1, 1:-1] = heatmap
+        neighbourhood = np.maximum.reduce([
+            padded[1 + dy:rows + 1 + dy, 1 + dx:cols + 1 + dx]
+            for dy in (-1, 0, 1) for dx in (-1, 0, 1) if dy or dx
+        ]).ravel()
+        candidate = flat > min_value
+
+        # 같은 값의 이웃 셀을 평탄한 영역으로 묶고, 더 큰 이웃이 있는 셀이 하나라도 있으면 제외
+        a, b = TrackingUtils._grid_edges(rows, cols)
+        plateau = candidate[a] & (flat[a] == flat[b])
+        parent = TrackingUtils._union_roots(flat.size, a[plateau], b[plateau])
+        blocked = np.bincount(parent, weights=neighbourhood > flat, minlength=flat.size) > 0
+        peaks = candidate & (parent == np.arange(flat.size)) & ~blocked
+
+        indices = np.flatnonzero(peaks)
+        return indices[np.argsort(-flat[indices], kind="stable")]
+
+    @staticmethod
+    def label_regions(mask: np.ndarray) -> Tuple[np.ndarray, int]:
+        """8방향으로 연결된 True 영역 번호 (영역 밖은 -1)와 영역 수"""
+        rows, cols = mask.shape
+        flat = mask.ravel()
+        a, b = TrackingUtils._grid_edges(rows, cols)
+        linked = flat[a] & flat[b]
+        parent = TrackingUtils._union_roots(mask.size, a[linked], b[linked])
+
+        # 루트 순서대로 0부터 번호 부여
+        roots = flat & (parent == np.arange(mask.size))
+        region = np.cumsum(roots) - 1
+        labels = np.where(flat, region[parent], -1)
+        return labels.reshape(rows, cols), int(region[-1] + 1) if mask.size else 0
+
+    @staticmethod
+    @lru_cache(maxsize=8)
+    def _grid_edges(rows: int, cols: int) -> Tuple[np.ndarray, np.ndarray]:
+        """격자의 8방향 인접 셀 쌍 (a < b인 평탄화 인덱스, 해상도별 캐시이므로 읽기 전용)"""
+        index = np.arange(rows * cols).reshape(rows, cols)
+        starts = (index[:, :-1], index[:-1, :], index[:-1, :-1], index[:-1, 1:])
+        steps = (1, cols, cols + 1, cols - 1)
+        a = np.concatenate([start.ravel() for start in starts])
+        b = np.concatenate([start.ravel() + step for start, step in zip(starts, steps)])
+        a.flags.writeable = False
+        b.flags.writeable = False
+        return a, b
+
+    @staticmethod
+    def _union_roots(size: int, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        """간선 (a, b)로 연결된 셀의 루트 (연결 요소에서 가장 작은 인덱스)
+
+        배열 기반 union-find: 큰 루트를 연결된 더 작은 루트에 붙이고 경로를 압축하는 과정을 반복합니다.
+        """
+        parent = np.arange(size)
+        while a.size:
+            root_a, root_b = parent[a], parent[b]
+            pending = root_a != root_b
+            if not pending.any():
+                break
+            # 이미 합쳐진 간선은 다시 보지 않음
+            a, b = a[pending], b[pending]
+            root_a, root_b = root_a[pending], root_b[pending]
+            # 같은 루트가 여러 번 나오면 그중 하나만 반영되지만, 모두 연결된 더 작은 루트이므로
+            # 남은 간선은 다음 반복에서 합쳐지고 최종 루트는 항상 가장 작은 인덱스
+            parent[np.maximum(root_a, root_b)] = np.minimum(root_a, root_b)
+            while True:
+                grandparent = parent[parent]
+                if np.array_equal(grandparent, parent):
+                    break
+                parent = grandparent
+        return parent
+
+    @staticmethod
+    def sparse_heatmap(heatmap: Any) -> Dict[str, Any]:
+        """0이 아닌 셀만 (평탄화 인덱스, 값) 형태로 변환"""
+        heatmap_array = np.asarray(heatmap, dtype=np.float64)
+        flat = heatmap_array.ravel()
+        indices = np.flatnonzero(flat)
+        return {
+            "resolution": heatmap_array.shape[0] if heatmap_array.ndim == 2 else 0,
+            "indices": indices.tolist(),
+            "values": flat[indices].tolist()
+        }
+
+    @staticmethod
+    def dense_heatmap(sparse: Dict[str, Any]) -> np.ndarray:
+        """희소 히트맵을 2차원 배열로 복원"""
+        resolution = sparse["resolution"]
+        heatmap = np.zeros(resolution * resolution)
+        heatmap[np.asarray(sparse["indices"], dtype=np.intp)] = sparse["values"]
+        return heatmap.reshape(resolution, resolution)
+
+class IncrementalFixationDetector:
+    """청크 단위로 이어지는 시선 데이터의 고정점 검출기 (distance 방식)
+
+    열린 고정점 구간의 합계와 마지막 포인트를 유지하므로 청크 경계에 걸친 고정점도
+    끊기지 않으며, 종료된 고정점만 반환합니다. 세션 전체를 한 번에 calculate_fixations로
+    처리한 결과와 같습니다.
+    """
+
+    def __init__(self, threshold: float = 0.1, min_points: int = 3):
+        self.threshold = threshold
+        self.min_points = min_points
+        self.points_seen = 0
+        self.first_timestamp = 0.0
+        self.last_timestamp = 0.0
+        # 열린 구간 상태
+        self._open_count = 0
+        self._open_sum_x = 0.0
+        self._open_sum_y = 0.0
+        self._open_start_t = 0.0
+        self._open_end_t = 0.0
+        self._last_x = 0.0
+        self._last_y = 0.0
+        # 종료된 고정점 (청크별 열 단위 결과)
+        self._finalized: List[Dict[str, np.ndarray]] = []
+
+    def update(self, x: np.ndarray, y: np.ndarray, t: np.ndarray) -> Dict[str, np.ndarray]:
+        """청크를 처리하고 이번에 종료된 고정점만 반환"""
+        n = x.size
+        if n == 0:
+            return TrackingUtils._empty_fixations()
+
+        if self.points_seen == 0:
+            self.first_timestamp = float(t[0])
+        self.points_seen += n
+        self.last_timestamp = float(t[-1])
+
+        # 새 구간이 시작되는 청크 내 인덱스
+        distance = np.sqrt(np.diff(x) ** 2 + np.diff(y) ** 2)
+        starts = np.flatnonzero(distance >= self.threshold) + 1
+        has_open = self._open_count > 0
+        if not has_open or np.hypot(x[0] - self._last_x, y[0] - self._last_y) >= self.threshold:
+            starts = np.concatenate(([0], starts))
+
+        xs: List[np.ndarray] = []
+        ys: List[np.ndarray] = []
+        durations: List[np.ndarray] = []
+        counts: List[np.ndarray] = []
+
+        if starts.size == 0:
+            # 청크 전체가 열린 구간에 이어짐
+            self._extend_open(x, y, n)
+        else:
+            first = int(starts[0])
+            if has_open:
+                # 열린 구간을 청크 앞부분과 합쳐서 종료
+                self._extend_open(x[:first], y[:first], first)
+                end_t = t[first - 1] if first > 0 else self._open_end_t
+                xs.append(np.array([self._open_sum_x / self._open_count]))
+                ys.append(np.array([self._open_sum_y / self._open_count]))
+                durations.append(np.array([end_t - self._open_start_t]))
+                counts.append(np.array([self._open_count], dtype=np.intp))
+
+            # 청크 안에서 닫힌 구간
+            seg_starts, seg_ends = starts[:-1], starts[1:]
+            if seg_starts.size:
+                seg_counts = seg_ends - seg_starts
+                xs.append(TrackingUtils._segment_sums(x, seg_starts, seg_ends) / seg_counts)
+                ys.append(TrackingUtils._segment_sums(y, seg_starts, seg_ends) / seg_counts)
+                durations.append(t[seg_ends - 1] - t[seg_starts])
+                counts.append(seg_counts)
+
+            # 마지막 구간은 열린 상태로 유지
+            last = int(starts[-1])
+            self._open_count = 0
+            self._open_sum_x = 0.0
+            self._open_sum_y = 0.0
+            self._open_start_t = float(t[last])
+            self._extend_open(x[last:], y[last:], n - last)
+
+        self._last_x = float(x[-1])
+        self._last_y = float(y[-1])
+        self._open_end_t = float(t[-1])
+
+        if not counts:
+            return TrackingUtils._empty_fixations()
+
+        count_array = np.concatenate(counts)
+        keep = count_array >= self.min_points
+        fixations = {
+            "x": np.concatenate(xs)[keep],
+            "y": np.concatenate(ys)[keep],
+            "duration": np.concatenate(durations)[keep],
+            "points_count": count_array[keep]
+        }
+        if fixations["points_count"].size:
+            self._finalized.append(fixations)
+        return fixations
+
+    def checkpoint(self) -> Dict[str, Any]:
+        """현재 검출 상태 스냅샷 (update 이후 처리가 실패하면 restore로 되돌림)"""
+        state = dict(vars(self))
+        state["_finalized"] = list(self._finalized)
+        return state
+
+    def restore(self, state: Dict[str, Any]) -> None:
+        """checkpoint 시점의 상태로 복원"""
+        vars(self).update(state)
+        self._finalized = list(state["_finalized"])
+
+    def fixations(self) -> Dict[str, np.ndarray]:
+        """지금까지 종료된 전체 고정점 (열린 구간 제외)"""
+        if not self._finalized:
+            return TrackingUtils._empty_fixations()
+        if len(self._finalized) > 1:
+            self._finalized = [{
+                key: np.concatenate([chunk[key] for chunk in self._finalized])
+                for key in self._finalized[0]
+            }]
+        return self._finalized[0]
+
+    @property
+    def total_time(self) -> float:
+        return self.last_timestamp - self.first_timestamp
+
+    def _extend_open(self, x: np.ndarray, y: np.ndarray, count: int) -> None:
+        if count:
+            self._open_sum_x += float(x.sum())
+            self._open_sum_y += float(y.sum())
+            self._open_count += count
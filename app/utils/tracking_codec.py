@@ -0,0 +1,153 @@
+# app/utils/tracking_codec.py
+import struct
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+
+# 헤더: magic, version, (패딩), 히트맵 해상도, 고정점 개수, 히트맵 스케일
+HEADER = struct.Struct("<4sBxHIf")
+MAGIC = b"GZTD"
+VERSION = 2
+SUPPORTED_VERSIONS = (1, 2)  # 1: 피라미드 없음
+
+# 히트맵 피라미드 (버전 2): 단계 수, 단계마다 (해상도, (패딩), 스케일) + 양자화 히트맵
+PYRAMID_HEADER = struct.Struct("<I")
+PYRAMID_LEVEL = struct.Struct("<Hxxf")
+
+# 고정점 열 순서와 자료형 (모두 4바이트 정렬)
+FIXATION_COLUMNS = (
+    ("x", np.dtype("<f4")),
+    ("y", np.dtype("<f4")),
+    ("duration", np.dtype("<f4")),
+    ("points_count", np.dtype("<u4"))
+)
+HEATMAP_DTYPE = np.dtype("<u2")
+HEATMAP_LEVELS = np.iinfo(HEATMAP_DTYPE).max
+
+# 바이너리로 옮겨 저장하는 tracking_data 키
+BINARY_KEYS = ("fixations", "heatmap", "heatmap_pyramid")
+
+
+class TrackingCodec:
+    """고정점/히트맵 압축 바이너리 인코딩 (float32 고정점 열 + uint16 양자화 히트맵)"""
+
+    @staticmethod
+    def encode(
+        fixations: List[Dict[str, Any]],
+        heatmap: List[List[float]],
+        pyramid: Optional[Dict[Any, Any]] = None
+    ) -> bytes:
+        """고정점 딕셔너리 리스트와 히트맵(및 해상도별 히트맵 피라미드)을 바이너리로 변환"""
+        resolution, scale, quantized = TrackingCodec._quantize(heatmap)
+
+        parts = [HEADER.pack(MAGIC, VERSION, resolution, len(fixations), scale)]
+        for name, dtype in FIXATION_COLUMNS:
+            column = np.fromiter((f[name] for f in fixations), dtype=np.float64, count=len(fixations))
+            parts.append(column.astype(dtype).tobytes())
+        parts.append(quantized)
+
+        levels = sorted((int(level), level_map) for level, level_map in (pyramid or {}).items())
+        parts.append(PYRAMID_HEADER.pack(len(levels)))
+        for _, level_map in levels:
+            level_resolution, level_scale, level_quantized = TrackingCodec._quantize(level_map)
+            parts.append(PYRAMID_LEVEL.pack(level_resolution, level_scale))
+            parts.append(level_quantized)
+        return b"".join(parts)
+
+    @staticmethod
+    def decode(blob: bytes) -> Dict[str, Any]:
+        """바이너리를 NumPy 배열로 변환 (고정점 열은 복사 없이 버퍼를 참조, 피라미드는 해상도 -> 배열)"""
+        magic, version, resolution, count, scale = HEADER.unpack_from(blob, 0)
+        if magic != MAGIC:
+            raise ValueError("Invalid tracking data encoding")
+        if version not in SUPPORTED_VERSIONS:
+            raise ValueError(f"Unsupported tracking data version: {version}")
+
+        result: Dict[str, Any] = {}
+        offset = HEADER.size
+        for name, dtype in FIXATION_COLUMNS:
+            result[name] = np.frombuffer(blob, dtype=dtype, count=count, offset=offset)
+            offset += dtype.itemsize * count
+
+        result["heatmap"], offset = TrackingCodec._dequantize(blob, offset, resolution, scale)
+
+        pyramid: Dict[int, np.ndarray] = {}
+        if version >= 2:
+            (levels,) = PYRAMID_HEADER.unpack_from(blob, offset)
+            offset += PYRAMID_HEADER.size
+            for _ in range(levels):
+                level_resolution, level_scale = PYRAMID_LEVEL.unpack_from(blob, offset)
+                pyramid[level_resolution], offset = TrackingCodec._dequantize(
+                    blob, offset + PYRAMID_LEVEL.size, level_resolution, level_scale
+                )
+        result["pyramid"] = pyramid
+        return result
+
+    @staticmethod
+    def _quantize(heatmap: Any) -> Tuple[int, float, bytes]:
+        """최대값 기준 uint16 양자화 (해상도, 스케일, 바이트)"""
+        heatmap_array = np.asarray(heatmap, dtype=np.float64)
+        resolution = heatmap_array.shape[0] if heatmap_array.size else 0
+
+        peak = float(heatmap_array.max()) if heatmap_array.size else 0.0
+        scale = peak / HEATMAP_LEVELS if peak > 0 else 0.0
+        quantized = (
+            np.rint(heatmap_array / scale) if scale > 0 else np.zeros_like(heatmap_array)
+        ).astype(HEATMAP_DTYPE)
+        return resolution, scale, quantized.tobytes()
+
+    @staticmethod
+    def _dequantize(blob: bytes, offset: int, resolution: int, scale: float) -> Tuple[np.ndarray, int]:
+        """양자화 히트맵 복원 (배열, 다음 오프셋)"""
+        size = resolution * resolution
+        quantized = np.frombuffer(blob, dtype=HEATMAP_DTYPE, count=size, offset=offset)
+        return quantized.reshape(resolution, resolution) * np.float32(scale), offset + HEATMAP_DTYPE.itemsize * size
+
+    @staticmethod
+    def pack(tracking_data: Dict[str, Any]) -> Dict[str, Any]:
+        """저장용으로 분리 (JSON에는 나머지 필드와 인코딩 버전만 남김)"""
+        stored = {k: v for k, v in tracking_data.items() if k not in BINARY_KEYS}
+        stored["encoding"] = VERSION
+        return stored
+
+    @staticmethod
+    def read_fixations(tracking_data: Dict[str, Any], blob: Optional[bytes]) -> Dict[str, np.ndarray]:
+        """저장 형식과 관계없이 고정점을 열 단위 배열로 조회"""
+        if blob is not None:
+            decoded = TrackingCodec.decode(blob)
+            return {name: decoded[name] for name, _ in FIXATION_COLUMNS}
+
+        fixations = tracking_data.get("fixations", [])
+        return {
+            name: np.fromiter((f[name] for f in fixations), dtype=dtype, count=len(fixations))
+            for name, dtype in FIXATION_COLUMNS
+        }
+
+    @staticmethod
+    def read_heatmap(tracking_data: Dict[str, Any], blob: Optional[bytes]) -> np.ndarray:
+        """저장 형식과 관계없이 히트맵을 배열로 조회"""
+        if blob is not None:
+            return TrackingCodec.decode(blob)["heatmap"]
+        return np.asarray(tracking_data.get("heatmap", []), dtype=np.float32)
+
+    @staticmethod
+    def read_pyramid(tracking_data: Dict[str, Any], blob: Optional[bytes]) -> Dict[int, np.ndarray]:
+        """저장 형식과 관계없이 히트맵 피라미드를 해상도 -> 배열로 조회 (피라미드 이전 행은 빈 딕셔너리)"""
+        if blob is not None:
+            return TrackingCodec.decode(blob)["pyramid"]
+        return {
+            int(level): np.asarray(level_map, dtype=np.float32)
+            for level, level_map in (tracking_data.get("heatmap_pyramid") or {}).items()
+        }
+
+    @staticmethod
+    def read_heatmaps(tracking_data: Dict[str, Any], blob: Optional[bytes]) -> Dict[int, np.ndarray]:
+        """기본 히트맵과 피라미드를 한 번에 해상도 -> 배열로 조회 (해상도가 겹치면 피라미드 단계 사용)"""
+        if blob is not None:
+            decoded = TrackingCodec.decode(blob)
+            heatmaps, heatmap = decoded["pyramid"], decoded["heatmap"]
+        else:
+            heatmaps = TrackingCodec.read_pyramid(tracking_data, None)
+            heatmap = TrackingCodec.read_heatmap(tracking_data, None)
+        if heatmap.ndim == 2 and heatmap.size:
+            heatmaps.setdefault(heatmap.shape[0], heatmap)
+        return heatmaps
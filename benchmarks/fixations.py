@@ -0,0 +1,102 @@
+# benchmarks/fixations.py
+"""시선 고정점 검출 벤치마크
+
+기존 파이썬 루프 구현과 NumPy 열 단위 구현의 속도를 비교합니다.
+
+    python -m benchmarks.fixations --points 100000
+"""
+import argparse
+import time
+from typing import List, Dict, Any
+import numpy as np
+from app.schemas.tracking import GazePoint
+from app.utils.tracking import TrackingUtils
+
+
+def legacy_calculate_fixations(gaze_points: List[GazePoint], threshold: float = 0.1) -> List[Dict[str, Any]]:
+    """기존 루프 기반 구현 (비교 기준)"""
+    fixations = []
+    current_points = []
+
+    for point in gaze_points:
+        if not current_points:
+            current_points.append(point)
+            continue
+
+        prev_point = current_points[-1]
+        distance = np.sqrt(
+            (point.x - prev_point.x) ** 2 +
+            (point.y - prev_point.y) ** 2
+        )
+
+        if distance < threshold:
+            current_points.append(point)
+        else:
+            if len(current_points) > 2:
+                fixations.append({
+                    "x": np.mean([p.x for p in current_points]),
+                    "y": np.mean([p.y for p in current_points]),
+                    "duration": current_points[-1].timestamp - current_points[0].timestamp,
+                    "points_count": len(current_points)
+                })
+            current_points = [point]
+
+    return fixations
+
+
+def generate_points(count: int, hz: float = 120.0, seed: int = 0) -> List[GazePoint]:
+    """고정-도약이 반복되는 합성 시선 데이터 생성"""
+    rng = np.random.default_rng(seed)
+    dwell = rng.integers(5, 40, size=count // 5 + 1)
+    centers = rng.uniform(0.05, 0.95, size=(dwell.size, 2))
+    labels = np.repeat(np.arange(dwell.size), dwell)[:count]
+    xy = np.clip(centers[labels] + rng.normal(0, 0.01, size=(labels.size, 2)), 0, 1)
+    timestamps = np.arange(labels.size) * (1000.0 / hz)
+    return [
+        GazePoint(x=x, y=y, timestamp=t)
+        for (x, y), t in zip(xy.tolist(), timestamps.tolist())
+    ]
+
+
+def _best_of(func, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Fixation detection benchmark")
+    parser.add_argument("--points", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    points = generate_points(args.points)
+
+    legacy = legacy_calculate_fixations(points)
+    vectorized = TrackingUtils.calculate_fixations(points)
+    assert len(legacy) == len(vectorized)
+    for old, new in zip(legacy, vectorized):
+        assert old.keys() == new.keys()
+        assert old["points_count"] == new["points_count"]
+        assert old["duration"] == new["duration"]
+        assert np.isclose(old["x"], new["x"], rtol=0, atol=1e-12)
+        assert np.isclose(old["y"], new["y"], rtol=0, atol=1e-12)
+
+    x, y, t = TrackingUtils.to_arrays(points)
+    legacy_time = _best_of(lambda: legacy_calculate_fixations(points), args.repeat)
+    list_time = _best_of(lambda: TrackingUtils.calculate_fixations(points), args.repeat)
+    array_time = _best_of(lambda: TrackingUtils.detect_fixations(x, y, t), args.repeat)
+    dispersion_time = _best_of(lambda: TrackingUtils.detect_fixations(x, y, t, method="dispersion"), args.repeat)
+
+    print(f"points: {len(points)}, fixations: {len(vectorized)}")
+    print(f"legacy loop            : {legacy_time * 1000:9.2f} ms")
+    print(f"vectorized (GazePoint) : {list_time * 1000:9.2f} ms  ({legacy_time / list_time:6.1f}x)")
+    print(f"vectorized (arrays)    : {array_time * 1000:9.2f} ms  ({legacy_time / array_time:6.1f}x)")
+    print(f"dispersion (arrays)    : {dispersion_time * 1000:9.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,243 @@
+# benchmarks/suite.py
+"""트래킹 처리 벤치마크 모음
+
+합성 읽기 세션(benchmarks.workload)으로 고정점 검출, 히트맵 생성, 세션 저장,
+분석 조회의 처리량과 최대 메모리를 측정하고 저장된 기준값과 비교합니다.
+기준값보다 처리량이 tolerance 이상 낮거나 메모리가 tolerance 이상 많으면 실패(종료 코드 1)합니다.
+기준값은 측정한 장비에 따라 다르므로 장비를 바꾸면 --update-baselines로 다시 기록합니다.
+저장소의 baselines.json은 개발 장비에서 측정한 값이므로, CI에서는 CI 장비에서 먼저
+--update-baselines로 기록한 기준값(--baselines로 경로 지정)과 비교해야 합니다.
+
+    python -m benchmarks.suite
+    python -m benchmarks.suite --update-baselines
+"""
+import argparse
+import asyncio
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Tuple
+from app.core.config import settings
+from app.utils.tracking import TrackingUtils
+from benchmarks.workload import PATTERNS, generate_session, page_info, to_gaze_points
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baselines.json")
+
+USER_ID, STORY_ID, PAGE_ID = 1, 1, 1
+
+# (이름, 처리량 단위, 준비 함수) - 준비 함수는 (측정할 함수, 한 번에 처리하는 양) 반환
+Case = Tuple[str, str, Callable[[argparse.Namespace], Tuple[Callable[[], Any], int]]]
+
+
+def _sessions(args: argparse.Namespace) -> List[Any]:
+    return [
+        generate_session(args.duration, args.hz, pattern, seed=seed)
+        for seed, pattern in enumerate(PATTERNS)
+    ]
+
+
+def _fixation_case(args: argparse.Namespace) -> Tuple[Callable[[], Any], int]:
+    sessions = _sessions(args)
+
+    def run() -> None:
+        for rows in sessions:
+            TrackingUtils.detect_fixations(rows[:, 0], rows[:, 1], rows[:, 2])
+
+    return run, sum(rows.shape[0] for rows in sessions)
+
+
+def _heatmap_case(args: argparse.Namespace) -> Tuple[Callable[[], Any], int]:
+    fixations = [
+        TrackingUtils.detect_fixations(rows[:, 0], rows[:, 1], rows[:, 2])
+        for rows in _sessions(args)
+    ]
+
+    def run() -> None:
+        for columns in fixations:
+            TrackingUtils.heatmap_array(
+                columns["x"],
+                columns["y"],
+                columns["duration"],
+                resolution=settings.TRACKING_HEATMAP_RESOLUTION,
+                sigma=settings.TRACKING_HEATMAP_SIGMA
+            )
+
+    return run, sum(columns["x"].size for columns in fixations)
+
+
+def _database():
+    """벤치마크 전용 메모리 SQLite 세션"""
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from sqlalchemy.pool import StaticPool
+    from app.db.base import Base
+    import app.models  # noqa: F401 - 모든 테이블 등록
+
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    return sessionmaker(bind=engine, autoflush=False)()
+
+
+def _save_case(args: argparse.Namespace) -> Tuple[Callable[[], Any], int]:
+    from app.schemas.tracking import TrackingData
+    from app.services.tracking.collector import TrackingCollector
+
+    # 요청 세션에서 바로 저장하도록 설정 (지연 저장 큐는 실제 데이터베이스를 사용)
+    settings.TRACKING_WRITE_BEHIND = False
+    db = _database()
+    requests = [
+        TrackingData(
+            story_id=STORY_ID,
+            page_id=PAGE_ID,
+            session_id=f"bench-{i}",
+            gaze_points=to_gaze_points(rows),
+            page_info=page_info()
+        )
+        for i, rows in enumerate(_sessions(args))
+    ]
+
+    async def save_all() -> None:
+        for tracking_data in requests:
+            await TrackingCollector(db).save_session_data(USER_ID, tracking_data)
+
+    return lambda: asyncio.run(save_all()), len(requests)
+
+
+def _analytics_case(args: argparse.Namespace) -> Tuple[Callable[[], Any], int]:
+    from app.services.analytics_cache import analytics_cache
+    from app.services.tracking.analyzer import TrackingAnalyzer
+    from app.services.tracking.collector import TrackingCollector
+
+    settings.TRACKING_WRITE_BEHIND = False
+    db = _database()
+    collector = TrackingCollector(db)
+    sessions = _sessions(args)
+    for i in range(args.stored_sessions):
+        rows = sessions[i % len(sessions)]
+        fixations = TrackingUtils.fixations_to_list(
+            TrackingUtils.detect_fixations(rows[:, 0], rows[:, 1], rows[:, 2])
+        )
+        row = collector.build_row(USER_ID, STORY_ID, PAGE_ID, {
+            "session_id": f"bench-{i}",
+            "fixations": fixations,
+            "pattern": TrackingUtils.detect_reading_pattern(fixations),
+            "metrics": TrackingUtils.calculate_reading_metrics(fixations, float(rows[-1, 2] - rows[0, 2])),
+            "heatmap": TrackingUtils.generate_heatmap(fixations)
+        })
+        collector.insert_row(row)
+    analyzer = TrackingAnalyzer(db)
+
+    async def analyze() -> None:
+        for granularity in ("day", "session"):
+            # 캐시가 아닌 계산 시간을 측정
+            analytics_cache.invalidate(USER_ID, STORY_ID)
+            await analyzer.analyze_user_progress(USER_ID, STORY_ID, granularity=granularity)
+
+    return lambda: asyncio.run(analyze()), args.stored_sessions
+
+
+CASES: List[Case] = [
+    ("fixation_detection", "points/s", _fixation_case),
+    ("heatmap_generation", "fixations/s", _heatmap_case),
+    ("session_save", "sessions/s", _save_case),
+    ("analytics", "sessions/s", _analytics_case)
+]
+
+
+def measure(prepare: Callable[[argparse.Namespace], Tuple[Callable[[], Any], int]], args: argparse.Namespace) -> Dict[str, float]:
+    """최고 처리량(반복 중 가장 빠른 실행 기준)과 한 번 실행 시 최대 추가 메모리(MB)"""
+    run, amount = prepare(args)
+    run()  # 준비 실행 (임포트/캐시 초기화 비용 제외)
+
+    best = float("inf")
+    for _ in range(args.repeat):
+        gc.collect()
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "throughput": amount / best,
+        "peak_memory_mb": peak / (1024 * 1024)
+    }
+
+
+def compare(results: Dict[str, Dict[str, float]], baselines: Dict[str, Dict[str, float]], tolerance: float) -> List[str]:
+    """기준값 대비 회귀 목록"""
+    failures = []
+    for name, result in results.items():
+        baseline = baselines.get(name)
+        if baseline is None:
+            continue
+        if result["throughput"] < baseline["throughput"] * (1 - tolerance):
+            failures.append(
+                f"{name}: throughput {result['throughput']:.1f} < baseline {baseline['throughput']:.1f}"
+            )
+        if result["peak_memory_mb"] > baseline["peak_memory_mb"] * (1 + tolerance):
+            failures.append(
+                f"{name}: peak memory {result['peak_memory_mb']:.2f} MB > baseline {baseline['peak_memory_mb']:.2f} MB"
+            )
+    return failures
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Tracking benchmark suite")
+    parser.add_argument("--duration", type=float, default=60.0, help="seconds per synthetic session")
+    parser.add_argument("--hz", type=float, default=120.0)
+    parser.add_argument("--stored-sessions", type=int, default=2000, help="stored sessions for the analytics case")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--tolerance", type=float, default=0.3, help="allowed regression ratio")
+    parser.add_argument("--only", nargs="*", default=None, help="case names to run")
+    parser.add_argument("--baselines", default=BASELINE_PATH)
+    parser.add_argument("--update-baselines", action="store_true")
+    args = parser.parse_args()
+
+    from app.services.tracking.compute import tracking_compute_pool
+
+    results = {}
+    try:
+        for name, unit, prepare in CASES:
+            if args.only and name not in args.only:
+                continue
+            results[name] = measure(prepare, args)
+            print(
+                f"{name:20s}: {results[name]['throughput']:14.1f} {unit:12s}"
+                f" peak {results[name]['peak_memory_mb']:8.2f} MB"
+            )
+    finally:
+        tracking_compute_pool.close()
+
+    if args.update_baselines:
+        baselines = {}
+        if os.path.exists(args.baselines):
+            with open(args.baselines) as f:
+                baselines = json.load(f)
+        baselines.update(results)
+        with open(args.baselines, "w") as f:
+            json.dump(baselines, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"baselines written to {args.baselines}")
+        return
+
+    if not os.path.exists(args.baselines):
+        print("no baselines recorded, run with --update-baselines")
+        return
+    with open(args.baselines) as f:
+        failures = compare(results, json.load(f), args.tolerance)
+    for failure in failures:
+        print(f"REGRESSION {failure}")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
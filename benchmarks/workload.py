@@ -0,0 +1,121 @@
+# benchmarks/workload.py
+"""재현 가능한 합성 읽기 세션 생성
+
+페이지를 줄/단어 격자로 보고 고정-도약을 반복하는 시선 데이터를 만듭니다.
+
+- linear: 줄 단위로 왼쪽에서 오른쪽으로 읽고 다음 줄로 이동
+- regressive: linear에 regression_rate 확률로 1~3 단어 되돌아가기 추가
+- scattered: 임의의 단어로 이동
+
+측정 잡음(noise)과 트래커 끊김(dropout_rate, 해당 구간 샘플 누락 및 앞뒤 낮은 신뢰도)을 더합니다.
+"""
+from typing import List
+import numpy as np
+from app.schemas.tracking import GazePoint
+
+PATTERNS = ("linear", "regressive", "scattered")
+
+LINES = 10
+WORDS_PER_LINE = 8
+FIXATION_MS = (150.0, 350.0)
+SACCADE_MS = 30.0
+DROPOUT_MS = (50.0, 300.0)
+
+
+def word_layout(lines: int = LINES, words_per_line: int = WORDS_PER_LINE) -> np.ndarray:
+    """단어 중심 좌표 (lines * words_per_line, 2) - 읽는 순서"""
+    xs = np.linspace(0.1, 0.9, words_per_line)
+    ys = np.linspace(0.1, 0.9, lines)
+    return np.column_stack([np.tile(xs, lines), np.repeat(ys, words_per_line)])
+
+
+def page_info(lines: int = LINES, words_per_line: int = WORDS_PER_LINE) -> dict:
+    """word_layout에 맞는 단어 영역 page_info"""
+    half_w = 0.4 / words_per_line
+    half_h = 0.3 / lines
+    return {
+        "version": f"synthetic-{lines}x{words_per_line}",
+        "words": [
+            {"text": f"w{i}", "bbox": [x - half_w, y - half_h, x + half_w, y + half_h]}
+            for i, (x, y) in enumerate(word_layout(lines, words_per_line).tolist())
+        ]
+    }
+
+
+def _targets(count: int, pattern: str, regression_rate: float, rng: np.random.Generator) -> np.ndarray:
+    """고정할 단어 번호 순서"""
+    words = LINES * WORDS_PER_LINE
+    if pattern == "scattered":
+        return rng.integers(0, words, size=count)
+
+    targets = np.empty(count, dtype=np.intp)
+    current = 0
+    for i in range(count):
+        targets[i] = current
+        if pattern == "regressive" and current > 0 and rng.random() < regression_rate:
+            current = max(current - int(rng.integers(1, 4)), 0)
+        else:
+            current = (current + 1) % words
+    return targets
+
+
+def generate_session(
+    duration: float = 60.0,
+    hz: float = 60.0,
+    pattern: str = "linear",
+    regression_rate: float = 0.15,
+    noise: float = 0.005,
+    dropout_rate: float = 0.02,
+    seed: int = 0
+) -> np.ndarray:
+    """합성 시선 데이터 (n, 4) 배열 - x, y, timestamp(ms), confidence"""
+    if pattern not in PATTERNS:
+        raise ValueError(f"Unknown pattern: {pattern}. Must be one of {list(PATTERNS)}")
+
+    rng = np.random.default_rng(seed)
+    total = int(duration * hz)
+    sample_ms = 1000.0 / hz
+
+    # 고정 하나당 (고정 + 도약) 샘플 수, 필요한 고정 수를 넉넉히 생성
+    fixation_samples = np.maximum(
+        (rng.uniform(*FIXATION_MS, size=total) / sample_ms).astype(np.intp), 1
+    )
+    saccade_samples = max(int(SACCADE_MS / sample_ms), 1)
+    count = int(np.searchsorted(np.cumsum(fixation_samples + saccade_samples), total)) + 1
+    fixation_samples = fixation_samples[:count]
+
+    centers = word_layout()[_targets(count, pattern, regression_rate, rng)]
+
+    # 고정 구간은 중심 좌표 반복, 도약 구간은 다음 중심까지 선형 보간
+    steps = (np.arange(1, saccade_samples + 1) / (saccade_samples + 1))[None, :, None]
+    following = np.roll(centers, -1, axis=0)
+    saccades = centers[:, None, :] + (following - centers)[:, None, :] * steps
+    xy = np.concatenate([
+        np.concatenate([np.repeat(center[None, :], n, axis=0), saccade])
+        for center, n, saccade in zip(centers, fixation_samples, saccades)
+    ])[:total]
+    xy = np.clip(xy + rng.normal(0, noise, size=xy.shape), 0, 1)
+
+    timestamps = np.arange(xy.shape[0]) * sample_ms
+    confidence = rng.uniform(0.8, 1.0, size=xy.shape[0])
+
+    # 트래커 끊김: 구간 샘플 제거, 바로 앞뒤 샘플은 낮은 신뢰도
+    keep = np.ones(xy.shape[0], dtype=bool)
+    starts = np.flatnonzero(rng.random(count) < dropout_rate)
+    offsets = np.cumsum(fixation_samples + saccade_samples) - (fixation_samples + saccade_samples)
+    for start in offsets[starts][offsets[starts] < keep.size]:
+        length = max(int(rng.uniform(*DROPOUT_MS) / sample_ms), 1)
+        keep[start:start + length] = False
+        confidence[max(start - 1, 0)] = rng.uniform(0.2, 0.5)
+        if start + length < confidence.size:
+            confidence[start + length] = rng.uniform(0.2, 0.5)
+
+    return np.column_stack([xy, timestamps, confidence])[keep]
+
+
+def to_gaze_points(rows: np.ndarray) -> List[GazePoint]:
+    """(n, 4) 배열을 API 입력 형식으로 변환"""
+    return [
+        GazePoint(x=x, y=y, timestamp=t, confidence=None if np.isnan(c) else c)
+        for x, y, t, c in rows.tolist()
+    ]
@@ -1,14 +1,25 @@
 # main.py
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
 from app.api.v1 import api_router
 from app.middleware.error_handler import error_handler_middleware
+from app.services.tracking.compute import tracking_compute_pool
+from app.services.tracking.writer import tracking_write_queue
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # 종료 시 대기 중인 트래킹 데이터 저장
+    tracking_write_queue.close()
+    tracking_compute_pool.close()
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
     description="Drawry API Documentation",  # API 문서 설명 추가
-    version="1.0.0"  # 버전 정보 추가
+    version="1.0.0",  # 버전 정보 추가
+    lifespan=lifespan
 )
 
 # CORS 설정